@@ -0,0 +1,368 @@
+"""Authentication from the spec's security schemes.
+
+This module provides a class that applies credentials to requests as the
+spec's ``securitySchemes`` and ``security`` requirements describe: API keys
+in a header, query parameter or cookie, bearer tokens, and OAuth2 access
+tokens obtained with the client credentials flow.
+
+Access tokens are cached on disk per token endpoint, client and scopes, so
+concurrent and consecutive CLI invocations share one token instead of each
+requesting its own. The cache file is updated under an exclusive file lock,
+and a token is refreshed shortly before it expires rather than after a
+request has been rejected.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlencode, urljoin
+
+import requests
+
+from .fsutil import write_atomic
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Alias options holding credentials (see ``Config.set_alias_option``)
+CREDENTIAL_OPTIONS = (
+    "auth_scheme",
+    "api_key",
+    "bearer_token",
+    "client_id",
+    "client_secret",
+    "oauth_scopes",
+)
+# Seconds before expiry at which a token is refreshed
+REFRESH_MARGIN = 60
+# Lifetime assumed for tokens issued without ``expires_in``
+DEFAULT_TOKEN_LIFETIME = 600
+
+_API_KEY_LOCATIONS = ("header", "query", "cookie")
+
+
+def credentials_from_options(options):
+    """Return the credentials set in alias options, or None if there are none."""
+    credentials = {key: options[key] for key in CREDENTIAL_OPTIONS if options.get(key)}
+    return credentials or None
+
+
+def query_credentials(spec):
+    """Return the names of the query parameters that carry API keys."""
+    schemes = spec.get("components", {}).get("securitySchemes", {})
+    names = set()
+    for scheme in schemes.values():
+        if not isinstance(scheme, dict) or scheme.get("type") != "apiKey":
+            continue
+        if scheme.get("in") == "query" and "name" in scheme:
+            names.add(scheme["name"])
+    return frozenset(names)
+
+
+def _secret(value):
+    """Return a credential value; ``env:NAME`` reads it from the environment.
+
+    Raises:
+        ValueError: If the environment variable is not set.
+    """
+    if isinstance(value, str) and value.startswith("env:"):
+        name = value[4:]
+        if name not in os.environ:
+            raise ValueError(f"Environment variable '{name}' is not set")
+        return os.environ[name]
+    return value
+
+
+class TokenCache:
+    """OAuth2 access tokens shared between threads and processes.
+
+    Attributes:
+        cache_dir (Path): Directory holding one JSON file per token.
+
+    """
+
+    def __init__(self, cache_dir=None):
+        """Initialize the cache; the directory is created on first write."""
+        self.cache_dir = (
+            Path(cache_dir)
+            if cache_dir
+            else Path.home() / ".openapi_cli_generator" / "tokens"
+        )
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token_url, client_id, scopes=()):
+        """Return the cache key of a token."""
+        identity = "\n".join([token_url, client_id, " ".join(sorted(scopes))])
+        return hashlib.sha256(identity.encode()).hexdigest()[:16]
+
+    def get(self, key, fetch):
+        """Return a token that is not about to expire.
+
+        A token due for refresh is fetched by at most one process at a time;
+        the others wait for the file lock and then use the new token.
+
+        Args:
+            key (str): The cache key (see ``key``).
+            fetch (callable): Requests a new token and returns
+                ``(access_token, expires_in)``; ``expires_in`` may be None.
+        """
+        entry = self._entries.get(key)
+        if _fresh(entry):
+            return entry["access_token"]
+        with self._lock:
+            entry = self._entries.get(key)
+            if _fresh(entry):
+                return entry["access_token"]
+            entry = self._read(key)
+            if not _fresh(entry):
+                with self._file_lock(key):
+                    entry = self._read(key)
+                    if not _fresh(entry):
+                        entry = self._refresh(key, entry, fetch)
+            self._entries[key] = entry
+            return entry["access_token"]
+
+    def invalidate(self, key, token):
+        """Drop a token the API rejected, unless it was already replaced."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["access_token"] == token:
+                del self._entries[key]
+            with self._file_lock(key):
+                entry = self._read(key)
+                if entry is not None and entry.get("access_token") == token:
+                    try:
+                        self._file(key).unlink()
+                    except OSError:
+                        pass
+
+    def _refresh(self, key, entry, fetch):
+        """Fetch and store a new token; keep an unexpired one if that fails."""
+        try:
+            entry = _entry(*fetch())
+        except requests.exceptions.RequestException:
+            if entry is None or entry.get("expires_at", 0) <= time.time():
+                raise
+            return entry
+        self._write(key, entry)
+        return entry
+
+    def _file(self, key):
+        """Return the cache file of a token."""
+        return self.cache_dir / f"{key}.json"
+
+    def _read(self, key):
+        """Read a cached token, ignoring missing or corrupt files."""
+        try:
+            with open(self._file(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and "access_token" in entry else None
+
+    def _write(self, key, entry):
+        """Write a token atomically, readable by the owner only."""
+        try:
+            write_atomic(self._file(key), json.dumps(entry), mode=0o600)
+        except OSError:
+            pass
+
+    @contextmanager
+    def _file_lock(self, key):
+        """Hold an exclusive lock on a token across processes."""
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            lock_file = open(self._file(key).with_suffix(".lock"), "a")
+        except OSError:
+            # Without a writable cache, each process fetches its own token
+            yield
+            return
+        with lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _entry(access_token, expires_in=None):
+    """Build a cache entry for a token issued now."""
+    now = time.time()
+    lifetime = float(expires_in) if expires_in else DEFAULT_TOKEN_LIFETIME
+    return {
+        "access_token": access_token,
+        "expires_at": now + lifetime,
+        "refresh_at": now + lifetime - min(REFRESH_MARGIN, lifetime / 2),
+    }
+
+
+def _fresh(entry):
+    """Check that a cache entry is not yet due for refresh."""
+    return entry is not None and entry.get("refresh_at", 0) > time.time()
+
+
+class Authenticator:
+    """Apply configured credentials to requests.
+
+    For each operation, the first alternative of its ``security``
+    requirements (or the spec's, if the operation has none) whose schemes
+    all have credentials is used; without one, no credentials are sent.
+
+    Attributes:
+        schemes (dict): The spec's ``securitySchemes``.
+        credentials (dict): Credential options, e.g. ``api_key`` or
+            ``client_id`` and ``client_secret``; ``auth_scheme`` restricts
+            which scheme is used and applies it to operations that declare
+            no requirements.
+
+    """
+
+    def __init__(self, spec, credentials, transport, base_url="", token_cache=None):
+        """Initialize the authenticator.
+
+        Args:
+            spec (dict): The parsed OpenAPI specification.
+            credentials (dict): Credential options; ``env:NAME`` values are
+                read from the environment.
+            transport (Transport): Transport used to request OAuth2 tokens.
+            base_url (str): URL relative token endpoints are resolved against.
+            token_cache (TokenCache): Cache of OAuth2 tokens, or None for the
+                default one in the user's home directory.
+
+        Raises:
+            ValueError: If a credential's environment variable is not set.
+        """
+        self.schemes = spec.get("components", {}).get("securitySchemes", {})
+        self.credentials = {key: _secret(value) for key, value in credentials.items()}
+        self.transport = transport
+        self.base_url = base_url
+        self.token_cache = token_cache or TokenCache()
+        self._security = spec.get("security")
+        self._plans = {}
+
+    def apply(self, template, query, headers, cookies):
+        """Add an operation's credentials to a request.
+
+        Args:
+            template (PreparedOperation): The operation being called.
+            query (dict): Query parameters, updated in place.
+            headers (dict): Headers, updated in place.
+            cookies (dict): Cookies, updated in place.
+
+        Returns:
+            list: ``(key, token)`` of each OAuth2 token used, for ``reject``.
+
+        Raises:
+            requests.exceptions.RequestException: If a token request fails.
+        """
+        key = (template.method, template.path)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = self._plan(template.operation)
+        tokens = []
+        for scheme in plan:
+            kind = scheme.get("type")
+            if kind == "apiKey":
+                value = self.credentials["api_key"]
+                location = scheme["in"]
+                if location == "query":
+                    query[scheme["name"]] = value
+                elif location == "cookie":
+                    cookies[scheme["name"]] = value
+                else:
+                    headers[scheme["name"]] = value
+            elif kind == "oauth2" and "client_id" in self.credentials:
+                token_key, token = self._token(scheme)
+                tokens.append((token_key, token))
+                headers["Authorization"] = f"Bearer {token}"
+            else:
+                headers["Authorization"] = f"Bearer {self.credentials['bearer_token']}"
+        return tokens
+
+    def reject(self, tokens):
+        """Drop OAuth2 tokens the API answered with 401 Unauthorized."""
+        for key, token in tokens:
+            self.token_cache.invalidate(key, token)
+
+    def _plan(self, operation):
+        """Return the security schemes to apply to an operation."""
+        requirements = operation.get("security", self._security)
+        scheme_name = self.credentials.get("auth_scheme")
+        if scheme_name:
+            if requirements is None:
+                requirements = [{scheme_name: []}]
+            else:
+                requirements = [r for r in requirements if scheme_name in r]
+        for requirement in requirements or []:
+            if requirement and all(self._usable(name) for name in requirement):
+                return [self.schemes[name] for name in requirement]
+        return []
+
+    def _usable(self, name):
+        """Check that a scheme is supported and has credentials."""
+        scheme = self.schemes.get(name, {})
+        kind = scheme.get("type")
+        credentials = self.credentials
+        if kind == "apiKey":
+            return "api_key" in credentials and scheme.get("in") in _API_KEY_LOCATIONS
+        if kind == "http":
+            return scheme.get("scheme", "").lower() == "bearer" and (
+                "bearer_token" in credentials
+            )
+        if kind == "oauth2" and "client_id" in credentials:
+            flow = scheme.get("flows", {}).get("clientCredentials", {})
+            return "tokenUrl" in flow and "client_secret" in credentials
+        if kind in ("oauth2", "openIdConnect"):
+            return "bearer_token" in credentials
+        return False
+
+    def _token(self, scheme):
+        """Return a cached or new access token of an OAuth2 scheme."""
+        token_url = urljoin(
+            self.base_url + "/", scheme["flows"]["clientCredentials"]["tokenUrl"]
+        )
+        scopes = self.credentials.get("oauth_scopes", [])
+        client_id = self.credentials["client_id"]
+        key = self.token_cache.key(token_url, client_id, scopes)
+        token = self.token_cache.get(key, lambda: self._fetch(token_url, scopes))
+        return key, token
+
+    def _fetch(self, token_url, scopes):
+        """Request an access token with the client credentials grant.
+
+        Returns:
+            tuple: ``(access_token, expires_in)``.
+        """
+        form = {"grant_type": "client_credentials"}
+        if scopes:
+            form["scope"] = " ".join(scopes)
+        client = f"{self.credentials['client_id']}:{self.credentials['client_secret']}"
+        response = self.transport.request(
+            method="POST",
+            url=token_url,
+            data=urlencode(form).encode(),
+            headers={
+                "Authorization": "Basic " + base64.b64encode(client.encode()).decode(),
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Accept": "application/json",
+            },
+        )
+        response.raise_for_status()
+        try:
+            document = response.json()
+            return document["access_token"], document.get("expires_in")
+        except (ValueError, KeyError, TypeError) as e:
+            raise requests.exceptions.RequestException(
+                f"Token endpoint {token_url} returned no access token"
+            ) from e
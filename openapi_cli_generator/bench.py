@@ -0,0 +1,271 @@
+"""Load generation for spec operations.
+
+This module provides an HDR-style latency histogram and a load generator that
+calls an operation repeatedly for a fixed duration, either closed-loop (a fixed
+number of concurrent workers sending back-to-back requests) or open-loop at a
+target rate. In rate mode latencies are measured from the time each request
+was scheduled to start, so a server that falls behind shows up in the
+percentiles instead of silently lowering the request rate (coordinated
+omission).
+"""
+
+import threading
+import time
+
+import requests
+
+DEFAULT_DURATION = 10.0
+DEFAULT_SIGNIFICANT_DIGITS = 3
+PERCENTILES = (50.0, 75.0, 90.0, 99.0, 99.9, 100.0)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of integer values with bounded relative error.
+
+    Values below ``2 * 10 ** significant_digits`` (rounded up to a power of
+    two) are counted exactly; larger values share buckets whose width doubles
+    with every power of two, so every value is reported within a relative
+    error of ``10 ** -significant_digits``. Recording is a few integer
+    operations, and histograms recorded by separate threads can be merged.
+
+    Attributes:
+        count (int): Number of recorded values.
+        min (int): Smallest recorded value, or None.
+        max (int): Largest recorded value, or None.
+
+    """
+
+    def __init__(self, significant_digits=DEFAULT_SIGNIFICANT_DIGITS):
+        """Initialize an empty histogram."""
+        self._sub_bucket_bits = (2 * 10**significant_digits - 1).bit_length()
+        self._half = 1 << (self._sub_bucket_bits - 1)
+        self._counts = [0] * (2 * self._half)
+        self._total = 0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        """Return the bucket index of a value."""
+        shift = value.bit_length() - self._sub_bucket_bits
+        if shift <= 0:
+            return value
+        return shift * self._half + (value >> shift)
+
+    def _highest_value(self, index):
+        """Return the highest value counted in a bucket."""
+        shift = index // self._half - 1
+        if shift <= 0:
+            return index
+        return ((index - shift * self._half) << shift) + (1 << shift) - 1
+
+    def record(self, value, count=1):
+        """Record a non-negative integer value."""
+        value = max(int(value), 0)
+        index = self._index(value)
+        if index >= len(self._counts):
+            self._counts.extend([0] * (index + 1 - len(self._counts)))
+        self._counts[index] += count
+        self._total += value * count
+        self.count += count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Add the values recorded by another histogram."""
+        if len(other._counts) > len(self._counts):
+            self._counts.extend([0] * (len(other._counts) - len(self._counts)))
+        for index, count in enumerate(other._counts):
+            self._counts[index] += count
+        self._total += other._total
+        self.count += other.count
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def count_at_or_below(self, value):
+        """Return the number of recorded values up to ``value``.
+
+        All values in the bucket of ``value`` are counted, so the bound is
+        exact within the histogram's relative error.
+        """
+        end = self._index(max(int(value), 0)) + 1
+        return sum(self._counts[:end])
+
+    @property
+    def mean(self):
+        """Return the mean of the recorded values, or None."""
+        return self._total / self.count if self.count else None
+
+    def percentile(self, percentile):
+        """Return the value below or at which ``percentile`` % of values fall."""
+        if not self.count:
+            return None
+        target = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(self._highest_value(index), self.max)
+        return self.max
+
+
+class BenchResult:
+    """Outcome of a load run.
+
+    Attributes:
+        requests (int): Completed requests, including failed ones.
+        errors (dict): Number of failed requests per error kind.
+        elapsed (float): Duration of the run in seconds.
+        latency (LatencyHistogram): Latencies in microseconds.
+
+    """
+
+    def __init__(self, requests, errors, elapsed, latency):
+        """Initialize the result."""
+        self.requests = requests
+        self.errors = errors
+        self.elapsed = elapsed
+        self.latency = latency
+
+    @property
+    def error_count(self):
+        """Return the number of failed requests."""
+        return sum(self.errors.values())
+
+    @property
+    def throughput(self):
+        """Return completed requests per second."""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self):
+        """Return the fraction of requests that failed."""
+        return self.error_count / self.requests if self.requests else 0.0
+
+    def as_dict(self):
+        """Return the result as a JSON-serializable dict; latencies in ms."""
+        latency = self.latency
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "error_rate": self.error_rate,
+            "latency_ms": {
+                "min": _ms(latency.min),
+                "mean": _ms(latency.mean),
+                "max": _ms(latency.max),
+                "percentiles": {
+                    f"p{p:g}": _ms(latency.percentile(p)) for p in PERCENTILES
+                },
+            },
+        }
+
+    def report(self):
+        """Return a human-readable summary."""
+        lines = [
+            f"Requests:   {self.requests} in {self.elapsed:.2f} s "
+            f"({self.throughput:.1f} req/s)",
+            f"Errors:     {self.error_count} ({self.error_rate:.2%})",
+        ]
+        for kind, count in sorted(self.errors.items()):
+            lines.append(f"  {kind}: {count}")
+        if self.latency.count:
+            lines.append(
+                f"Latency:    min {_ms(self.latency.min):.2f} ms, "
+                f"mean {_ms(self.latency.mean):.2f} ms, "
+                f"max {_ms(self.latency.max):.2f} ms"
+            )
+            lines.append("Percentile  Latency (ms)")
+            for p in PERCENTILES:
+                lines.append(f"{p:>9g}%  {_ms(self.latency.percentile(p)):>12.2f}")
+        return "\n".join(lines)
+
+
+def _ms(microseconds):
+    """Convert microseconds to milliseconds."""
+    return None if microseconds is None else microseconds / 1000
+
+
+def error_kind(error):
+    """Classify a failed call for the error summary."""
+    response = getattr(error, "response", None)
+    if isinstance(error, requests.exceptions.HTTPError) and response is not None:
+        return f"HTTP {response.status_code}"
+    return type(error).__name__
+
+
+def run_load(call, duration=DEFAULT_DURATION, concurrency=1, rate=None):
+    """Call ``call`` repeatedly and measure its latency.
+
+    Args:
+        call (callable): Sends one request; raising counts as an error.
+        duration (float): How long to generate load, in seconds.
+        concurrency (int): Number of worker threads, i.e. the maximum number
+            of requests in flight.
+        rate (float): Target requests per second across all workers; None
+            sends requests back-to-back.
+
+    Returns:
+        BenchResult: Counts, errors and the latency histogram.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be positive")
+
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + duration
+    scheduled = [0]
+    histograms = []
+    errors = {}
+
+    def next_start():
+        """Return when the next request should start, or None when done."""
+        if rate is None:
+            now = time.perf_counter()
+            return now if now < deadline else None
+        with lock:
+            intended = start + scheduled[0] / rate
+            if intended >= deadline:
+                return None
+            scheduled[0] += 1
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return intended
+
+    def worker():
+        histogram = LatencyHistogram()
+        failures = {}
+        while True:
+            intended = next_start()
+            if intended is None:
+                break
+            try:
+                call()
+            except Exception as e:
+                kind = error_kind(e)
+                failures[kind] = failures.get(kind, 0) + 1
+            histogram.record((time.perf_counter() - intended) * 1e6)
+        with lock:
+            histograms.append(histogram)
+            for kind, count in failures.items():
+                errors[kind] = errors.get(kind, 0) + count
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latency = LatencyHistogram()
+    for histogram in histograms:
+        latency.merge(histogram)
+    return BenchResult(latency.count, errors, elapsed, latency)
@@ -0,0 +1,355 @@
+"""Record and replay API calls.
+
+This module provides cassettes: files of recorded request/response pairs
+that let generated CLIs and clients run without a live API. A recording
+transport wraps the real transport and stores every response; a replay
+transport serves them from memory, optionally after an injected delay, so
+end-to-end invocations can be tested and benchmarked independently of the
+network and the server.
+
+Requests are matched on the method, the URL path, the sorted query string
+and a digest of the body, so a cassette recorded against one server can be
+replayed for any other server of the spec. Identical bodies and responses
+are stored once.
+
+Cassettes are meant to be committed as test fixtures, so they hold no
+credentials: request headers and cookies are never stored, the values of
+query parameters carrying API keys are redacted from request keys, and the
+tokens of OAuth2 token responses are redacted from recorded bodies.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from urllib.parse import unquote_plus, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .fsutil import write_atomic
+from .transport import Transport
+
+CASSETTE_MODES = ("record", "replay")
+CASSETTE_VERSION = 1
+# Stored in place of credentials
+REDACTED = "REDACTED"
+
+# Fields of OAuth2 token responses holding credentials
+_TOKEN_FIELDS = ("access_token", "refresh_token", "id_token")
+
+# Headers that describe the recorded transfer rather than the response
+_TRANSFER_HEADERS = frozenset(
+    {
+        "connection",
+        "content-encoding",
+        "content-length",
+        "date",
+        "keep-alive",
+        "transfer-encoding",
+    }
+)
+
+
+def request_key(method, url, params=None, body=b"", headers=None, redact=()):
+    """Return the key a request is matched on.
+
+    Multipart boundaries are random, so they are replaced by a fixed string
+    before the body is hashed. The values of the query parameters named in
+    ``redact`` are replaced by ``REDACTED``, so requests match whatever
+    credentials they carry.
+    """
+    parts = urlsplit(url)
+    query = parts.query
+    if params:
+        extra = urlencode(sorted(params.items()), doseq=True)
+        query = f"{query}&{extra}" if query else extra
+    pairs = query.split("&") if query else []
+    if redact:
+        pairs = [_redact_pair(pair, redact) for pair in pairs]
+    query = "&".join(sorted(pairs))
+    key = f"{method.upper()} {parts.path or '/'}"
+    if query:
+        key = f"{key}?{query}"
+    if body:
+        content_type = CaseInsensitiveDict(headers or {}).get("Content-Type", "")
+        _, _, boundary = content_type.partition("boundary=")
+        if boundary:
+            body = body.replace(boundary.encode(), b"boundary")
+        key = f"{key} {hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+
+def read_body(json_data=None, data=None):
+    """Return a request body as bytes, reading files and chunk iterators."""
+    if json_data is not None:
+        return json.dumps(json_data).encode()
+    if data is None:
+        return b""
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    if isinstance(data, str):
+        return data.encode()
+    if hasattr(data, "read"):
+        return data.read()
+    return b"".join(data)
+
+
+class Cassette:
+    """Recorded responses keyed by request.
+
+    Attributes:
+        path (Path): The cassette file.
+        mode (str): ``record`` or ``replay``.
+        latency (float): Seconds to wait before serving a replayed response.
+
+    """
+
+    def __init__(self, path, mode="replay", latency=0.0):
+        """Load the cassette file, if it exists.
+
+        Raises:
+            FileNotFoundError: If a cassette to replay does not exist.
+            ValueError: If the mode is unknown or the file is not a cassette.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(
+                f"Unknown cassette mode '{mode}'; "
+                f"choose one of: {', '.join(CASSETTE_MODES)}"
+            )
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self._index = {}
+        self._responses = []
+        self._bodies = []
+        self._response_ids = {}
+        self._body_ids = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+        if mode == "replay" or self.path.exists():
+            self._load()
+
+    def _load(self):
+        """Read the cassette file."""
+        with open(self.path) as f:
+            document = json.load(f)
+        if document.get("version") != CASSETTE_VERSION:
+            raise ValueError(
+                f"{self.path} is not a version {CASSETTE_VERSION} cassette"
+            )
+        self._bodies = [_decode_body(body) for body in document["bodies"]]
+        self._responses = [
+            (status, reason, tuple(map(tuple, headers)), body_id)
+            for status, reason, headers, body_id in document["responses"]
+        ]
+        self._index = document["index"]
+        self._body_ids = {body: i for i, body in enumerate(self._bodies)}
+        self._response_ids = {response: i for i, response in enumerate(self._responses)}
+
+    def save(self):
+        """Write the cassette file atomically."""
+        with self._lock:
+            document = {
+                "version": CASSETTE_VERSION,
+                "index": self._index,
+                "responses": [list(response) for response in self._responses],
+                "bodies": [_encode_body(body) for body in self._bodies],
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(document, separators=(",", ":")))
+
+    def __len__(self):
+        """Return the number of recorded interactions."""
+        return sum(len(ids) for ids in self._index.values())
+
+    def add(self, key, status, reason, headers, body):
+        """Record a response to the request with the given key."""
+        headers = {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in _TRANSFER_HEADERS
+        }
+        with self._lock:
+            body_id = _intern(self._bodies, self._body_ids, body)
+            response = (status, reason, tuple(sorted(headers.items())), body_id)
+            response_id = _intern(self._responses, self._response_ids, response)
+            self._index.setdefault(key, []).append(response_id)
+
+    def play(self, key, url):
+        """Return a new response for a request, cycling through recordings.
+
+        Returns:
+            requests.Response: The response, or None if nothing was recorded
+            for the request.
+        """
+        with self._lock:
+            ids = self._index.get(key)
+            if not ids:
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            status, reason, headers, body_id = self._responses[ids[position % len(ids)]]
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers)
+        response.headers["Content-Length"] = str(len(self._bodies[body_id]))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = url
+        response._content = self._bodies[body_id]
+        response._content_consumed = True
+        return response
+
+    def transport(self, transport, redact=()):
+        """Return the transport for this cassette's mode.
+
+        Args:
+            transport (Transport): The transport that reaches the API; used
+                to record, ignored when replaying.
+            redact (iterable): Names of query parameters carrying
+                credentials (see ``request_key``).
+        """
+        if self.mode == "record":
+            return RecordingTransport(transport, self, redact)
+        return ReplayTransport(self, redact)
+
+
+class RecordingTransport(Transport):
+    """Send requests through another transport and record the responses.
+
+    The cassette is saved when the transport is closed.
+
+    Attributes:
+        transport (Transport): The transport requests are sent through.
+        cassette (Cassette): The cassette responses are recorded into.
+        redact (frozenset): Query parameters whose values are not recorded.
+
+    """
+
+    def __init__(self, transport, cassette, redact=()):
+        """Initialize the transport."""
+        self.transport = transport
+        self.cassette = cassette
+        self.redact = frozenset(redact)
+        self.name = transport.name
+
+    @property
+    def pool_size(self):
+        """Return the wrapped transport's pool size."""
+        return self.transport.pool_size
+
+    def request(self, method, url, params=None, json=None, data=None, **kwargs):
+        """Send a request, read its response and record it."""
+        body = read_body(json, data)
+        response = self.transport.request(
+            method=method,
+            url=url,
+            params=params,
+            json=json,
+            data=None if json is not None else body or None,
+            **kwargs,
+        )
+        content = _redact_tokens(response.content)
+        key = request_key(method, url, params, body, kwargs.get("headers"), self.redact)
+        self.cassette.add(
+            key, response.status_code, response.reason, response.headers, content
+        )
+        return response
+
+    def resize(self, pool_size):
+        """Resize the wrapped transport's pool."""
+        self.transport.resize(pool_size)
+
+    def close(self):
+        """Save the cassette and close the wrapped transport."""
+        self.cassette.save()
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Serve recorded responses without touching the network.
+
+    Attributes:
+        cassette (Cassette): The recorded responses.
+        redact (frozenset): Query parameters whose values are not matched.
+        pool_size (int): Unbounded; any number of requests may be in flight.
+
+    """
+
+    name = "replay"
+    network = False
+    pool_size = float("inf")
+
+    def __init__(self, cassette, redact=()):
+        """Initialize the transport."""
+        self.cassette = cassette
+        self.redact = frozenset(redact)
+
+    def request(self, method, url, params=None, json=None, data=None, **kwargs):
+        """Return the recorded response to a request.
+
+        Raises:
+            requests.exceptions.RequestException: If no response was recorded.
+        """
+        body = read_body(json, data)
+        key = request_key(method, url, params, body, kwargs.get("headers"), self.redact)
+        response = self.cassette.play(key, url)
+        if response is None:
+            raise requests.exceptions.RequestException(
+                f"No recorded response for {key} in {self.cassette.path}"
+            )
+        if self.cassette.latency:
+            time.sleep(self.cassette.latency)
+        return response
+
+
+def _redact_pair(pair, redact):
+    """Redact the value of a ``name=value`` query pair if it is a credential."""
+    name, _, _ = pair.partition("=")
+    return f"{name}={REDACTED}" if unquote_plus(name) in redact else pair
+
+
+def _redact_tokens(body):
+    """Redact the tokens of an OAuth2 token response body."""
+    if b"_token" not in body:
+        return body
+    try:
+        document = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(document, dict) or not any(
+        field in document for field in _TOKEN_FIELDS
+    ):
+        return body
+    for field in _TOKEN_FIELDS:
+        if field in document:
+            document[field] = REDACTED
+    return json.dumps(document).encode()
+
+
+def _intern(values, ids, value):
+    """Return the position of a value in a list, appending it if new."""
+    position = ids.get(value)
+    if position is None:
+        position = ids[value] = len(values)
+        values.append(value)
+    return position
+
+
+def _encode_body(body):
+    """Encode a body for the cassette file: text, or base64 for binary data."""
+    try:
+        return body.decode()
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(body).decode()}
+
+
+def _decode_body(body):
+    """Decode a body stored by ``_encode_body``."""
+    if isinstance(body, dict):
+        return base64.b64decode(body["base64"])
+    return body.encode()
@@ -8,29 +8,96 @@ Usage:
     openapi_cli_generator alias remove <name>
     openapi_cli_generator alias update <name> <url>
     openapi_cli_generator alias show <name>
+    openapi_cli_generator alias set <name> <option> [<value>]
     openapi_cli_generator generate <spec_url> [args...]
+    openapi_cli_generator generate <spec_url> --emit python --out <dir>
+    openapi_cli_generator bench [options] <alias|spec_url> <resource> <action> [args...]
 """
 
+import json
 import sys
 from pathlib import Path
 
 import click
 
-from .config import Config
-from .generator import CLIGenerator
+from .auth import credentials_from_options
+from .bench import DEFAULT_DURATION
+from .cassette import Cassette
+from .config import ALIAS_OPTIONS, SECRET_OPTIONS, Config
+from .emitter import PythonEmitter
+from .generator import DEFAULT_POOL_SIZE, CLIGenerator
+from .metrics import create_metrics
 from .parser import OpenAPIParser
+from .spec_cache import DEFAULT_SPEC_TTL, SpecCache
+from .transport import DEFAULT_TRANSPORT
 
 CONFIG_DIR = Path.home() / ".openapi_cli_generator"
 CONFIG_FILE = CONFIG_DIR / "config.json"
+# Argument of API commands that bypasses the spec cache
+REFRESH_SPEC_FLAG = "--refresh-spec"
 
 
-def handle_api_command(spec_url, remaining_args):
-    """Handle API-specific commands by generating a CLI from the spec."""
+def load_generator(spec_url, args, options=None, refresh_spec=False):
+    """Load the spec and generate the CLI for a command line.
+
+    ``options`` are the alias options (see ``Config.set_alias_option``).
+    With ``refresh_spec``, a cached copy of the spec is not used.
+    """
+    options = options or {}
+    # validation_workers of 0 validates on one process per CPU
+    workers = options.get("validation_workers", 1) or None
+    # spec_ttl of 0 downloads the spec on every run
+    ttl = options.get("spec_ttl", DEFAULT_SPEC_TTL)
+    cache = SpecCache(ttl=ttl) if ttl else None
+    if cache is not None and refresh_spec:
+        cache.invalidate(spec_url)
+    parser = OpenAPIParser(spec_url, cache=cache, workers=workers)
+    spec = parser.parse_for_command(args)
+    generator = CLIGenerator(
+        spec,
+        pool_size=options.get("pool_size", DEFAULT_POOL_SIZE),
+        transport=options.get("transport", DEFAULT_TRANSPORT),
+        metrics=create_metrics(options),
+        cassette=open_cassette(options),
+        credentials=credentials_from_options(options),
+        validate_requests=options.get("validate_requests", True),
+    )
+    generator.generate_cli()
+    return generator
+
+
+def open_cassette(options):
+    """Open the cassette set in alias options, or return None."""
+    if not options.get("cassette"):
+        return None
+    return Cassette(
+        options["cassette"],
+        mode=options.get("cassette_mode", "replay"),
+        latency=options.get("replay_latency", 0.0),
+    )
+
+
+def display_option(key, value):
+    """Return an alias option value for display, masking secrets."""
+    if key in SECRET_OPTIONS and not str(value).startswith("env:"):
+        return "********"
+    return value
+
+
+def handle_api_command(spec_url, remaining_args, options=None):
+    """Handle API-specific commands by generating a CLI from the spec.
+
+    ``options`` are the alias options (see ``Config.set_alias_option``).
+    Specs are cached; on a cold cache only the operations the command needs
+    are decoded before it runs (see ``OpenAPIParser.parse_for_command``).
+    ``--refresh-spec`` anywhere in the arguments downloads the spec again.
+    """
+    refresh_spec = REFRESH_SPEC_FLAG in (remaining_args or ())
+    if refresh_spec:
+        remaining_args = [arg for arg in remaining_args if arg != REFRESH_SPEC_FLAG]
+    generator = None
     try:
-        parser = OpenAPIParser(spec_url)
-        spec = parser.parse()
-        generator = CLIGenerator(spec)
-        generator.generate_cli()
+        generator = load_generator(spec_url, remaining_args, options, refresh_spec)
         if remaining_args:
             generator.execute(remaining_args)
         else:
@@ -38,6 +105,10 @@ def handle_api_command(spec_url, remaining_args):
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
+    finally:
+        # Also exports metrics when the command exits with an error
+        if generator is not None:
+            generator.close()
 
 
 @click.group()
@@ -112,17 +183,123 @@ def show(name):
         config = Config()
         url = config.get_alias(name)
         click.echo(f"Alias '{name}': {url}")
+        for key, value in config.get_alias_options(name).items():
+            click.echo(f"  {key}: {display_option(key, value)}")
     except KeyError as e:
         click.echo(f"Error: {str(e)}", err=True)
 
 
+@alias.command(name="set")
+@click.argument("name")
+@click.argument("option", type=click.Choice(tuple(ALIAS_OPTIONS)))
+@click.argument("value", required=False)
+def set_option(name, option, value):
+    """Set an option for an API alias; omit the value to unset it."""
+    try:
+        config = Config()
+        config.set_alias_option(name, option, value)
+        if value is None:
+            click.echo(f"Unset '{option}' for alias '{name}'")
+        else:
+            value = display_option(option, value)
+            click.echo(f"Set '{option}' to {value} for alias '{name}'")
+    except (KeyError, ValueError) as e:
+        click.echo(f"Error: {str(e)}", err=True)
+
+
+def handle_emit_command(spec_url, emit, out, name):
+    """Write a standalone CLI package for the spec instead of running it."""
+    try:
+        spec = OpenAPIParser(spec_url).parse()
+        package_dir = PythonEmitter(spec, package=name).emit(out)
+        click.echo(f"Emitted {emit} package '{package_dir.name}' to {out}")
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
 @cli.command()
 @click.argument("spec_url")
-def generate(spec_url):
+@click.option(
+    "--emit",
+    type=click.Choice(["python"]),
+    help="Emit a standalone CLI package instead of interpreting the spec.",
+)
+@click.option(
+    "--out",
+    type=click.Path(file_okay=False),
+    help="Output directory for the emitted package.",
+)
+@click.option("--name", help="Python package name of the emitted package.")
+def generate(spec_url, emit, out, name):
     """Generate CLI from an OpenAPI specification."""
+    if emit:
+        if not out:
+            raise click.UsageError("--out is required with --emit")
+        handle_emit_command(spec_url, emit, out, name)
+        return
     handle_api_command(spec_url, None)
 
 
+@cli.command(context_settings={"allow_interspersed_args": False})
+@click.option(
+    "--duration",
+    "-d",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_DURATION,
+    show_default=True,
+    help="Seconds to generate load for.",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Maximum number of requests in flight.",
+)
+@click.option(
+    "--rate",
+    "-r",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Target requests per second (default: back-to-back).",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the results as JSON.")
+@click.option(
+    "--refresh-spec", is_flag=True, help="Download the spec instead of using the cache."
+)
+@click.argument("target")
+@click.argument("command", nargs=-1, type=click.UNPROCESSED, required=True)
+def bench(duration, concurrency, rate, as_json, refresh_spec, target, command):
+    """Replay an operation and report throughput and latency percentiles.
+
+    TARGET is an alias or spec URL; COMMAND is the command line of the
+    operation, e.g. "hr drivers list 7".
+    """
+    config = Config()
+    aliases = config.list_aliases()
+    if target in aliases:
+        spec_url, options = aliases[target], config.get_alias_options(target)
+    else:
+        spec_url, options = target, {}
+    generator = None
+    try:
+        generator = load_generator(spec_url, command, options, refresh_spec)
+        result = generator.bench(command, duration, concurrency, rate)
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+    finally:
+        if generator is not None:
+            generator.close()
+    if result is None:
+        return
+    if as_json:
+        click.echo(json.dumps(result.as_dict(), indent=2))
+    else:
+        click.echo(result.report())
+
+
 def main():
     """OpenAPI CLI Generator - Convert OpenAPI specs to command line interfaces."""
     # If no arguments provided, show help
@@ -138,7 +315,7 @@ def main():
     if sys.argv[1] in aliases:
         alias_name = sys.argv[1]
         spec_url = aliases[alias_name]
-        handle_api_command(spec_url, sys.argv[2:])
+        handle_api_command(spec_url, sys.argv[2:], config.get_alias_options(alias_name))
         return
 
     # Otherwise, proceed with normal CLI commands
@@ -0,0 +1,302 @@
+"""Programmatic API client.
+
+This module provides a client whose resources and methods mirror the command
+tree generated for the CLI. Calls share the generator's transport and
+can be made synchronously, awaited from asyncio code, or fanned out over many
+inputs with bounded parallelism.
+"""
+
+import asyncio
+import functools
+import inspect
+import keyword
+import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .encoding import encode_body, request_content_types, select_content_type
+
+DEFAULT_CONCURRENCY = 8
+# Python types of parameters in operation signatures, by JSON type
+_ANNOTATIONS = {"integer": int, "number": float, "boolean": bool}
+
+
+def bounded_map(fn, items, concurrency=DEFAULT_CONCURRENCY, ordered=True):
+    """Apply ``fn`` to each item on a thread pool with bounded parallelism.
+
+    At most ``concurrency`` calls are in flight at a time and items are only
+    pulled from the iterable as workers free up, so very long inputs are not
+    materialized. Exceptions raised by ``fn`` are yielded in place of results.
+
+    Args:
+        fn (callable): Function called with each item.
+        items (iterable): Inputs to process.
+        concurrency (int): Maximum number of concurrent calls.
+        ordered (bool): Yield results in input order instead of completion order.
+
+    Yields:
+        tuple: ``(item, result)`` pairs, where result may be an exception.
+
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+
+    def run(item):
+        try:
+            return fn(item)
+        except Exception as e:
+            return e
+
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(run, item)))
+            if len(pending) < concurrency:
+                continue
+            if ordered:
+                done_item, future = pending.popleft()
+                yield done_item, future.result()
+            else:
+                done, _ = wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+                for entry in [e for e in pending if e[1] in done]:
+                    pending.remove(entry)
+                    yield entry[0], entry[1].result()
+        while pending:
+            done_item, future = pending.popleft()
+            yield done_item, future.result()
+
+
+class Operation:
+    """A callable API operation.
+
+    Calling the operation sends the request and returns the decoded JSON
+    response; ``acall`` does the same from asyncio code. Parameters are
+    passed as keyword arguments and the request body as ``data``; a
+    parameter named ``data`` is passed as ``data_`` instead.
+    """
+
+    def __init__(self, client, method, path, operation):
+        """Initialize the operation from its spec entry."""
+        self._client = client
+        self.method = method
+        self.path = path
+        self.operation = operation
+        self._names = {}
+        self.__doc__ = operation.get("summary", "").strip() or f"{method} {path}"
+        self.__signature__ = self._build_signature()
+
+    def __repr__(self):
+        """Return a debug representation of the operation."""
+        return f"<Operation {self.method.upper()} {self.path}>"
+
+    def _build_signature(self):
+        """Build a typed signature from the operation's parameters."""
+        generator = self._client._generator
+        required, optional = [], []
+        takes_body = "requestBody" in self.operation
+        for param in generator.prepare(self.method, self.path).parameters:
+            name = python_name(param["name"])
+            if takes_body and name == "data":
+                # ``data`` is the request body
+                name = "data_"
+            self._names[name] = param["name"]
+            scalar_type = generator.schemas.scalar_type(param.get("schema", {}))
+            annotation = _ANNOTATIONS.get(scalar_type, str)
+            if param.get("required", False):
+                required.append(
+                    inspect.Parameter(
+                        name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation
+                    )
+                )
+            else:
+                optional.append(
+                    inspect.Parameter(
+                        name,
+                        inspect.Parameter.KEYWORD_ONLY,
+                        default=None,
+                        annotation=annotation,
+                    )
+                )
+        if takes_body:
+            optional.append(
+                inspect.Parameter("data", inspect.Parameter.KEYWORD_ONLY, default=None)
+            )
+        return inspect.Signature(required + optional)
+
+    def __call__(self, **kwargs):
+        """Send the request and return the decoded JSON response."""
+        bound = self.__signature__.bind(**kwargs)
+        arguments = dict(bound.arguments)
+        data = arguments.pop("data", None)
+        params = {
+            self._names[name]: value
+            for name, value in arguments.items()
+            if value is not None
+        }
+
+        generator = self._client._generator
+        content_type = None
+        if data is not None:
+            content_type = select_content_type(
+                request_content_types(self.operation), data
+            )
+        generator.check_request(
+            generator.prepare(self.method, self.path), params, data, None, content_type
+        )
+        body = headers = None
+        if data is not None:
+            body, headers = encode_body(data, content_type)
+        return generator._send_request(
+            self.method, self.path, params=params, body=body, headers=headers
+        )
+
+    async def acall(self, **kwargs):
+        """Send the request without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._client._executor, lambda: self(**kwargs)
+        )
+
+    def map(self, items, concurrency=DEFAULT_CONCURRENCY, ordered=True):
+        """Call the operation once per keyword-argument dict; see ``APIClient.map``."""
+        return self._client.map(self, items, concurrency, ordered)
+
+
+class Resource:
+    """A namespace of operations and nested resources.
+
+    Children are available as attributes, with non-identifier characters
+    replaced by underscores, or by their original name via indexing.
+    """
+
+    def __init__(self, name):
+        """Initialize an empty resource."""
+        self._name = name
+        self._children = {}
+
+    def __repr__(self):
+        """Return a debug representation listing the children."""
+        return f"<Resource {self._name}: {', '.join(self._children)}>"
+
+    def __dir__(self):
+        """List children for interactive completion."""
+        return [python_name(name) for name in self._children]
+
+    def __getitem__(self, name):
+        """Return a child resource or operation by its original name."""
+        return self._children[name]
+
+    def __getattr__(self, name):
+        """Return a child resource or operation by attribute name."""
+        children = self.__dict__.get("_children", {})
+        for child_name, child in children.items():
+            if child_name == name or python_name(child_name) == name:
+                return child
+        raise AttributeError(f"'{self._name}' has no resource or action '{name}'")
+
+
+class APIClient(Resource):
+    """Programmatic client built from a ``CLIGenerator``.
+
+    Attributes:
+        session (requests.Session): The generator's ``requests`` session.
+        transport (Transport): The transport shared by all calls.
+
+    """
+
+    def __init__(self, generator, max_workers=DEFAULT_CONCURRENCY):
+        """Initialize the client from a generator's resource/action tree."""
+        super().__init__(generator.spec.get("info", {}).get("title", "api"))
+        self._generator = generator
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.session = generator.session
+        self.transport = generator.transport
+        self._populate(self, generator.build_resource_groups())
+
+    def _populate(self, resource, resource_dict):
+        """Recursively attach resources and operations."""
+        for name, value in resource_dict.items():
+            if name == "actions":
+                for action, operations in value.items():
+                    first = operations[0]
+                    resource._children[action] = Operation(
+                        self, first["method"], first["path"], first["operation"]
+                    )
+            else:
+                child = resource._children.get(name)
+                if not isinstance(child, Resource):
+                    child = resource._children[name] = Resource(name)
+                self._populate(child, value)
+
+    def map(self, operation, items, concurrency=DEFAULT_CONCURRENCY, ordered=True):
+        """Call an operation for many inputs with bounded parallelism.
+
+        Args:
+            operation (Operation): The operation to call.
+            items (iterable): Keyword-argument dicts, one per call.
+            concurrency (int): Maximum number of requests in flight.
+            ordered (bool): Yield results in input order.
+
+        Yields:
+            tuple: ``(kwargs, result)`` pairs; failed calls yield the exception.
+
+        """
+        self._generator.reserve_connections(concurrency)
+        return bounded_map(
+            lambda kwargs: operation(**kwargs), items, concurrency, ordered
+        )
+
+    async def amap(self, operation, items, concurrency=DEFAULT_CONCURRENCY):
+        """Await an operation for many inputs with bounded parallelism.
+
+        At most ``concurrency`` calls are in flight, on threads of their
+        own, and items are pulled from the iterable as calls complete.
+
+        Returns:
+            list: Results in input order; failed calls return the exception.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        self._generator.reserve_connections(concurrency)
+        loop = asyncio.get_running_loop()
+        # Workers pull items as they free up, so long inputs are not
+        # turned into coroutines all at once
+        items = enumerate(items)
+        results = {}
+
+        async def worker(executor):
+            for index, kwargs in items:
+                try:
+                    results[index] = await loop.run_in_executor(
+                        executor, functools.partial(operation, **kwargs)
+                    )
+                except Exception as e:
+                    results[index] = e
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            await asyncio.gather(*(worker(executor) for _ in range(concurrency)))
+        return [results[index] for index in range(len(results))]
+
+    def close(self):
+        """Shut down the worker threads, export metrics and close all connections."""
+        self._executor.shutdown(wait=True)
+        self._generator.close()
+
+    def __enter__(self):
+        """Use the client as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the client on exit."""
+        self.close()
+
+
+def python_name(name):
+    """Turn a resource, action or parameter name into a Python identifier."""
+    name = re.sub(r"\W", "_", name)
+    if keyword.iskeyword(name):
+        return f"{name}_"
+    if not name or name[0].isdigit():
+        return f"_{name}"
+    return name
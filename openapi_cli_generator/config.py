@@ -5,8 +5,106 @@ including adding, updating, and removing API aliases.
 """
 
 import json
+import os
+import shutil
 from pathlib import Path
 
+from .cassette import CASSETTE_MODES
+from .schema import boolean
+from .transport import TRANSPORTS
+
+
+def _positive_int(value):
+    """Parse a positive integer option value."""
+    number = int(value)
+    if number < 1:
+        raise ValueError(f"expected a positive integer, got {value}")
+    return number
+
+
+def _non_negative_int(value):
+    """Parse a non-negative integer option value."""
+    number = int(value)
+    if number < 0:
+        raise ValueError(f"expected a non-negative integer, got {value}")
+    return number
+
+
+def _transport(value):
+    """Parse a transport option value."""
+    if value not in TRANSPORTS:
+        raise ValueError(f"expected one of {', '.join(TRANSPORTS)}, got {value}")
+    return value
+
+
+def _non_negative_float(value):
+    """Parse a non-negative number option value."""
+    number = float(value)
+    if not number >= 0:
+        raise ValueError(f"expected a non-negative number, got {value}")
+    return number
+
+
+def _cassette_mode(value):
+    """Parse a cassette mode option value."""
+    if value not in CASSETTE_MODES:
+        raise ValueError(f"expected one of {', '.join(CASSETTE_MODES)}, got {value}")
+    return value
+
+
+def _path(value):
+    """Parse a file path option value; ``-`` stands for stderr."""
+    if not value:
+        raise ValueError("expected a file path")
+    return value if value == "-" else str(Path(value).expanduser().absolute())
+
+
+def _address(value):
+    """Parse a ``host:port`` option value into a ``[host, port]`` list."""
+    host, _, port = value.rpartition(":")
+    if not host or not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"expected host:port, got {value}")
+    return [host, int(port)]
+
+
+def _text(value):
+    """Parse a non-empty text option value, such as a credential."""
+    if not value:
+        raise ValueError("expected a non-empty value")
+    return value
+
+
+def _scopes(value):
+    """Parse space- or comma-separated OAuth2 scopes into a list."""
+    scopes = value.replace(",", " ").split()
+    if not scopes:
+        raise ValueError("expected at least one scope")
+    return scopes
+
+
+# Per-alias options and the parsers that validate their values
+ALIAS_OPTIONS = {
+    "transport": _transport,
+    "pool_size": _positive_int,
+    "metrics_file": _path,
+    "metrics_json": _path,
+    "metrics_statsd": _address,
+    "cassette": _path,
+    "cassette_mode": _cassette_mode,
+    "replay_latency": _non_negative_float,
+    "validation_workers": _non_negative_int,
+    "spec_ttl": _non_negative_float,
+    "auth_scheme": _text,
+    "api_key": _text,
+    "bearer_token": _text,
+    "client_id": _text,
+    "client_secret": _text,
+    "oauth_scopes": _scopes,
+    "validate_requests": boolean,
+}
+# Options whose values are masked when shown, unless read from the environment
+SECRET_OPTIONS = ("api_key", "bearer_token", "client_secret")
+
 
 class Config:
     """OpenAPI CLI configuration manager."""
@@ -48,20 +146,38 @@ class Config:
             self.save_config()
 
     def save_config(self):
-        """Save configuration to file."""
+        """Save configuration to file.
+
+        While credentials are stored, the file and its backup are made
+        readable by the owner only.
+        """
+        private = self._stores_secrets()
         # Create backup before saving
         if self.config_file.exists():
             backup_file = self.config_file.with_suffix(".json.bak")
             try:
-                import shutil
-
+                if private and backup_file.exists():
+                    backup_file.chmod(0o600)
                 shutil.copy2(self.config_file, backup_file)
+                if private:
+                    backup_file.chmod(0o600)
             except Exception:
                 pass  # Ignore backup errors
 
         with open(self.config_file, "w") as f:
+            if private and hasattr(os, "fchmod"):
+                # Before the secrets are written
+                os.fchmod(f.fileno(), 0o600)
             json.dump(self.config, f, indent=2)
 
+    def _stores_secrets(self):
+        """Check whether any alias has a credential option set."""
+        return any(
+            key in SECRET_OPTIONS
+            for options in self.config.get("alias_options", {}).values()
+            for key in options
+        )
+
     def add_alias(self, name, url):
         """Add a new API alias."""
         if name in self.config["aliases"]:
@@ -89,6 +205,38 @@ class Config:
         if name not in self.config["aliases"]:
             raise KeyError(f"Alias '{name}' not found")
         del self.config["aliases"][name]
+        self.config.get("alias_options", {}).pop(name, None)
+        self.save_config()
+
+    def get_alias_options(self, name):
+        """Get the options set for an alias."""
+        if name not in self.config["aliases"]:
+            raise KeyError(f"Alias '{name}' not found")
+        return dict(self.config.get("alias_options", {}).get(name, {}))
+
+    def set_alias_option(self, name, key, value):
+        """Set an option for an alias; a value of None removes the option.
+
+        Raises:
+            KeyError: If the alias does not exist.
+            ValueError: If the option is unknown or its value is invalid.
+        """
+        if name not in self.config["aliases"]:
+            raise KeyError(f"Alias '{name}' not found")
+        if key not in ALIAS_OPTIONS:
+            raise ValueError(
+                f"Unknown option '{key}'; choose one of: {', '.join(ALIAS_OPTIONS)}"
+            )
+        options = self.config.setdefault("alias_options", {}).setdefault(name, {})
+        if value is None:
+            options.pop(key, None)
+        else:
+            try:
+                options[key] = ALIAS_OPTIONS[key](value)
+            except ValueError as e:
+                raise ValueError(f"Invalid value for '{key}': {e}") from e
+        if not options:
+            del self.config["alias_options"][name]
         self.save_config()
 
     def list_aliases(self):
@@ -0,0 +1,459 @@
+"""Static Python code generation for OpenAPI specs.
+
+This module provides a class that writes a standalone Python package for a
+spec: one function per operation plus a pre-built command tree that is only
+turned into an argument parser for the command actually invoked. The emitted
+code depends on the standard library alone, so it imports quickly and can be
+installed in minimal containers.
+"""
+
+import keyword
+import re
+from pathlib import Path
+
+from .client import python_name
+from .encoding import request_content_types, select_content_type
+from .generator import HTTP_METHODS, CLIGenerator
+
+RESERVED_ARGUMENTS = ("data", "base_url", "headers")
+# Options of the emitted CLI that parameters are not given
+RESERVED_OPTIONS = ("data", "help")
+
+RUNTIME_TEMPLATE = '''"""HTTP runtime for the generated {title} client.
+
+Generated by openapi-cli-generator; do not edit.
+"""
+
+import gzip
+import json
+import os
+import zlib
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote, urlencode
+from urllib.request import Request, urlopen
+
+BASE_URL = os.environ.get({base_url_env!r}, {base_url!r})
+
+
+class APIError(Exception):
+    """Raised when the API cannot be reached or returns an error status."""
+
+
+def _is_json(content_type):
+    media_type = content_type.split(";")[0].strip()
+    return media_type == "application/json" or media_type.endswith("+json")
+
+
+def _query_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def call(
+    method,
+    path,
+    path_params=None,
+    query=None,
+    header=None,
+    cookie=None,
+    data=None,
+    content_type="application/json",
+    base_url=None,
+    headers=None,
+):
+    """Send a request and return the decoded JSON response."""
+    path = path.format(
+        **{{k: quote(str(v), safe="") for k, v in (path_params or {{}}).items()}}
+    )
+    url = (base_url or BASE_URL) + path
+    query = {{k: _query_value(v) for k, v in (query or {{}}).items() if v is not None}}
+    if query:
+        url += "?" + urlencode(query, doseq=True)
+
+    request_headers = {{"Accept": "application/json", "Accept-Encoding": "gzip, deflate"}}
+    request_headers.update(
+        {{k: str(v) for k, v in (header or {{}}).items() if v is not None}}
+    )
+    cookies = [f"{{k}}={{v}}" for k, v in (cookie or {{}}).items() if v is not None]
+    if cookies:
+        request_headers["Cookie"] = "; ".join(cookies)
+    request_headers.update(headers or {{}})
+
+    body = None
+    if data is not None:
+        if isinstance(data, bytes) or hasattr(data, "read"):
+            body = data
+        elif _is_json(content_type):
+            body = json.dumps(data).encode()
+        else:
+            raise APIError(
+                f"Unsupported request body type {{content_type}}: "
+                "pass the encoded body as bytes or a file"
+            )
+        request_headers["Content-Type"] = content_type
+
+    request = Request(url, data=body, headers=request_headers, method=method.upper())
+    try:
+        with urlopen(request) as response:
+            raw = response.read()
+            encoding = response.headers.get("Content-Encoding", "")
+    except HTTPError as e:
+        raise APIError(f"{{e.code}} {{e.reason}} for url: {{url}}") from e
+    except URLError as e:
+        raise APIError(f"Error making request: {{e.reason}}") from e
+
+    if encoding == "gzip":
+        raw = gzip.decompress(raw)
+    elif encoding == "deflate":
+        raw = zlib.decompress(raw)
+    return json.loads(raw) if raw else None
+'''
+
+CLI_TEMPLATE = '''"""Command line interface for the {title} API.
+
+Generated by openapi-cli-generator; do not edit.
+"""
+
+import json
+import sys
+
+PROG = {prog!r}
+DESCRIPTION = {description!r}
+
+# Resources nest into further resources or actions. Actions are
+# [function, summary, parameters, has_body] lists and parameters are
+# [name, dest, type, required, help] lists.
+TREE = {tree}
+
+
+def _parse_bool(value):
+    if value.lower() in ("1", "true", "yes", "on"):
+        return True
+    if value.lower() in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(value)
+
+
+_TYPES = {{"integer": int, "number": float, "boolean": _parse_bool}}
+
+
+def _parse_data(value):
+    if value == "-":
+        return sys.stdin.buffer
+    if value.startswith("@"):
+        return open(value[1:], "rb")
+    return json.loads(value)
+
+
+def _print_commands(prog, node, stream):
+    stream.write(f"usage: {{prog}} {{{{{{','.join(node)}}}}}} ...\\n\\n")
+    if prog == PROG and DESCRIPTION:
+        stream.write(DESCRIPTION + "\\n\\n")
+    stream.write("commands:\\n")
+    for name, child in node.items():
+        summary = child[1] if isinstance(child, list) else f"Operations on {{name}}"
+        stream.write(f"  {{name:<24}} {{summary}}\\n")
+
+
+def _build_parser(prog, action):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description=action[1])
+    for name, dest, type_name, required, help_text in action[2]:
+        kwargs = {{"help": help_text, "type": _TYPES.get(type_name, str)}}
+        if required:
+            parser.add_argument(dest, metavar=name, **kwargs)
+        else:
+            parser.add_argument(f"--{{name}}", dest=dest, **kwargs)
+    if action[3]:
+        parser.add_argument(
+            "--data",
+            type=_parse_data,
+            help="Request body: JSON string, @file to stream a file or - for stdin",
+        )
+    return parser
+
+
+def main(argv=None):
+    """Run the command line interface."""
+    argv = sys.argv[1:] if argv is None else argv
+    node, prog, index = TREE, PROG, 0
+    while isinstance(node, dict):
+        if index >= len(argv) or argv[index] in ("-h", "--help"):
+            wants_help = index < len(argv)
+            _print_commands(prog, node, sys.stdout if wants_help else sys.stderr)
+            return 0 if wants_help else 2
+        if argv[index] not in node:
+            sys.stderr.write(f"{{prog}}: unknown command '{{argv[index]}}'\\n")
+            return 2
+        node, prog = node[argv[index]], f"{{prog}} {{argv[index]}}"
+        index += 1
+
+    args = vars(_build_parser(prog, node).parse_args(argv[index:]))
+
+    from . import operations
+    from ._runtime import APIError
+
+    try:
+        result = getattr(operations, node[0])(**args)
+    except APIError as e:
+        sys.stderr.write(f"Error: {{e}}\\n")
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+'''
+
+INIT_TEMPLATE = '''"""{title} API client.
+
+Generated by openapi-cli-generator; do not edit. Operation functions are
+loaded from the ``operations`` module on first access.
+"""
+
+__version__ = {version!r}
+
+
+import importlib
+
+
+def __getattr__(name):
+    if not name.startswith("_") and name not in ("cli", "operations"):
+        operations = importlib.import_module(f"{{__name__}}.operations")
+        if hasattr(operations, name):
+            return getattr(operations, name)
+    raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+'''
+
+MAIN_TEMPLATE = '''"""Run the {title} CLI with ``python -m {package}``."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
+'''
+
+PYPROJECT_TEMPLATE = """[build-system]
+requires = ["setuptools>=61"]
+build-backend = "setuptools.build_meta"
+
+[project]
+name = "{distribution}"
+version = "{version}"
+description = "Command line interface for the {title} API"
+requires-python = ">=3.7"
+dependencies = []
+
+[project.scripts]
+{prog} = "{package}.cli:main"
+
+[tool.setuptools]
+packages = ["{package}"]
+"""
+
+
+class PythonEmitter:
+    """Emit a standalone Python CLI package from an OpenAPI spec.
+
+    Attributes:
+        spec (dict): The parsed OpenAPI specification.
+        package (str): Name of the emitted Python package.
+
+    """
+
+    def __init__(self, spec, package=None):
+        """Initialize the emitter with a spec and optional package name."""
+        self.spec = spec
+        self.info = spec.get("info", {})
+        self.package = package or self._default_package_name()
+        if not self.package.isidentifier() or keyword.iskeyword(self.package):
+            raise ValueError(f"Invalid package name: {self.package}")
+        self.generator = CLIGenerator(spec)
+        self.functions = {}
+
+    def _default_package_name(self):
+        """Derive a package name from the spec title."""
+        title = re.sub(r"\W+", "_", self.info.get("title", "api").lower()).strip("_")
+        if not title or title[0].isdigit():
+            title = f"api_{title}"
+        return f"{title}_cli"
+
+    def emit(self, out_dir):
+        """Write the package and its ``pyproject.toml`` into ``out_dir``.
+
+        Returns:
+            Path: The directory of the emitted Python package.
+        """
+        out_dir = Path(out_dir)
+        package_dir = out_dir / self.package
+        package_dir.mkdir(parents=True, exist_ok=True)
+
+        operations = self._emit_operations()
+        tree = self._emit_tree(self.generator.build_resource_groups())
+        context = {
+            "title": self.info.get("title", "API"),
+            "version": self.info.get("version", "0.0.0"),
+            "package": self.package,
+            "prog": self.package.replace("_", "-"),
+            "distribution": self.package.replace("_", "-"),
+        }
+
+        files = {
+            "__init__.py": INIT_TEMPLATE.format(**context),
+            "__main__.py": MAIN_TEMPLATE.format(**context),
+            "_runtime.py": RUNTIME_TEMPLATE.format(
+                base_url=self.generator.base_url,
+                base_url_env=f"{self.package.upper()}_BASE_URL",
+                **context,
+            ),
+            "operations.py": operations,
+            "cli.py": CLI_TEMPLATE.format(
+                description=self.info.get("description", ""),
+                tree=_format_tree(tree),
+                **context,
+            ),
+        }
+        for name, content in files.items():
+            (package_dir / name).write_text(content)
+        (out_dir / "pyproject.toml").write_text(PYPROJECT_TEMPLATE.format(**context))
+        return package_dir
+
+    def _emit_tree(self, resource_dict):
+        """Convert resource groups into the literal command tree."""
+        tree = {}
+        for name, value in resource_dict.items():
+            if name == "actions":
+                for action, operations in value.items():
+                    first = operations[0]
+                    operation = first["operation"]
+                    tree[action] = [
+                        self.functions[(first["path"], first["method"])],
+                        operation.get("summary", "").strip(),
+                        self._emit_arguments(first["path"], first["method"]),
+                        "requestBody" in operation,
+                    ]
+            else:
+                tree[name] = self._emit_tree(value)
+        return tree
+
+    def _emit_arguments(self, path, method):
+        """Build the command-line arguments of an operation for the tree.
+
+        Optional parameters named like the CLI's own options get a
+        ``-param`` suffix, e.g. ``--data-param``.
+        """
+        taken = set(RESERVED_OPTIONS)
+        arguments = []
+        for param, dest in self._parameters(path, method):
+            name = param["name"]
+            required = param.get("required", False)
+            if not required:
+                while name in taken:
+                    name += "-param"
+                taken.add(name)
+            arguments.append(
+                [
+                    name,
+                    dest,
+                    param.get("schema", {}).get("type", "string"),
+                    required,
+                    param.get("description", ""),
+                ]
+            )
+        return arguments
+
+    def _emit_operations(self):
+        """Render the operations module with one function per operation."""
+        chunks = [
+            f'"""Operations of the {self.info.get("title", "API")} API.\n\n'
+            'Generated by openapi-cli-generator; do not edit.\n"""\n\n'
+            "from ._runtime import call\n"
+        ]
+        for path, path_item in self.spec["paths"].items():
+            for method, operation in path_item.items():
+                if method.lower() not in HTTP_METHODS:
+                    continue
+                name = self._function_name(path, method)
+                self.functions[(path, method)] = name
+                chunks.append(self._emit_function(name, path, method, operation))
+        return "\n\n".join(chunks)
+
+    def _function_name(self, path, method):
+        """Build a unique function name from the resource/action mapping."""
+        resource_path, action = self.generator._get_resource_and_action(path, method)
+        base = python_name("_".join(resource_path + [action]))
+        name, counter = base, 2
+        while name in self.functions.values():
+            name, counter = f"{base}_{counter}", counter + 1
+        return name
+
+    def _parameters(self, path, method):
+        """Return ``(parameter, dest)`` pairs with Python-safe names."""
+        seen = set(RESERVED_ARGUMENTS)
+        pairs = []
+        for param in self.generator.prepare(method, path).parameters:
+            dest = python_name(param["name"])
+            while dest in seen:
+                dest += "_"
+            seen.add(dest)
+            pairs.append((param, dest))
+        return pairs
+
+    def _emit_function(self, name, path, method, operation):
+        """Render a single operation function."""
+        params = self._parameters(path, method)
+        required = [dest for param, dest in params if param.get("required", False)]
+        optional = [f"{dest}=None" for param, dest in params if dest not in required]
+        has_body = "requestBody" in operation
+        if has_body:
+            optional.append("data=None")
+        signature = ", ".join(required + ["*"] + optional + ["base_url=None"])
+
+        summary = operation.get("summary", "").strip() or f"{method.upper()} {path}"
+        summary = summary.rstrip(".").replace("\\", "\\\\").replace('"""', "'''")
+        lines = [
+            f"def {name}({signature}, headers=None):",
+            f'    """{summary}.\n\n    {method.upper()} {path}\n    """',
+            "    return call(",
+            f"        {method!r},",
+            f"        {path!r},",
+        ]
+        for location, keyword_name in (
+            ("path", "path_params"),
+            ("query", "query"),
+            ("header", "header"),
+            ("cookie", "cookie"),
+        ):
+            items = [
+                f"{param['name']!r}: {dest}"
+                for param, dest in params
+                if param.get("in", "query") == location
+            ]
+            if items:
+                lines.append(f"        {keyword_name}={{{', '.join(items)}}},")
+        if has_body:
+            # Bodies other than bytes or files are sent as JSON
+            content_type = select_content_type(request_content_types(operation), {})
+            lines.append("        data=data,")
+            lines.append(f"        content_type={content_type!r},")
+        lines.append("        base_url=base_url,")
+        lines.append("        headers=headers,")
+        lines.append("    )\n")
+        return "\n".join(lines)
+
+
+def _format_tree(tree, indent=0):
+    """Render the command tree as a readable Python literal."""
+    pad = " " * (indent + 4)
+    lines = ["{"]
+    for name, value in tree.items():
+        if isinstance(value, dict):
+            lines.append(f"{pad}{name!r}: {_format_tree(value, indent + 4)},")
+        else:
+            lines.append(f"{pad}{name!r}: {value!r},")
+    lines.append(" " * indent + "}")
+    return "\n".join(lines)
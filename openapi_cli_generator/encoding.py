@@ -0,0 +1,247 @@
+"""Request and response body encoding.
+
+This module provides helpers for turning ``--data``/``--file`` arguments into
+request bodies that are streamed from disk or stdin, optionally gzip
+compressed, and encoded according to the operation's ``requestBody`` content
+types (JSON, form, multipart or raw binary).
+"""
+
+import argparse
+import json
+import mimetypes
+import os
+import sys
+import uuid
+import zlib
+from urllib.parse import urlencode
+
+from urllib3.util.request import ACCEPT_ENCODING
+
+CHUNK_SIZE = 64 * 1024
+
+JSON_CONTENT_TYPE = "application/json"
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+MULTIPART_CONTENT_TYPE = "multipart/form-data"
+BINARY_CONTENT_TYPE = "application/octet-stream"
+
+
+class RequestBody:
+    """A request body that is read lazily from a file or stdin.
+
+    Attributes:
+        source (str): Path of the file to stream, or ``-`` for stdin.
+
+    """
+
+    def __init__(self, source):
+        """Initialize the body with a file path or ``-`` for stdin."""
+        self.source = source
+
+    def __repr__(self):
+        """Return a debug representation of the body source."""
+        return f"RequestBody({self.source!r})"
+
+    @property
+    def is_stdin(self):
+        """Whether the body is read from standard input."""
+        return self.source == "-"
+
+    def open(self):
+        """Open the body source for binary reading."""
+        if self.is_stdin:
+            return sys.stdin.buffer
+        return open(self.source, "rb")
+
+
+def accept_encoding():
+    """Return the Accept-Encoding header value for decodable encodings.
+
+    gzip and deflate are always available; ``br`` and ``zstd`` are advertised
+    when the optional ``brotli``/``zstandard`` packages are installed.
+    """
+    return ", ".join(e.strip() for e in ACCEPT_ENCODING.split(","))
+
+
+def parse_data_argument(value):
+    """Parse a ``--data`` argument.
+
+    ``@path`` streams the body from a file and ``-`` streams it from stdin;
+    anything else is parsed as an inline JSON document.
+    """
+    if value == "-":
+        return RequestBody("-")
+    if value.startswith("@"):
+        path = value[1:]
+        if not os.path.isfile(path):
+            raise argparse.ArgumentTypeError(f"Request body file not found: {path}")
+        return RequestBody(path)
+    return json.loads(value)
+
+
+def parse_file_argument(value):
+    """Parse a ``--file NAME=PATH`` multipart argument into a tuple."""
+    name, sep, path = value.partition("=")
+    if not sep or not name or not path:
+        raise argparse.ArgumentTypeError(f"Expected NAME=PATH, got: {value}")
+    path = path[1:] if path.startswith("@") else path
+    if not os.path.isfile(path):
+        raise argparse.ArgumentTypeError(f"Upload file not found: {path}")
+    return name, path
+
+
+def request_content_types(operation):
+    """Return the content types accepted by an operation's request body."""
+    return list(operation.get("requestBody", {}).get("content", {}).keys())
+
+
+def select_content_type(content_types, data=None, files=None):
+    """Pick the content type used to send a request body.
+
+    Multipart is preferred when files are uploaded, JSON when an inline
+    document is given, and otherwise the first type listed in the spec.
+    """
+    if files:
+        if MULTIPART_CONTENT_TYPE in content_types or not content_types:
+            return MULTIPART_CONTENT_TYPE
+        raise ValueError("Operation does not accept multipart/form-data uploads")
+    if not content_types:
+        return JSON_CONTENT_TYPE
+    if not isinstance(data, RequestBody):
+        for content_type in content_types:
+            if is_json_content_type(content_type):
+                return content_type
+    return content_types[0]
+
+
+def iter_file(fileobj, chunk_size=CHUNK_SIZE, close=False):
+    """Yield chunks read from a binary file object.
+
+    With ``close``, the file is closed once it has been read, or when the
+    iterator is closed before that.
+    """
+    try:
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        if close:
+            fileobj.close()
+
+
+def iter_gzip(chunks):
+    """Gzip-compress an iterable of byte chunks incrementally.
+
+    Closing the iterator closes ``chunks`` too, if it can be closed.
+    """
+    compressor = zlib.compressobj(wbits=31)
+    try:
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def iter_multipart(fields, files, boundary):
+    """Yield a multipart/form-data body, streaming uploaded files from disk.
+
+    Args:
+        fields (dict): Plain form fields; non-string values are JSON encoded.
+        files (list): ``(name, path)`` tuples of files to upload.
+        boundary (str): The multipart boundary.
+
+    """
+    delimiter = f"--{boundary}\r\n".encode()
+    for name, value in (fields or {}).items():
+        if not isinstance(value, str):
+            value = json.dumps(value)
+        yield delimiter
+        yield (
+            f'Content-Disposition: form-data; name="{_quote(name)}"\r\n\r\n'
+        ).encode()
+        yield value.encode() + b"\r\n"
+    for name, path in files or []:
+        filename = os.path.basename(path)
+        content_type = mimetypes.guess_type(filename)[0] or BINARY_CONTENT_TYPE
+        yield delimiter
+        yield (
+            f'Content-Disposition: form-data; name="{_quote(name)}"; '
+            f'filename="{_quote(filename)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        with open(path, "rb") as f:
+            yield from iter_file(f)
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode()
+
+
+def encode_body(data=None, content_type=None, files=None, compress=False):
+    """Encode a request body for sending.
+
+    Args:
+        data: Parsed ``--data`` value: a JSON document or a ``RequestBody``.
+        content_type (str): Content type the body is sent as.
+        files (list): ``(name, path)`` tuples for multipart uploads.
+        compress (bool): Gzip the body and set ``Content-Encoding``.
+
+    Returns:
+        tuple: ``(body, headers)`` where body is bytes, a file object or an
+        iterator of byte chunks suitable for ``requests``.
+
+    """
+    content_type = content_type or JSON_CONTENT_TYPE
+    headers = {}
+
+    if content_type.startswith(MULTIPART_CONTENT_TYPE):
+        if isinstance(data, RequestBody):
+            raise ValueError("Multipart bodies take form fields as inline JSON")
+        if data is not None and not isinstance(data, dict):
+            raise ValueError("Multipart form fields must be a JSON object")
+        boundary = uuid.uuid4().hex
+        body = iter_multipart(data, files, boundary)
+        content_type = f"{MULTIPART_CONTENT_TYPE}; boundary={boundary}"
+    elif isinstance(data, RequestBody):
+        fileobj = data.open()
+        # Regular files are sent with a Content-Length; pipes are chunked.
+        body = iter_file(fileobj) if data.is_stdin else fileobj
+    elif content_type == FORM_CONTENT_TYPE:
+        if not isinstance(data, dict):
+            raise ValueError("Form bodies must be a JSON object")
+        body = urlencode(data, doseq=True).encode()
+    elif is_json_content_type(content_type):
+        body = json.dumps(data).encode()
+    elif isinstance(data, str):
+        body = data.encode()
+    else:
+        raise ValueError(f"Cannot encode inline JSON as {content_type}; use @file")
+
+    headers["Content-Type"] = content_type
+    if compress:
+        if isinstance(body, bytes):
+            body = b"".join(iter_gzip([body]))
+        else:
+            # The file is closed once it has been compressed and sent
+            chunks = iter_file(body, close=True) if hasattr(body, "read") else body
+            body = iter_gzip(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+def _quote(value):
+    """Escape a multipart field name or filename for a quoted header value.
+
+    Quotes and line breaks are percent-encoded, as browsers do, so a value
+    cannot end the header or inject another one.
+    """
+    return value.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def is_json_content_type(content_type):
+    """Check whether a content type carries JSON."""
+    media_type = content_type.split(";")[0].strip()
+    return media_type == JSON_CONTENT_TYPE or media_type.endswith("+json")
@@ -0,0 +1,39 @@
+"""File system helpers.
+
+This module provides the atomic file replacement shared by the on-disk
+caches, cassettes and metrics files, so concurrent CLI invocations never
+read a partly written file.
+"""
+
+import os
+
+
+def write_atomic(path, text, mode=0o666):
+    """Replace a file's contents atomically.
+
+    The text is written to a temporary file next to ``path``, which then
+    replaces it.
+
+    Args:
+        path (str or Path): The file to write.
+        text (str): The new contents.
+        mode (int): Permissions of a newly written file, before the umask;
+            e.g. ``0o600`` for files holding credentials.
+
+    Raises:
+        OSError: If the file cannot be written; the temporary file is
+            removed.
+    """
+    path = os.fspath(path)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        with open(fd, "w") as f:
+            f.write(text)
+        os.replace(temporary, path)
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
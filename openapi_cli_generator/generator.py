@@ -4,40 +4,289 @@ This module provides a class for generating command line interfaces from OpenAPI
 """
 
 import argparse
+import itertools
 import json
 import sys
+import threading
+import time
 
 import requests
 
+from .auth import Authenticator, query_credentials
+from .bench import DEFAULT_DURATION, run_load
+from .client import DEFAULT_CONCURRENCY, APIClient, bounded_map
+from .encoding import (
+    CHUNK_SIZE,
+    MULTIPART_CONTENT_TYPE,
+    RequestBody,
+    accept_encoding,
+    encode_body,
+    is_json_content_type,
+    parse_data_argument,
+    parse_file_argument,
+    request_content_types,
+    select_content_type,
+)
+from .metrics import body_size, count_chunks, json_size
+from .output import OUTPUT_FORMATS, JSONStream, Query, write_output
+from .prepared import PreparedOperation
+from .schema import ARGUMENT_TYPES, SchemaCompiler
+from .servers import ServerSelector, expand_servers
+from .transport import DEFAULT_TRANSPORT, connect_failed, create_transport
+from .validation import format_errors
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+DEFAULT_POOL_SIZE = 10
+# Methods a server may receive twice with the same effect (RFC 9110)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
 
 class CLIGenerator:
     """CLI Generator class."""
 
-    def __init__(self, spec):
-        """Initialize CLI Generator with OpenAPI spec."""
+    def __init__(
+        self,
+        spec,
+        pool_size=DEFAULT_POOL_SIZE,
+        transport=DEFAULT_TRANSPORT,
+        metrics=None,
+        cassette=None,
+        credentials=None,
+        validate_requests=True,
+    ):
+        """Initialize CLI Generator with OpenAPI spec.
+
+        Args:
+            spec (dict): The parsed OpenAPI specification.
+            pool_size (int): Connections kept open per host by the shared session.
+            transport (str): ``http1`` (pooled ``requests`` session), ``http2``
+                (HTTP/2 over TLS, multiplexing concurrent requests over one
+                connection per host) or ``h2c`` (HTTP/2 over cleartext).
+            metrics (Metrics): Registry recording every call, or None.
+            cassette (Cassette): Cassette to record responses into or
+                replay them from instead of calling the API, or None.
+            credentials (dict): Credentials for the spec's security schemes
+                (see ``Authenticator``), or None to send no credentials.
+            validate_requests (bool): Check parameter values and inline
+                request bodies against the operation's schemas before
+                sending them (see ``check_request``).
+        """
         self.spec = spec
+        self.metrics = metrics
         self.parser = None
         self.base_url = self._get_base_url()
+        self.session = self._create_session()
+        self.transport = create_transport(transport, self.session, pool_size)
+        if cassette is not None:
+            self.transport = cassette.transport(
+                self.transport, redact=query_credentials(spec)
+            )
+        self.auth = None
+        if credentials:
+            self.auth = Authenticator(
+                self.spec, credentials, self.transport, self.base_url
+            )
+        self.server_selector = ServerSelector(
+            self.spec.get("servers", []), session=self.session
+        )
+        self.validate_requests = validate_requests
+        self.schemas = SchemaCompiler(spec)
+        self._prepared = {}
+
+    @property
+    def pool_size(self):
+        """Return the number of connections the transport keeps per host."""
+        return self.transport.pool_size
+
+    def reserve_connections(self, concurrency):
+        """Grow the transport's pool to serve ``concurrency`` requests at once."""
+        if concurrency > self.pool_size:
+            self.transport.resize(concurrency)
+
+    def _create_session(self):
+        """Create the HTTP session shared by all HTTP/1.1 requests."""
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = accept_encoding()
+        return session
 
     def _get_base_url(self):
-        """Extract base URL from the OpenAPI spec."""
-        if "servers" in self.spec and self.spec["servers"]:
-            return self.spec["servers"][0]["url"]
-        return ""
-
-    def _make_request(self, method, path, params=None, data=None):
-        """Make HTTP request to the API."""
-        url = self.base_url + path
-        try:
-            response = requests.request(
-                method=method.upper(), url=url, params=params, json=data
+        """Extract base URL from the OpenAPI spec.
+
+        Server variables are replaced by their defaults; see ``_server_urls``
+        for choosing between several servers.
+        """
+        urls = expand_servers(self.spec.get("servers", []))
+        return urls[0] if urls else ""
+
+    def _server_urls(self):
+        """Return base URLs to try in order.
+
+        With several candidate servers the fastest healthy one comes first,
+        as measured (and cached) by the server selector.
+        """
+        if len(self.server_selector.candidates) > 1 and self.transport.network:
+            return self.server_selector.select()
+        return [self.base_url]
+
+    def prepare(self, method, path):
+        """Return the compiled request template for an operation.
+
+        Templates are built once per operation and cached, so repeated and
+        fanned-out calls only have to place their argument values.
+        """
+        key = (method.lower(), path)
+        template = self._prepared.get(key)
+        if template is None:
+            path_item = self.spec["paths"][path]
+            template = PreparedOperation(
+                method, path, path_item[key[0]], path_item, self.spec, self.schemas
             )
+            self._prepared[key] = template
+        return template
+
+    def check_request(self, template, params, data=None, files=None, content_type=None):
+        """Check a request's arguments before sending it.
+
+        Parameter values and an inline request body are validated with the
+        operation's compiled schemas, so invalid requests fail without a
+        round-trip to the API.
+
+        Args:
+            template (PreparedOperation): The operation to call.
+            params (dict): Parameter values keyed by name.
+            data: The request body: a JSON document, a ``RequestBody`` (not
+                checked) or None.
+            files (list): Multipart uploads, or None.
+            content_type (str): Content type the body is sent as, or None to
+                select it like ``_encode_request_body`` does.
+
+        Raises:
+            ValueError: Listing every invalid value.
+        """
+        if not self.validate_requests:
+            return
+        errors = template.parameter_errors(params)
+        if data is not None or not files:
+            if content_type is None and not isinstance(data, RequestBody):
+                content_type = select_content_type(
+                    request_content_types(template.operation), data, files
+                )
+            errors.extend(template.body_errors(data, content_type))
+        if errors:
+            raise ValueError(f"Invalid request: {format_errors(errors)}")
+
+    def _open_request(
+        self, method, path, params=None, data=None, body=None, headers=None
+    ):
+        """Send an HTTP request and return the response with its body unread.
+
+        ``data`` is sent as JSON; ``body`` is an already encoded payload (see
+        ``encode_body``) that may be a file object or a chunk iterator.
+
+        ``params`` maps parameter names to values; the operation's prepared
+        template places them into the path, query string, headers or cookies.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+            ValueError: If a path parameter is missing.
+        """
+        template = self.prepare(method, path)
+        metrics = self.metrics
+        payload = body
+        sent = [0]
+        if metrics is not None:
+            size = body_size(body)
+            if size is None:
+                payload = count_chunks(body, sent)
+            else:
+                sent[0] = size
+        status = None
+        retries = 0
+        tokens = ()
+        start = time.perf_counter()
+        try:
+            url_path, query, param_headers, cookies = template.build(params or {})
+            if self.auth is not None:
+                tokens = self.auth.apply(template, query, param_headers, cookies)
+            if headers:
+                param_headers.update(headers)
+            base_urls = self._server_urls()
+            start = time.perf_counter()
+            for attempt, base_url in enumerate(base_urls, 1):
+                try:
+                    response = self.transport.request(
+                        method=template.method,
+                        url=base_url + url_path,
+                        params=query,
+                        json=data,
+                        data=payload,
+                        headers=param_headers,
+                        cookies=cookies,
+                        stream=True,
+                    )
+                    break
+                except requests.exceptions.ConnectionError as e:
+                    # Fail over to the next server if the request cannot have
+                    # been applied already and the body can be resent
+                    safe = template.method in IDEMPOTENT_METHODS or connect_failed(e)
+                    if attempt == len(base_urls) or not safe or not _rewind(body):
+                        raise
+                    self.server_selector.report_failure(base_url)
+                    retries += 1
+            status = response.status_code
+            if status == 401 and tokens:
+                # Have the next call fetch a new token
+                self.auth.reject(tokens)
+            if metrics is not None and data is not None:
+                sent[0] = json_size(response, data)
             response.raise_for_status()
-            return response.json()
+            if metrics is not None:
+                return metrics.meter(template.name, response)
+            return response
+        except requests.exceptions.RequestException as e:
+            if status is None:
+                status = type(e).__name__
+            raise
+        finally:
+            if metrics is not None and status is not None:
+                elapsed = time.perf_counter() - start
+                metrics.record(template.name, status, elapsed, sent[0], retries)
+            if hasattr(body, "close"):
+                body.close()
+
+    def _send_request(
+        self, method, path, params=None, data=None, body=None, headers=None
+    ):
+        """Send an HTTP request and return the decoded JSON response."""
+        response = self._open_request(method, path, params, data, body, headers)
+        return response.json()
+
+    def _make_request(
+        self, method, path, params=None, data=None, body=None, headers=None
+    ):
+        """Make HTTP request to the API, exiting on failure."""
+        try:
+            return self._send_request(method, path, params, data, body, headers)
         except requests.exceptions.RequestException as e:
             print(f"Error making request: {str(e)}")
             sys.exit(1)
 
+    def client(self):
+        """Return a programmatic client for the spec's operations.
+
+        The client exposes the same resource/action tree as the CLI, e.g.
+        ``client.hr.employees.create(data={...})``, and shares this
+        generator's transport.
+        """
+        return APIClient(self)
+
+    def close(self):
+        """Export the collected metrics and close all connections."""
+        if self.metrics is not None:
+            self.metrics.close()
+        self.transport.close()
+        self.session.close()
+
     def _get_resource_and_action(self, path, method):
         """Extract resource and action from path and method."""
         # Remove leading/trailing slashes and split path
@@ -87,42 +336,176 @@ class CLIGenerator:
         )
 
         # Store method and path for execution
-        command_parser.set_defaults(method=method, path=path)
+        command_parser.set_defaults(
+            method=method, path=path, action_parser=command_parser
+        )
 
         # Add parameters as arguments
-        if "parameters" in operation:
-            for param in operation["parameters"]:
-                name = param["name"]
-                required = param.get("required", False)
-                help_text = param.get("description", "")
-                param_type = param.get("schema", {}).get("type", "string")
-
-                if required:
-                    command_parser.add_argument(
-                        name, help=help_text, type=self._get_type(param_type)
-                    )
-                else:
-                    command_parser.add_argument(
-                        f"--{name}", help=help_text, type=self._get_type(param_type)
-                    )
+        self._add_parameter_arguments(command_parser, method, path)
 
         # Handle request body if present
-        if "requestBody" in operation:
-            command_parser.add_argument(
-                "--data", help="Request body (JSON string)", type=json.loads
-            )
+        self._add_request_body_arguments(command_parser, operation)
+        self._add_output_arguments(command_parser)
+        self._add_fan_out_arguments(command_parser)
+
+    def _add_parameter_arguments(self, parser, method, path):
+        """Add the operation's parameters as arguments.
+
+        Required parameters are positional and optional for argparse, so
+        ``--for-each`` can supply them; ``execute`` checks that each one was
+        given otherwise. A sole required parameter accepts several values,
+        so a command can fan out over e.g. many IDs.
+        """
+        template = self.prepare(method, path)
+        nargs = "*" if len(template.required_parameters) == 1 else "?"
+        for param in template.parameters:
+            name = param["name"]
+            required = param.get("required", False)
+            help_text = param.get("description", "")
+            param_type = self.schemas.argument_type(param.get("schema", {}))
+
+            if required:
+                parser.add_argument(
+                    name,
+                    help=help_text,
+                    type=param_type,
+                    nargs=nargs,
+                )
+            else:
+                parser.add_argument(
+                    f"--{name}",
+                    dest=name,
+                    help=help_text,
+                    type=param_type,
+                )
+
+    def _add_fan_out_arguments(self, parser):
+        """Add arguments for running one command over many inputs.
+
+        The ``--fan-out-*`` spellings stay available when the operation has
+        parameters of the same names.
+        """
+        _add_option(
+            parser,
+            ("--for-each", "--fan-out-input"),
+            dest="fan_out_input",
+            metavar="FILE",
+            help="Run once per line of FILE (- for stdin): a JSON object of "
+            "parameters or a value for the first required parameter",
+        )
+        _add_option(
+            parser,
+            ("--concurrency", "--fan-out-concurrency"),
+            dest="fan_out_concurrency",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help=f"Requests in flight when fanning out (default: {DEFAULT_CONCURRENCY})",
+        )
+        _add_option(
+            parser,
+            ("--ordered", "--fan-out-ordered"),
+            dest="fan_out_ordered",
+            action="store_true",
+            help="Write fan-out results in input order",
+        )
 
-    def generate_cli(self):
-        """Generate CLI interface from OpenAPI spec."""
-        self.parser = argparse.ArgumentParser(
-            description=self.spec.get("info", {}).get("description", "")
+    def _add_output_arguments(self, parser):
+        """Add output format and query arguments.
+
+        The ``--output-format``/``--output-query`` spellings stay available
+        when the operation has its own ``output`` or ``query`` parameter.
+        """
+        _add_option(
+            parser,
+            ("-o", "--output", "--output-format"),
+            dest="output_format",
+            choices=OUTPUT_FORMATS,
+            default="json",
+            help="Output format (default: json)",
+        )
+        _add_option(
+            parser,
+            ("--query", "--output-query"),
+            dest="output_query",
+            type=Query,
+            help="Comma-separated fields to select and field==value filters",
         )
 
-        # First pass: collect all resources and their actions
+    def _write_response(self, response, output_format="json", query=None):
+        """Stream a response body to stdout in the requested format.
+
+        Bodies that are not JSON, such as an error page from a proxy, are
+        written as they are.
+        """
+        content_type = response.headers.get("content-type", "")
+        if content_type and not is_json_content_type(content_type):
+            for chunk in response.iter_content(CHUNK_SIZE):
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.flush()
+            return
+        stream = JSONStream(response.iter_content(CHUNK_SIZE))
+        records = stream.records()
+        fields = None
+        if query is not None:
+            records = query.apply(records)
+            fields = query.fields or None
+        write_output(records, output_format, is_array=stream.is_array, fields=fields)
+
+    def _add_request_body_arguments(self, parser, operation):
+        """Add arguments for sending the operation's request body.
+
+        The ``--body-*`` spellings stay available when the operation has
+        parameters of the same names.
+        """
+        if "requestBody" not in operation:
+            return
+
+        content_types = request_content_types(operation)
+        _add_option(
+            parser,
+            ("--data", "--body-data"),
+            dest="body_data",
+            help="Request body: JSON string, @file to stream a file or - for stdin",
+            type=parse_data_argument,
+        )
+        if MULTIPART_CONTENT_TYPE in content_types:
+            _add_option(
+                parser,
+                ("--file", "--body-file"),
+                dest="body_files",
+                help="Multipart file upload as NAME=PATH (repeatable)",
+                type=parse_file_argument,
+                action="append",
+            )
+        if len(content_types) > 1:
+            _add_option(
+                parser,
+                ("--content-type", "--body-content-type"),
+                dest="body_content_type",
+                help="Request body content type",
+                choices=content_types,
+            )
+        _add_option(
+            parser,
+            ("--compress", "--body-compress"),
+            dest="body_compress",
+            help="Gzip-compress the request body",
+            action="store_true",
+        )
+
+    def build_resource_groups(self):
+        """Group the spec's operations into a nested resource/action tree.
+
+        Returns:
+            dict: Nested resources; leaf resources carry an ``actions`` dict
+            mapping each action name to its list of operations.
+        """
         resource_groups = {}
 
         for path, path_item in self.spec["paths"].items():
             for method, operation in path_item.items():
+                if method.lower() not in HTTP_METHODS:
+                    continue
                 resource_path, action = self._get_resource_and_action(path, method)
 
                 # Navigate to the correct nested level
@@ -147,6 +530,17 @@ class CLIGenerator:
                         {"method": method, "path": path, "operation": operation}
                     )
 
+        return resource_groups
+
+    def generate_cli(self):
+        """Generate CLI interface from OpenAPI spec."""
+        self.parser = argparse.ArgumentParser(
+            description=self.spec.get("info", {}).get("description", "")
+        )
+
+        # First pass: collect all resources and their actions
+        resource_groups = self.build_resource_groups()
+
         def create_parser_for_resource(parser, resource_dict):
             """Recursively create parsers for resources and their children."""
             subparsers = parser.add_subparsers(dest="command", required=True)
@@ -162,39 +556,22 @@ class CLIGenerator:
 
                         # Store operation details
                         action_parser.set_defaults(
-                            method=operations[0]["method"], path=operations[0]["path"]
+                            method=operations[0]["method"],
+                            path=operations[0]["path"],
+                            action_parser=action_parser,
                         )
 
                         # Add parameters
                         operation = operations[0]["operation"]
-                        if "parameters" in operation:
-                            for param in operation["parameters"]:
-                                name = param["name"]
-                                required = param.get("required", False)
-                                help_text = param.get("description", "")
-                                param_type = param.get("schema", {}).get(
-                                    "type", "string"
-                                )
-
-                                if required:
-                                    action_parser.add_argument(
-                                        name,
-                                        help=help_text,
-                                        type=self._get_type(param_type),
-                                    )
-                                else:
-                                    action_parser.add_argument(
-                                        f"--{name}",
-                                        help=help_text,
-                                        type=self._get_type(param_type),
-                                    )
-
-                        if "requestBody" in operation:
-                            action_parser.add_argument(
-                                "--data",
-                                help="Request body (JSON string)",
-                                type=json.loads,
-                            )
+                        self._add_parameter_arguments(
+                            action_parser,
+                            operations[0]["method"],
+                            operations[0]["path"],
+                        )
+
+                        self._add_request_body_arguments(action_parser, operation)
+                        self._add_output_arguments(action_parser)
+                        self._add_fan_out_arguments(action_parser)
                 else:
                     # Create a new subparser for this resource
                     resource_parser = subparsers.add_parser(
@@ -209,15 +586,19 @@ class CLIGenerator:
             create_parser_for_resource(self.parser, resource_groups)
 
     def _get_type(self, param_type):
-        """Convert OpenAPI types to Python types."""
-        type_map = {"integer": int, "number": float, "boolean": bool, "string": str}
-        return type_map.get(param_type, str)
-
-    def execute(self, args=None):
-        """Execute the CLI with the given arguments."""
-        if args is None:
-            args = sys.argv[1:]
-
+        """Return the parser of command-line values of an OpenAPI type."""
+        return ARGUMENT_TYPES.get(param_type, str)
+
+    def _parse_command(self, args):
+        """Parse a command line of the generated CLI.
+
+        Returns:
+            dict: The selected ``method``, ``path`` and ``operation``, the
+            ``action_parser``, parameter values (``params``), ``body_options``
+            and the remaining options (``for_each``, ``concurrency``,
+            ``ordered``, ``output_format``, ``query``); None if no operation
+            was selected, after printing help.
+        """
         parsed_args = self.parser.parse_args(args)
 
         # Find the action from the parsed args
@@ -229,7 +610,7 @@ class CLIGenerator:
 
         if not action:
             self.parser.print_help()
-            return
+            return None
 
         # Extract method and path
         method = getattr(parsed_args, "method", None)
@@ -237,7 +618,7 @@ class CLIGenerator:
 
         if not method or not path:
             self.parser.print_help()
-            return
+            return None
 
         # Convert args to dict and remove special attributes
         args_dict = vars(parsed_args)
@@ -245,11 +626,363 @@ class CLIGenerator:
         for special in special_keys:
             args_dict.pop(special, None)
 
-        # Separate query parameters and request body
-        data = args_dict.pop("data", None)
+        command = {
+            "method": method,
+            "path": path,
+            "operation": self.spec["paths"][path][method],
+            "action_parser": args_dict.pop("action_parser", self.parser),
+            "for_each": args_dict.pop("fan_out_input", None),
+            "concurrency": args_dict.pop("fan_out_concurrency", DEFAULT_CONCURRENCY),
+            "ordered": args_dict.pop("fan_out_ordered", False),
+            # Separate query parameters and request body
+            "body_options": {
+                "data": args_dict.pop("body_data", None),
+                "files": args_dict.pop("body_files", None),
+                "content_type": args_dict.pop("body_content_type", None),
+                "compress": args_dict.pop("body_compress", False),
+            },
+            "output_format": args_dict.pop("output_format", "json"),
+            "query": args_dict.pop("output_query", None),
+        }
+        command["params"] = args_dict
+        return command
+
+    def execute(self, args=None):
+        """Execute the CLI with the given arguments."""
+        if args is None:
+            args = sys.argv[1:]
+
+        command = self._parse_command(args)
+        if command is None:
+            return
+        method = command["method"]
+        path = command["path"]
+        operation = command["operation"]
+        action_parser = command["action_parser"]
+        for_each = command["for_each"]
+        concurrency = command["concurrency"]
+        ordered = command["ordered"]
+        body_options = command["body_options"]
+        output_format = command["output_format"]
+        query = command["query"]
+        args_dict = command["params"]
+
+        template = self.prepare(method, path)
+        items = self._collect_required_arguments(
+            action_parser, template, args_dict, for_each is not None
+        )
+        if for_each is not None:
+            items = self._read_items(action_parser, for_each, template)
+        if items is not None:
+            if concurrency < 1:
+                action_parser.error("argument --concurrency: must be at least 1")
+            if getattr(body_options["data"], "is_stdin", False):
+                if for_each == "-":
+                    action_parser.error(
+                        "argument --for-each: cannot read items from stdin "
+                        "while the request body is read from it"
+                    )
+                action_parser.error(
+                    "argument --data: a request body read from stdin cannot be "
+                    "sent once per item; use @file instead"
+                )
+            self._execute_fan_out(
+                method,
+                path,
+                operation,
+                args_dict,
+                body_options,
+                items,
+                concurrency,
+                ordered,
+                output_format,
+                query,
+            )
+            return
+
+        try:
+            self.check_request(
+                template,
+                args_dict,
+                body_options["data"],
+                body_options["files"],
+                body_options["content_type"],
+            )
+            body, headers = self._encode_request_body(operation, **body_options)
+        except ValueError as e:
+            action_parser.error(str(e))
+
+        # Make the request and stream the response
+        try:
+            response = self._open_request(
+                method, path, params=args_dict, body=body, headers=headers
+            )
+            try:
+                self._write_response(response, output_format, query)
+            finally:
+                response.close()
+        except requests.exceptions.RequestException as e:
+            print(f"Error making request: {str(e)}")
+            sys.exit(1)
+        except json.JSONDecodeError as e:
+            print(f"Error making request: invalid JSON response: {str(e)}")
+            sys.exit(1)
+
+    def bench(self, args, duration=DEFAULT_DURATION, concurrency=1, rate=None):
+        """Generate load on the operation selected by a command line.
+
+        The command is parsed like ``execute`` does, and its request is sent
+        repeatedly through the shared transport for ``duration`` seconds;
+        each response body is read in full. Several values of the first
+        required parameter are used in turn.
+
+        Args:
+            args (list): Command line of the generated CLI, e.g.
+                ``["hr", "drivers", "list", "7"]``.
+            duration (float): How long to generate load, in seconds.
+            concurrency (int): Maximum number of requests in flight.
+            rate (float): Target requests per second; None sends requests
+                back-to-back from ``concurrency`` workers.
+
+        Returns:
+            BenchResult: Throughput, errors and the latency histogram, or
+            None if no operation was selected.
+        """
+        command = self._parse_command(args)
+        if command is None:
+            return None
+        method = command["method"]
+        path = command["path"]
+        operation = command["operation"]
+        params = command["params"]
+        body_options = command["body_options"]
+
+        if getattr(body_options["data"], "is_stdin", False):
+            command["action_parser"].error(
+                "argument --data: a request body read from stdin cannot be replayed"
+            )
+        template = self.prepare(method, path)
+        items = self._collect_required_arguments(
+            command["action_parser"], template, params, False
+        )
+        items = items or [{}]
+        try:
+            for item in items:
+                self.check_request(
+                    template,
+                    dict(params, **item),
+                    body_options["data"],
+                    body_options["files"],
+                    body_options["content_type"],
+                )
+            # Bodies that cannot be encoded fail once, not on every call
+            body, _ = self._encode_request_body(operation, **body_options)
+            if hasattr(body, "close"):
+                body.close()
+        except ValueError as e:
+            command["action_parser"].error(str(e))
+        items = itertools.cycle(items)
+        lock = threading.Lock()
+        self.reserve_connections(concurrency)
+
+        def call():
+            with lock:
+                item = next(items)
+            body, headers = self._encode_request_body(operation, **body_options)
+            response = self._open_request(
+                method, path, params=dict(params, **item), body=body, headers=headers
+            )
+            try:
+                for _ in response.iter_content(CHUNK_SIZE):
+                    pass
+            finally:
+                response.close()
 
-        # Make the request
-        result = self._make_request(method, path, params=args_dict, data=data)
+        return run_load(call, duration, concurrency, rate)
 
-        # Print response
-        print(json.dumps(result, indent=2))
+    def _encode_request_body(
+        self, operation, data=None, files=None, content_type=None, compress=False
+    ):
+        """Encode the request body arguments; returns ``(body, headers)``."""
+        if data is None and not files:
+            return None, None
+        if content_type is None:
+            content_type = select_content_type(
+                request_content_types(operation), data, files
+            )
+        return encode_body(data, content_type, files, compress)
+
+    def _collect_required_arguments(self, parser, template, args_dict, fan_out):
+        """Unwrap the values of required positional parameters.
+
+        Returns:
+            list: Items to fan out over when the first required parameter was
+            given several values, otherwise None.
+        """
+        required = [param["name"] for param in template.required_parameters]
+        items = None
+        missing = []
+        for index, name in enumerate(required):
+            values = args_dict.pop(name, None)
+            if values is None:
+                values = []
+            elif not isinstance(values, list):
+                values = [values]
+            if len(values) == 1:
+                args_dict[name] = values[0]
+            elif len(values) > 1 and index == 0 and not fan_out:
+                items = [{name: value} for value in values]
+            elif len(values) > 1:
+                parser.error(f"argument {name}: expected one value")
+            elif not fan_out:
+                missing.append(name)
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+        return items
+
+    def _read_items(self, parser, source, template):
+        """Open a fan-out source and read its items lazily.
+
+        Each non-empty line is either a JSON object of parameters (with an
+        optional ``data`` request body) or a bare value for the operation's
+        first required parameter. Lines that cannot be read as items are
+        yielded as ``_UnreadableItem`` objects, so they fail on their own.
+
+        The source is opened before any request is sent; if that fails, the
+        command exits with a usage error.
+        """
+        try:
+            stream = sys.stdin if source == "-" else open(source)
+        except OSError as e:
+            parser.error(f"argument --for-each: cannot open '{source}': {e.strerror}")
+        return self._parse_items(stream, template)
+
+    def _parse_items(self, stream, template):
+        """Parse the lines of a fan-out source into items, then close it."""
+        required = template.required_parameters
+        if required:
+            name = required[0]["name"]
+            convert = self.schemas.argument_type(required[0].get("schema", {}))
+        try:
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith("{"):
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield _UnreadableItem(line, f"Invalid JSON: {e}")
+                elif not required:
+                    yield _UnreadableItem(
+                        line,
+                        "Operation has no required parameter; "
+                        "--for-each lines must be JSON objects",
+                    )
+                else:
+                    try:
+                        yield {name: convert(line)}
+                    except ValueError:
+                        yield _UnreadableItem(
+                            line, f"Invalid value for {name}: {line!r}"
+                        )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+    def _execute_fan_out(
+        self,
+        method,
+        path,
+        operation,
+        base_args,
+        body_options,
+        items,
+        concurrency,
+        ordered,
+        output_format,
+        query,
+    ):
+        """Run one operation per item on a bounded worker pool.
+
+        Results are written as one streamed output. Failed items are written
+        as ``{"item": ..., "error": ...}`` records instead of aborting the run;
+        the process exits with status 1 afterwards if any item failed.
+        """
+        self.reserve_connections(concurrency)
+        template = self.prepare(method, path)
+
+        def call(item):
+            if isinstance(item, _UnreadableItem):
+                raise ValueError(item.error)
+            params = dict(base_args)
+            params.update(item)
+            options = dict(body_options, data=params.pop("data", body_options["data"]))
+            # Invalid items fail here, without a request
+            self.check_request(
+                template,
+                params,
+                options["data"],
+                options["files"],
+                options["content_type"],
+            )
+            body, headers = self._encode_request_body(operation, **options)
+            return self._send_request(
+                method, path, params=params, body=body, headers=headers
+            )
+
+        failures = []
+
+        def records():
+            for item, result in bounded_map(call, items, concurrency, ordered):
+                if isinstance(result, Exception):
+                    if isinstance(item, _UnreadableItem):
+                        item = item.line
+                    failures.append(item)
+                    yield {"item": item, "error": str(result)}
+                elif query is None:
+                    yield result
+                elif query.matches(result):
+                    yield query.project(result)
+
+        fields = None
+        if query is not None:
+            fields = query.fields or None
+        write_output(records(), output_format, fields=fields)
+        if failures:
+            print(f"{len(failures)} request(s) failed", file=sys.stderr)
+            sys.exit(1)
+
+
+def _add_option(parser, options, **kwargs):
+    """Add an option under the spellings not taken by earlier arguments.
+
+    Operation parameters are added first, so they keep their names and
+    the generator's own options fall back to their longer spellings.
+    """
+    taken = {option for action in parser._actions for option in action.option_strings}
+    free = [option for option in options if option not in taken]
+    if free:
+        parser.add_argument(*free, **kwargs)
+
+
+class _UnreadableItem:
+    """A fan-out input line that could not be read as an item."""
+
+    def __init__(self, line, error):
+        """Initialize the item from its line and what is wrong with it."""
+        self.line = line
+        self.error = error
+
+
+def _rewind(body):
+    """Prepare a request body to be sent again; return False if impossible."""
+    if body is None or isinstance(body, bytes):
+        return True
+    if hasattr(body, "seek"):
+        try:
+            body.seek(0)
+            return True
+        except OSError:
+            return False
+    return False
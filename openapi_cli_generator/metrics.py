@@ -0,0 +1,414 @@
+"""Client-side metrics for API calls.
+
+This module provides a registry that collects per-operation request counts,
+latency histograms, bytes sent and received, status codes and failover
+retries, and the sinks that export them: an OpenMetrics (Prometheus) text
+file and a JSON summary written when the registry is closed, and a StatsD
+sink that sends buffered UDP datagrams while calls are made.
+
+Recording a call takes a few dictionary and integer updates under a lock, so
+collecting metrics adds no measurable latency to requests.
+"""
+
+import json
+import os
+import re
+import socket
+import sys
+import threading
+
+from .bench import PERCENTILES, LatencyHistogram, _ms
+from .fsutil import write_atomic
+
+# Upper bounds in seconds of the OpenMetrics latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATSD_PREFIX = "openapi_cli"
+# Keeps StatsD datagrams within a typical Ethernet MTU
+MAX_DATAGRAM = 1432
+
+_STATSD_UNSAFE = re.compile(r"[^A-Za-z0-9_\-]+")
+
+
+class OperationStats:
+    """Metrics collected for one operation.
+
+    Attributes:
+        name (str): The operation's ``operationId``, or ``METHOD /path``.
+        requests (int): Calls made, including failed ones.
+        statuses (dict): Number of calls per HTTP status code, or per
+            exception class for calls that got no response.
+        retries (int): Requests resent to another server after a
+            connection failure.
+        bytes_out (int): Request body bytes sent.
+        bytes_in (int): Response body bytes read.
+        latency (LatencyHistogram): Time to the response headers in
+            microseconds.
+
+    """
+
+    def __init__(self, name):
+        """Initialize empty statistics."""
+        self.name = name
+        self.requests = 0
+        self.statuses = {}
+        self.retries = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.latency = LatencyHistogram()
+
+    def as_dict(self):
+        """Return the statistics as a JSON-serializable dict; latencies in ms."""
+        latency = self.latency
+        return {
+            "requests": self.requests,
+            "statuses": {str(status): n for status, n in self.statuses.items()},
+            "retries": self.retries,
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "latency_ms": {
+                "mean": _ms(latency.mean),
+                "max": _ms(latency.max),
+                "percentiles": {
+                    f"p{p:g}": _ms(latency.percentile(p)) for p in PERCENTILES
+                },
+            },
+        }
+
+
+class Metrics:
+    """Thread-safe registry of per-operation metrics.
+
+    Attributes:
+        operations (dict): ``OperationStats`` by operation name.
+        sinks (list): Sinks notified of every call and exported on close.
+
+    """
+
+    def __init__(self, sinks=()):
+        """Initialize the registry."""
+        self.operations = {}
+        self.sinks = list(sinks)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _stats(self, operation):
+        """Return the statistics of an operation; call with the lock held."""
+        stats = self.operations.get(operation)
+        if stats is None:
+            stats = self.operations[operation] = OperationStats(operation)
+        return stats
+
+    def record(self, operation, status, seconds, bytes_out=0, retries=0):
+        """Record a completed call.
+
+        Args:
+            operation (str): The operation name.
+            status: The HTTP status code, or the exception class name if the
+                request failed without a response.
+            seconds (float): Time until the response headers arrived.
+            bytes_out (int): Request body bytes sent.
+            retries (int): Times the request was resent to another server.
+        """
+        with self._lock:
+            stats = self._stats(operation)
+            stats.requests += 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.retries += retries
+            stats.bytes_out += bytes_out
+            stats.latency.record(seconds * 1e6)
+            for sink in self.sinks:
+                sink.observe(operation, status, seconds, bytes_out, retries)
+
+    def add_bytes_in(self, operation, size):
+        """Count response body bytes read for an operation."""
+        with self._lock:
+            self._stats(operation).bytes_in += size
+
+    def meter(self, operation, response):
+        """Wrap a response so the bytes read from its body are counted."""
+        return MeteredResponse(response, self, operation)
+
+    def as_dict(self):
+        """Return all statistics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                name: stats.as_dict() for name, stats in sorted(self.operations.items())
+            }
+
+    def close(self):
+        """Export the collected metrics to every sink; later calls do nothing."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for sink in self.sinks:
+            sink.close(self)
+
+
+class MeteredResponse:
+    """Proxy of a response that counts the body bytes read through it."""
+
+    def __init__(self, response, metrics, operation):
+        """Wrap a response of ``operation``."""
+        self._response = response
+        self._metrics = metrics
+        self._operation = operation
+
+    def __getattr__(self, name):
+        """Delegate everything else to the wrapped response."""
+        return getattr(self._response, name)
+
+    def iter_content(self, *args, **kwargs):
+        """Yield the body in chunks, counting their size."""
+        size = 0
+        try:
+            for chunk in self._response.iter_content(*args, **kwargs):
+                size += len(chunk)
+                yield chunk
+        finally:
+            self._metrics.add_bytes_in(self._operation, size)
+
+    @property
+    def content(self):
+        """Return the whole body."""
+        content = self._response.content
+        self._metrics.add_bytes_in(self._operation, len(content))
+        return content
+
+    def json(self, **kwargs):
+        """Return the body decoded as JSON."""
+        return json.loads(self.content, **kwargs)
+
+
+class Sink:
+    """Base class for metrics sinks."""
+
+    def observe(self, operation, status, seconds, bytes_out, retries):
+        """Handle a call as it is recorded; called with the registry locked."""
+
+    def close(self, metrics):
+        """Export the collected metrics."""
+
+
+class OpenMetricsSink(Sink):
+    """Write the metrics as an OpenMetrics text file on close.
+
+    The file is replaced atomically, so a collector reading it never sees a
+    partially written file.
+
+    Attributes:
+        path (str): The file to write.
+        buckets (tuple): Upper bounds of the latency buckets in seconds.
+
+    """
+
+    def __init__(self, path, buckets=DEFAULT_BUCKETS):
+        """Initialize the sink."""
+        self.path = path
+        self.buckets = buckets
+
+    def close(self, metrics):
+        """Write the metrics file."""
+        write_atomic(
+            os.path.expanduser(self.path), format_openmetrics(metrics, self.buckets)
+        )
+
+
+class JSONSink(Sink):
+    """Write a JSON summary of the metrics on close.
+
+    Attributes:
+        path (str): The file to write, or ``-`` for stderr.
+
+    """
+
+    def __init__(self, path):
+        """Initialize the sink."""
+        self.path = path
+
+    def close(self, metrics):
+        """Write the summary."""
+        summary = json.dumps({"operations": metrics.as_dict()}, indent=2) + "\n"
+        if self.path == "-":
+            sys.stderr.write(summary)
+        else:
+            write_atomic(os.path.expanduser(self.path), summary)
+
+
+class StatsDSink(Sink):
+    """Send metrics to a StatsD server over UDP.
+
+    Every call is sent as a request counter, a status counter, a timer and
+    byte and retry counters, buffered into datagrams of at most
+    ``MAX_DATAGRAM`` bytes. Response bytes are read after the call is
+    recorded and are sent as totals on close. Send errors are ignored, as
+    usual for StatsD.
+
+    Attributes:
+        address (tuple): ``(host, port)`` of the StatsD server.
+        prefix (str): Prefix of all metric names.
+
+    """
+
+    def __init__(self, address, prefix=STATSD_PREFIX):
+        """Initialize the sink and open its socket."""
+        self.address = address
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._buffer = []
+        self._size = 0
+
+    def _name(self, operation, metric):
+        """Return the StatsD name of an operation's metric."""
+        return f"{self.prefix}.{_STATSD_UNSAFE.sub('_', operation)}.{metric}"
+
+    def _send(self, line):
+        """Buffer a line, sending the buffer first if the line would not fit."""
+        if self._size + len(line) + 1 > MAX_DATAGRAM:
+            self.flush()
+        self._buffer.append(line)
+        self._size += len(line) + 1
+
+    def flush(self):
+        """Send the buffered lines."""
+        if not self._buffer:
+            return
+        payload = "\n".join(self._buffer).encode()
+        self._buffer = []
+        self._size = 0
+        try:
+            self._socket.sendto(payload, self.address)
+        except OSError:
+            pass
+
+    def observe(self, operation, status, seconds, bytes_out, retries):
+        """Buffer the metrics of a call."""
+        self._send(f"{self._name(operation, 'requests')}:1|c")
+        self._send(f"{self._name(operation, 'status.' + str(status))}:1|c")
+        self._send(f"{self._name(operation, 'latency')}:{seconds * 1000:.3f}|ms")
+        if bytes_out:
+            self._send(f"{self._name(operation, 'bytes_out')}:{bytes_out}|c")
+        if retries:
+            self._send(f"{self._name(operation, 'retries')}:{retries}|c")
+
+    def close(self, metrics):
+        """Send the response byte totals and the remaining buffer."""
+        for name, stats in sorted(metrics.operations.items()):
+            if stats.bytes_in:
+                self._send(f"{self._name(name, 'bytes_in')}:{stats.bytes_in}|c")
+        self.flush()
+        self._socket.close()
+
+
+def format_openmetrics(metrics, buckets=DEFAULT_BUCKETS):
+    """Format a registry in the OpenMetrics text exposition format."""
+    operations = sorted(metrics.operations.items())
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"# HELP {name} {help_text}")
+
+    family("openapi_cli_requests", "counter", "API calls by operation and status.")
+    for name, stats in operations:
+        for status, count in sorted(stats.statuses.items(), key=str):
+            labels = _labels(operation=name, status=status)
+            lines.append(f"openapi_cli_requests_total{labels} {count}")
+
+    family(
+        "openapi_cli_request_duration_seconds",
+        "histogram",
+        "Time until the response headers arrived.",
+    )
+    for name, stats in operations:
+        latency = stats.latency
+        for bound in buckets:
+            count = latency.count_at_or_below(bound * 1e6)
+            labels = _labels(operation=name, le=f"{bound:g}")
+            lines.append(f"openapi_cli_request_duration_seconds_bucket{labels} {count}")
+        labels = _labels(operation=name, le="+Inf")
+        lines.append(
+            f"openapi_cli_request_duration_seconds_bucket{labels} {latency.count}"
+        )
+        labels = _labels(operation=name)
+        total = (latency.mean or 0) * latency.count / 1e6
+        lines.append(f"openapi_cli_request_duration_seconds_sum{labels} {total:g}")
+        lines.append(
+            f"openapi_cli_request_duration_seconds_count{labels} {latency.count}"
+        )
+
+    for metric, attribute, help_text in (
+        ("openapi_cli_request_bytes", "bytes_out", "Request body bytes sent."),
+        ("openapi_cli_response_bytes", "bytes_in", "Response body bytes read."),
+        ("openapi_cli_retries", "retries", "Requests resent to another server."),
+    ):
+        family(metric, "counter", help_text)
+        for name, stats in operations:
+            value = getattr(stats, attribute)
+            lines.append(f"{metric}_total{_labels(operation=name)} {value}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def create_metrics(options):
+    """Create a registry for the metrics sinks set in alias options.
+
+    Args:
+        options (dict): Alias options; ``metrics_file`` (OpenMetrics text
+            file), ``metrics_json`` (JSON summary file or ``-`` for stderr)
+            and ``metrics_statsd`` (``(host, port)``) enable the sinks.
+
+    Returns:
+        Metrics: The registry, or None if no sink is configured.
+    """
+    sinks = []
+    if options.get("metrics_file"):
+        sinks.append(OpenMetricsSink(options["metrics_file"]))
+    if options.get("metrics_json"):
+        sinks.append(JSONSink(options["metrics_json"]))
+    if options.get("metrics_statsd"):
+        sinks.append(StatsDSink(tuple(options["metrics_statsd"])))
+    return Metrics(sinks) if sinks else None
+
+
+def body_size(body):
+    """Return the size of an encoded request body, or None if unknown."""
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if hasattr(body, "fileno"):
+        try:
+            return os.fstat(body.fileno()).st_size - body.tell()
+        except (OSError, ValueError):
+            return None
+    return None
+
+
+def json_size(response, data):
+    """Return the size of a request body sent as JSON."""
+    sent = getattr(getattr(response, "request", None), "body", None)
+    if isinstance(sent, bytes):
+        return len(sent)
+    return len(json.dumps(data).encode())
+
+
+def count_chunks(chunks, counter):
+    """Yield body chunks, adding their size to ``counter[0]``."""
+    for chunk in chunks:
+        counter[0] += len(chunk)
+        yield chunk
+
+
+def _labels(**labels):
+    """Format OpenMetrics labels."""
+    pairs = ",".join(
+        f'{key}="{_escape_label(str(value))}"' for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _escape_label(value):
+    """Escape an OpenMetrics label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
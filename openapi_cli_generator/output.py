@@ -0,0 +1,303 @@
+"""Response output formatting.
+
+This module provides incremental decoding of JSON response bodies, a small
+query language for projecting and filtering records, and writers for the
+supported output formats (json, ndjson, csv, table and yaml).
+
+Top-level JSON arrays are decoded one element at a time while the body is
+being downloaded, so only the current record (reduced to the selected fields)
+is held in memory. Other documents are decoded as a whole.
+"""
+
+import codecs
+import csv
+import json
+import sys
+import textwrap
+
+OUTPUT_FORMATS = ("json", "ndjson", "csv", "table", "yaml")
+
+_WHITESPACE = " \t\n\r"
+_COMPACT_THRESHOLD = 64 * 1024
+
+
+class JSONStream:
+    """Incrementally decode a JSON document from byte chunks.
+
+    Attributes:
+        is_array (bool): Whether the document is a top-level array, whose
+            elements are yielded one by one by ``records()``.
+
+    """
+
+    def __init__(self, chunks):
+        """Initialize the stream and peek at the start of the document."""
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+        self._skip_whitespace()
+        self.is_array = self._peek() == "["
+        self.is_empty = self._peek() == ""
+
+    def _read(self):
+        """Append the next chunk to the buffer; return False at end of input."""
+        if self._exhausted:
+            return False
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                start = self._pos
+                if start > _COMPACT_THRESHOLD:
+                    self._buffer, self._pos = self._buffer[start:], 0
+                self._buffer += text
+                return True
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._exhausted = True
+        return False
+
+    def _peek(self):
+        """Return the next unconsumed character, or an empty string at the end."""
+        while self._pos >= len(self._buffer):
+            if not self._read():
+                return ""
+        return self._buffer[self._pos]
+
+    def _skip_whitespace(self):
+        """Advance past whitespace, reading more input as needed."""
+        while self._peek() and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+
+    def _decode_value(self):
+        """Decode the next complete JSON value from the buffer."""
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._read():
+                    continue
+                raise
+            # A scalar at the very end of the buffer may still be truncated.
+            if end == len(self._buffer) and self._read():
+                continue
+            self._pos = end
+            return value
+
+    def records(self):
+        """Yield the array elements, or the whole document if it is not an array."""
+        if self.is_empty:
+            return
+        if not self.is_array:
+            while self._read():
+                pass
+            start = self._pos
+            yield json.loads(self._buffer[start:])
+            return
+
+        self._pos += 1
+        self._skip_whitespace()
+        if self._peek() == "]":
+            return
+        while True:
+            self._skip_whitespace()
+            yield self._decode_value()
+            self._skip_whitespace()
+            delimiter = self._peek()
+            self._pos += 1
+            if delimiter == "]":
+                return
+            if delimiter != ",":
+                raise json.JSONDecodeError(
+                    "Expecting ',' delimiter", self._buffer, self._pos - 1
+                )
+
+
+class Query:
+    """Projection and filter over records.
+
+    A query is a comma-separated list of terms. ``a.b`` selects the dotted
+    field path ``a.b``; ``a.b==value`` and ``a.b!=value`` keep only records
+    whose field matches (or does not match) the value. Values are compared as
+    JSON literals when they parse as one, and as strings otherwise.
+
+    Example: ``id,name,category.name,status==available``.
+    """
+
+    def __init__(self, expression):
+        """Parse a query expression."""
+        self.fields = []
+        self.conditions = []
+        for term in (t.strip() for t in expression.split(",")):
+            if not term:
+                continue
+            for operator in ("==", "!="):
+                if operator in term:
+                    path, value = term.split(operator, 1)
+                    self.conditions.append(
+                        (_split_path(path.strip()), operator, _literal(value.strip()))
+                    )
+                    break
+            else:
+                self.fields.append(term)
+        self._paths = [(field, _split_path(field)) for field in self.fields]
+
+    def matches(self, record):
+        """Check a record against all conditions."""
+        for path, operator, expected in self.conditions:
+            equal = _lookup(record, path) == expected
+            if equal != (operator == "=="):
+                return False
+        return True
+
+    def project(self, record):
+        """Reduce a record to the selected fields, keyed by their paths."""
+        if not self._paths:
+            return record
+        return {field: _lookup(record, path) for field, path in self._paths}
+
+    def apply(self, records):
+        """Filter and project an iterable of records lazily."""
+        for record in records:
+            if self.matches(record):
+                yield self.project(record)
+
+
+def write_output(
+    records, output_format="json", stream=None, is_array=True, fields=None
+):
+    """Write records in the requested format.
+
+    Args:
+        records (iterable): Records to write; consumed lazily where possible.
+        output_format (str): One of ``OUTPUT_FORMATS``.
+        stream: Text stream to write to (defaults to stdout).
+        is_array (bool): Whether the records came from a JSON array; a single
+            document is written without the array wrapper in json/yaml output.
+        fields (list): Column order for csv/table output.
+
+    """
+    stream = stream or sys.stdout
+    writer = _WRITERS.get(output_format)
+    if writer is None:
+        raise ValueError(f"Unknown output format: {output_format}")
+    writer(records, stream, is_array, fields)
+
+
+def _write_json(records, stream, is_array, fields):
+    """Write indented JSON, streaming the elements of arrays."""
+    if not is_array:
+        for record in records:
+            stream.write(json.dumps(record, indent=2) + "\n")
+        return
+    first = True
+    for record in records:
+        stream.write("[\n" if first else ",\n")
+        stream.write(textwrap.indent(json.dumps(record, indent=2), "  "))
+        first = False
+    stream.write("[]\n" if first else "\n]\n")
+
+
+def _write_ndjson(records, stream, is_array, fields):
+    """Write one compact JSON document per line."""
+    for record in records:
+        stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def _write_csv(records, stream, is_array, fields):
+    """Write CSV with a header taken from the fields or the first record."""
+    writer = None
+    for record in records:
+        row = _row(record)
+        if writer is None:
+            writer = csv.DictWriter(
+                stream, fieldnames=fields or list(row), extrasaction="ignore"
+            )
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def _write_table(records, stream, is_array, fields):
+    """Write an aligned text table; rows are buffered to size the columns."""
+    rows = [_row(record) for record in records]
+    if not rows:
+        return
+    columns = fields or list(dict.fromkeys(key for row in rows for key in row))
+    cells = [[_cell(row.get(column)) for column in columns] for row in rows]
+    widths = [
+        max([len(column)] + [len(row[i]) for row in cells])
+        for i, column in enumerate(columns)
+    ]
+    lines = [columns, ["-" * width for width in widths]] + cells
+    for line in lines:
+        text = "  ".join(cell.ljust(width) for cell, width in zip(line, widths))
+        stream.write(text.rstrip() + "\n")
+
+
+def _write_yaml(records, stream, is_array, fields):
+    """Write YAML, emitting array elements as list items one at a time."""
+    import yaml
+
+    empty = True
+    for record in records:
+        document = [record] if is_array else record
+        stream.write(
+            yaml.safe_dump(document, default_flow_style=False, sort_keys=False)
+        )
+        empty = False
+    if empty and is_array:
+        stream.write("[]\n")
+
+
+_WRITERS = {
+    "json": _write_json,
+    "ndjson": _write_ndjson,
+    "csv": _write_csv,
+    "table": _write_table,
+    "yaml": _write_yaml,
+}
+
+
+def _row(record):
+    """Turn a record into a flat mapping of column values."""
+    if isinstance(record, dict):
+        return {key: _cell(value) for key, value in record.items()}
+    return {"value": _cell(record)}
+
+
+def _cell(value):
+    """Render a single value for csv/table output."""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _split_path(path):
+    """Split a dotted field path into its keys."""
+    return [key for key in path.split(".") if key]
+
+
+def _lookup(record, path):
+    """Return the value at a dotted path, or None if it is missing."""
+    value = record
+    for key in path:
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return None
+    return value
+
+
+def _literal(value):
+    """Parse a condition value as a JSON literal, falling back to a string."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
@@ -8,11 +8,18 @@ Attributes:
 """
 
 import json
+import os
+import subprocess
+import sys
 from urllib.parse import urlparse
 
 import requests
 import yaml
-from openapi_spec_validator import validate
+
+from .encoding import CHUNK_SIZE
+from .partial import PartialSpec, command_tokens
+from .spec_cache import SpecCache
+from .validation import format_errors, validate_spec
 
 
 class OpenAPIParser:
@@ -20,10 +27,15 @@ class OpenAPIParser:
 
     Attributes:
         spec_url (str): The URL of the OpenAPI specification.
+        cache (SpecCache): Cache of parsed specs, or None.
+        workers (int): Processes validating the spec in parallel; None uses
+            one per CPU.
+        cache_fill (subprocess.Popen): Background process parsing, validating
+            and caching the full spec after a partial load, or None.
 
     """
 
-    def __init__(self, spec_url):
+    def __init__(self, spec_url, cache=None, workers=1):
         """Initialize parser with spec URL."""
         if not spec_url:
             raise ValueError("Spec URL cannot be empty")
@@ -34,33 +46,204 @@ class OpenAPIParser:
             raise ValueError("Invalid URL format")
 
         self.spec_url = spec_url
+        self.cache = cache
+        self.workers = workers
+        self.cache_fill = None
+
+    def _fetch(self, stream=False):
+        """Request the spec document."""
+        response = requests.get(self.spec_url + "/openapi.json", stream=stream)
+        response.raise_for_status()
+        return response
 
     def parse(self):
         """Parse and validate OpenAPI specification."""
+        if self.cache is not None:
+            spec = self.cache.get(self.spec_url)
+            if spec is not None:
+                return spec
         try:
-            response = requests.get(self.spec_url + "/openapi.json")
-            response.raise_for_status()
-
-            content_type = response.headers.get("content-type", "")
+            response = self._fetch()
+        except requests.exceptions.RequestException as e:
+            raise ConnectionError(f"Failed to fetch OpenAPI spec: {str(e)}")
+        return self._load(response)
 
-            # First try to parse the content
-            try:
-                if "json" in content_type:
-                    spec = response.json()  # This will raise JSONDecodeError if invalid
-                else:
-                    spec = yaml.safe_load(response.text)
-            except json.JSONDecodeError:
-                raise  # Re-raise JSON decode errors directly
-            except yaml.YAMLError as e:
-                raise ValueError(f"Invalid YAML format: {str(e)}")
-
-            # Then validate the specification
-            try:
-                validate(spec)
-            except Exception as e:
-                raise ValueError(f"Invalid OpenAPI specification: {str(e)}")
+    def _load(self, response):
+        """Decode, validate and cache a fully downloaded spec."""
+        content_type = response.headers.get("content-type", "")
 
+        # First try to parse the content
+        try:
+            if "json" in content_type:
+                spec = response.json()  # This will raise JSONDecodeError if invalid
+            else:
+                spec = yaml.safe_load(response.text)
+        except json.JSONDecodeError:
+            raise  # Re-raise JSON decode errors directly
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML format: {str(e)}")
+
+        return self._validate(spec)
+
+    def _validate(self, spec):
+        """Validate a decoded spec and cache it.
+
+        Raises:
+            ValueError: Listing every error found, with its JSON pointer.
+        """
+        errors = validate_spec(spec, self.workers)
+        if errors:
+            raise ValueError(f"Invalid OpenAPI specification: {format_errors(errors)}")
+
+        if self.cache is not None:
+            self.cache.put(self.spec_url, spec)
+        return spec
+
+    def parse_for_command(self, args):
+        """Return the parts of the spec needed to run one command.
+
+        On a cache miss, a JSON spec is scanned while it downloads and only
+        the ``paths`` entries matching the command's leading positional
+        arguments (plus the components they reference) are decoded. Full
+        decoding, validation and caching of the document are left to a
+        detached background process (``cache_fill``), so the command does
+        not wait for them; the body is streamed to a file for it. The
+        decoded part is validated before it is returned, so errors in the
+        operations the command uses are reported right away. Without a
+        command, with a YAML spec or without a cache, this is the same as
+        ``parse``.
+
+        Args:
+            args (list): The command line arguments of the generated CLI.
+        """
+        tokens = command_tokens(args or [])
+        if self.cache is None or not tokens:
+            return self.parse()
+        spec = self.cache.get(self.spec_url)
+        if spec is not None:
             return spec
 
+        try:
+            response = self._fetch(stream=True)
+        except requests.exceptions.RequestException as e:
+            raise ConnectionError(f"Failed to fetch OpenAPI spec: {str(e)}")
+        if "json" not in response.headers.get("content-type", ""):
+            return self._load(response)
+
+        # The body is written to disk as it arrives, for the cache fill
+        body_file = self.cache.pending_file(self.spec_url)
+        try:
+            body_file.parent.mkdir(parents=True, exist_ok=True)
+            sink = open(body_file, "wb")
+        except OSError:
+            sink = None
+        try:
+            try:
+                chunks = _copy_chunks(response, sink, body_file)
+                partial = PartialSpec(chunks, tokens)
+                for _ in chunks:
+                    pass
+            finally:
+                response.close()
+                if sink is not None:
+                    sink.close()
         except requests.exceptions.RequestException as e:
+            _remove(body_file)
             raise ConnectionError(f"Failed to fetch OpenAPI spec: {str(e)}")
+        except Exception:
+            _remove(body_file)
+            raise
+        stored = sink is not None and body_file.exists()
+
+        if not partial.spec["paths"] and partial.path_count:
+            # Unknown command: load everything so the usual help is shown
+            if not stored:
+                return self.parse()
+            try:
+                with open(body_file, "rb") as f:
+                    return self._validate(json.load(f))
+            finally:
+                _remove(body_file)
+
+        if stored:
+            try:
+                self.cache_fill = self._start_cache_fill(body_file)
+            except OSError:
+                _remove(body_file)
+        return self._validate_partial(partial.spec)
+
+    def _validate_partial(self, spec):
+        """Validate the parts of a spec a command needs, without caching them.
+
+        Raises:
+            ValueError: Listing every error found, with its JSON pointer.
+        """
+        errors = validate_spec(spec)
+        if errors:
+            raise ValueError(f"Invalid OpenAPI specification: {format_errors(errors)}")
+        return spec
+
+    def _start_cache_fill(self, body_file):
+        """Run ``fill_cache`` for a downloaded body in a detached process."""
+        return subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                __name__,
+                self.spec_url,
+                str(body_file),
+                str(self.cache.cache_dir),
+                str(self.workers or 0),
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def fill_cache(self, body_file):
+        """Decode, validate and cache a spec from a downloaded body file.
+
+        A spec that fails to decode or validate is cached as its error, so
+        the next command reports it. The body file is removed afterwards.
+        """
+        try:
+            with open(body_file, "rb") as f:
+                self._validate(json.load(f))
+        except ValueError as e:
+            self.cache.put_error(self.spec_url, e)
+        finally:
+            os.remove(body_file)
+
+
+def _copy_chunks(response, sink, path):
+    """Yield the chunks of a response body, also writing them to ``sink``.
+
+    If writing fails, the partial file at ``path`` is removed and the rest
+    of the body is only yielded.
+    """
+    for chunk in response.iter_content(CHUNK_SIZE):
+        if sink is not None:
+            try:
+                sink.write(chunk)
+            except OSError:
+                sink.close()
+                _remove(path)
+                sink = None
+        yield chunk
+
+
+def _remove(path):
+    """Remove a file if it exists."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    # Background cache fill: <spec_url> <body_file> <cache_dir> <workers>
+    spec_url, body_file, cache_dir, workers = sys.argv[1:5]
+    OpenAPIParser(
+        spec_url, cache=SpecCache(cache_dir), workers=int(workers) or None
+    ).fill_cache(body_file)
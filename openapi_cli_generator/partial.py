@@ -0,0 +1,278 @@
+"""Partial loading of JSON OpenAPI specs.
+
+This module provides a reader that scans a JSON spec while it is being
+downloaded and decodes only what one command needs: the ``paths`` entries
+whose resource segments match the command line, the components they
+reference (transitively) and the small top-level sections such as ``info``
+and ``servers``. Everything else is skipped at the byte level, so the cost of
+a cold start depends on the size of the selected operations rather than on
+the size of the whole document.
+"""
+
+import codecs
+import json
+import re
+
+# Component sections that are always kept whole, regardless of references
+ALWAYS_INCLUDED_COMPONENTS = ("securitySchemes",)
+
+# Top-level sections that are skipped unless the full spec is parsed
+SKIPPED_SECTIONS = ("webhooks",)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_CONTAINER_RUN = re.compile(r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+_SCALAR = re.compile(r"[^,}\]\s]*")
+_REF_PREFIX = "#/components/"
+
+
+def command_tokens(args):
+    """Return the leading positional arguments of a command line."""
+    tokens = []
+    for arg in args:
+        if arg.startswith("-"):
+            break
+        tokens.append(arg)
+    return tokens
+
+
+def path_matches(path, tokens):
+    """Return True if a path may provide the command named by ``tokens``.
+
+    The path's literal segments (as used for the command tree) and the
+    command tokens must agree up to the shorter of the two, so both the
+    operations of a resource and the resources below a group match.
+    """
+    parts = [p for p in path.strip("/").split("/") if not p.startswith("{")]
+    length = min(len(parts), len(tokens))
+    return parts[:length] == tokens[:length]
+
+
+class _Scanner:
+    """Pull-based scanner over JSON text arriving in chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, keep):
+        """Append the next chunk, keeping the buffer from ``keep`` onwards.
+
+        Returns:
+            int: How far the buffer positions moved, or -1 at end of input.
+        """
+        if self._eof:
+            return -1
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            text = self._decoder.decode(chunk)
+        self._buffer = self._buffer[keep:] + text
+        self._pos -= keep
+        return keep
+
+    def _error(self, message):
+        raise json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at the end)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._fill(self._pos) < 0:
+                return ""
+
+    def expect(self, char):
+        """Consume ``char`` after optional whitespace."""
+        if self.peek() != char:
+            self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def members(self):
+        """Iterate over the keys of the object at the current position.
+
+        The caller must consume each member's value (with ``value`` or
+        ``skip``) before advancing the iterator.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                self._error("Expecting property name enclosed in double quotes")
+            key = json.loads(self.value())
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                self._error("Expecting ',' delimiter")
+
+    def value(self):
+        """Return the raw JSON text of the next value and move past it."""
+        start = self._scan()
+        end = self._pos
+        return self._buffer[start:end]
+
+    def skip(self):
+        """Move past the next value without returning it."""
+        self._scan()
+
+    def _scan(self):
+        """Find the end of the next value; return where it starts."""
+        char = self.peek()
+        start = self._pos
+        if char == '"':
+            start = self._scan_string(start, start + 1)
+        elif char in "{[":
+            depth = 0
+            pos = start
+            while True:
+                # Jump over everything up to the next bracket, strings included
+                pos = _CONTAINER_RUN.match(self._buffer, pos).end()
+                if pos == len(self._buffer) or self._buffer[pos] == '"':
+                    # Out of data, or a string that continues in the next chunk
+                    moved = self._fill(start)
+                    if moved < 0:
+                        self._error("Unterminated value")
+                    start -= moved
+                    pos -= moved
+                    continue
+                token = self._buffer[pos]
+                pos += 1
+                if token in "{[":
+                    depth += 1
+                elif depth == 1:
+                    self._pos = pos
+                    return start
+                else:
+                    depth -= 1
+        elif char:
+            while True:
+                end = _SCALAR.match(self._buffer, start).end()
+                if end < len(self._buffer) or self._eof:
+                    break
+                start -= self._fill(start)
+            self._pos = end
+            if end == start:
+                self._error("Expecting value")
+        else:
+            self._error("Expecting value")
+        return start
+
+    def _scan_string(self, start, pos):
+        """Move past a string whose body begins at ``pos``; return ``start``."""
+        while True:
+            match = _STRING_TAIL.match(self._buffer, pos)
+            if match is not None:
+                self._pos = match.end()
+                return start
+            moved = self._fill(start)
+            if moved < 0:
+                self._error("Unterminated string")
+            start -= moved
+            pos -= moved
+
+    def finish(self):
+        """Check that only whitespace follows the top-level value."""
+        if self.peek():
+            self._error("Extra data")
+
+
+class PartialSpec:
+    """The parts of a JSON spec needed to run one command.
+
+    Attributes:
+        spec (dict): The reduced spec: top-level sections, matching
+            ``paths`` entries and the components they reference.
+        path_count (int): Number of ``paths`` entries in the full document.
+
+    """
+
+    def __init__(self, chunks, tokens):
+        """Scan the spec and extract what the command ``tokens`` need.
+
+        Args:
+            chunks (iterable): The spec's JSON body as byte chunks.
+            tokens (list): Leading positional arguments of the command.
+
+        Raises:
+            json.JSONDecodeError: If the body is not valid JSON.
+        """
+        self.path_count = 0
+        self.spec = {}
+        components = {}
+
+        scanner = _Scanner(chunks)
+        for key in scanner.members():
+            if key == "paths":
+                paths = self.spec["paths"] = {}
+                for path in scanner.members():
+                    self.path_count += 1
+                    if path_matches(path, tokens):
+                        paths[path] = json.loads(scanner.value())
+                    else:
+                        scanner.skip()
+            elif key == "components":
+                for section in scanner.members():
+                    raw = components[section] = {}
+                    for name in scanner.members():
+                        raw[name] = scanner.value()
+            elif key in SKIPPED_SECTIONS:
+                scanner.skip()
+            else:
+                self.spec[key] = json.loads(scanner.value())
+        scanner.finish()
+
+        self.spec.setdefault("paths", {})
+        if components:
+            self.spec["components"] = self._resolve_components(components)
+
+    def _resolve_components(self, components):
+        """Decode the components referenced from the selected paths."""
+        selected = {}
+        for section in ALWAYS_INCLUDED_COMPONENTS:
+            for name, raw in components.get(section, {}).items():
+                selected.setdefault(section, {})[name] = json.loads(raw)
+
+        pending = list(_references(self.spec.get("paths", {})))
+        for section in selected.values():
+            pending.extend(_references(section))
+        while pending:
+            section, name = pending.pop()
+            if name in selected.get(section, {}):
+                continue
+            raw = components.get(section, {}).get(name)
+            if raw is None:
+                continue
+            value = json.loads(raw)
+            selected.setdefault(section, {})[name] = value
+            pending.extend(_references(value))
+        return selected
+
+
+def _references(value):
+    """Yield ``(section, name)`` for every component reference in ``value``."""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            ref = value.get("$ref")
+            if isinstance(ref, str) and ref.startswith(_REF_PREFIX):
+                parts = ref.split("/")[2:4]
+                if len(parts) == 2:
+                    yield tuple(
+                        part.replace("~1", "/").replace("~0", "~") for part in parts
+                    )
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
@@ -0,0 +1,268 @@
+"""Prepared request templates.
+
+This module provides a class that compiles an OpenAPI operation once into a
+request template: the path is pre-split into literal segments and parameter
+slots, and every parameter gets a precomputed encoder for its location
+(path, query, header or cookie). Building a request from argument values then
+only has to walk these precomputed tables. The parameter and request body
+schemas are compiled into validators the first time arguments are checked.
+"""
+
+import re
+from urllib.parse import quote
+
+from .encoding import FORM_CONTENT_TYPE, JSON_CONTENT_TYPE, RequestBody
+from .schema import SchemaCompiler, no_errors
+
+PARAMETER_LOCATIONS = ("path", "query", "header", "cookie")
+# Separators of array items by query parameter style
+QUERY_DELIMITERS = {"form": ",", "spaceDelimited": " ", "pipeDelimited": "|"}
+
+_PATH_TEMPLATE = re.compile(r"\{([^{}]+)\}")
+
+
+def _encode_scalar(value):
+    """Encode a scalar the way OpenAPI's default styles serialize it."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _encode_path(value):
+    """Encode a path parameter using the ``simple`` style."""
+    if isinstance(value, (list, tuple)):
+        value = ",".join(_encode_scalar(v) for v in value)
+    else:
+        value = _encode_scalar(value)
+    return quote(value, safe="")
+
+
+def _encode_query(value):
+    """Encode a query parameter; lists are exploded by ``requests``."""
+    if isinstance(value, (list, tuple)):
+        return [_encode_scalar(v) for v in value]
+    return _encode_scalar(value)
+
+
+def _array_query_encoder(delimiter, explode):
+    """Return the encoder of an array query parameter in a given style.
+
+    Values given as text, as on the command line, are split into items at
+    ``delimiter``, so ``"a,b"`` is sent as ``tags=a&tags=b`` when exploded
+    and as ``tags=a,b`` otherwise.
+    """
+
+    def encode(value):
+        if isinstance(value, str):
+            value = value.split(delimiter)
+        elif not isinstance(value, (list, tuple)):
+            value = [value]
+        items = [_encode_scalar(v) for v in value]
+        return items if explode else delimiter.join(items)
+
+    return encode
+
+
+def _encode_header(value):
+    """Encode a header or cookie parameter using the ``simple`` style."""
+    if isinstance(value, (list, tuple)):
+        return ",".join(_encode_scalar(v) for v in value)
+    return _encode_scalar(value)
+
+
+_ENCODERS = {
+    "path": _encode_path,
+    "query": _encode_query,
+    "header": _encode_header,
+    "cookie": _encode_header,
+}
+
+
+class PreparedOperation:
+    """An operation compiled into a reusable request template.
+
+    Attributes:
+        method (str): Upper-case HTTP method.
+        path (str): The path template from the spec.
+        name (str): The ``operationId``, or ``METHOD /path`` without one.
+        operation (dict): The operation object from the spec.
+        parameters (list): Path-item and operation parameters with ``$ref``
+            entries resolved; operation parameters override path-item ones.
+        schemas (SchemaCompiler): Compiler of the spec's schemas.
+
+    """
+
+    def __init__(
+        self, method, path, operation, path_item=None, spec=None, schemas=None
+    ):
+        """Compile the operation's parameters and path template."""
+        self.method = method.upper()
+        self.path = path
+        self.name = operation.get("operationId") or f"{self.method} {path}"
+        self.operation = operation
+        self.parameters = self._merge_parameters(
+            (path_item or {}).get("parameters", []),
+            operation.get("parameters", []),
+            spec or {},
+        )
+
+        # Even entries are literal path segments, odd entries parameter names
+        self._segments = _PATH_TEMPLATE.split(path)
+        self._path_names = set(self._segments[1::2])
+        self.schemas = schemas or SchemaCompiler(spec)
+        self._encoders = {}
+        self._delimiters = {}
+        for param in self.parameters:
+            location = param.get("in", "query")
+            if location not in PARAMETER_LOCATIONS:
+                location = "query"
+            encode = _ENCODERS[location]
+            is_array = self.schemas.scalar_type(param.get("schema", {})) == "array"
+            if location == "query" and is_array:
+                style = param.get("style", "form")
+                delimiter = QUERY_DELIMITERS.get(style, ",")
+                explode = param.get("explode", style == "form")
+                encode = _array_query_encoder(delimiter, explode)
+                self._delimiters[param["name"]] = delimiter
+            self._encoders[param["name"]] = (location, encode)
+        for name in self._path_names:
+            self._encoders.setdefault(name, ("path", _encode_path))
+
+        self._parameter_validators = None
+        self._body_validators = {}
+
+    @staticmethod
+    def _merge_parameters(path_parameters, operation_parameters, spec):
+        """Resolve ``$ref`` parameters and merge path-item and operation lists."""
+        merged = {}
+        for param in list(path_parameters) + list(operation_parameters):
+            param = _resolve(param, spec)
+            merged[(param["name"], param.get("in", "query"))] = param
+        return list(merged.values())
+
+    @property
+    def required_parameters(self):
+        """Return the parameters that must be supplied."""
+        return [param for param in self.parameters if param.get("required", False)]
+
+    @property
+    def request_body(self):
+        """Return the operation's request body object with ``$ref`` resolved."""
+        return self.schemas.resolve(self.operation.get("requestBody", {})) or {}
+
+    def parameter_errors(self, arguments):
+        """Check argument values against their parameters' schemas.
+
+        Values may also be given as text, the way they are sent.
+
+        Returns:
+            list: ``name: message`` strings; empty if all values are valid.
+        """
+        validators = self._parameter_validators
+        if validators is None:
+            validators = self._parameter_validators = {
+                param["name"]: self.schemas.parameter_validator(
+                    param["schema"], self._delimiters.get(param["name"], ",")
+                )
+                for param in self.parameters
+                if "schema" in param
+            }
+        errors = []
+        for name, value in arguments.items():
+            validate = validators.get(name)
+            if validate is not None and value is not None:
+                errors.extend(validate(value, name))
+        return errors
+
+    def body_errors(self, data, content_type):
+        """Check an inline request body against the schema of its content type.
+
+        Bodies streamed from a file or stdin, bodies without a schema, and
+        multipart or raw content types are not checked.
+
+        Returns:
+            list: ``data/pointer: message`` strings; empty if the body is valid.
+        """
+        if data is None:
+            if self.request_body.get("required", False):
+                return ["data: a request body is required"]
+            return []
+        if isinstance(data, RequestBody):
+            return []
+        validate = self._body_validators.get(content_type)
+        if validate is None:
+            media_type = self.request_body.get("content", {}).get(content_type, {})
+            schema = media_type.get("schema")
+            if schema is None or not _checked_content_type(content_type):
+                validate = no_errors
+            else:
+                validate = self.schemas.validator(schema)
+            self._body_validators[content_type] = validate
+        return validate(data, "data")
+
+    def build(self, arguments):
+        """Place argument values into the request.
+
+        Args:
+            arguments (dict): Parameter values keyed by parameter name; ``None``
+                values are skipped and unknown names are sent as query
+                parameters.
+
+        Returns:
+            tuple: ``(path, query, headers, cookies)``.
+
+        Raises:
+            ValueError: If a path parameter has no value.
+        """
+        values = {}
+        query = {}
+        headers = {}
+        cookies = {}
+        targets = {"query": query, "header": headers, "cookie": cookies}
+
+        for name, value in arguments.items():
+            if value is None:
+                continue
+            location, encode = self._encoders.get(name, ("query", _encode_query))
+            if location == "path":
+                values[name] = encode(value)
+            else:
+                targets[location][name] = encode(value)
+
+        segments = self._segments
+        if len(segments) == 1:
+            return segments[0], query, headers, cookies
+
+        parts = []
+        for index, segment in enumerate(segments):
+            if index % 2 == 0:
+                parts.append(segment)
+            elif segment in values:
+                parts.append(values[segment])
+            else:
+                raise ValueError(f"Missing value for path parameter '{segment}'")
+        return "".join(parts), query, headers, cookies
+
+
+def _checked_content_type(content_type):
+    """Check whether inline bodies of a content type are validated."""
+    media_type = content_type.split(";")[0].strip()
+    if media_type in (JSON_CONTENT_TYPE, FORM_CONTENT_TYPE):
+        return True
+    return media_type.endswith("+json")
+
+
+def _resolve(param, spec):
+    """Resolve a local ``$ref`` parameter against the spec."""
+    seen = set()
+    while "$ref" in param:
+        ref = param["$ref"]
+        if not ref.startswith("#/") or ref in seen:
+            raise ValueError(f"Cannot resolve parameter reference: {ref}")
+        seen.add(ref)
+        target = spec
+        for key in ref[2:].split("/"):
+            key = key.replace("~1", "/").replace("~0", "~")
+            target = target[key]
+        param = target
+    return param
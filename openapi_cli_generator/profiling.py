@@ -0,0 +1,317 @@
+"""Memory profiling of spec handling.
+
+This module provides a ``tracemalloc``-based profiler that measures each stage
+of turning a spec into a CLI (decoding, validation, partial loading, grouping
+operations into resources and building the argument parsers), a generator of
+synthetic specs of any size, and budgets that fail when a stage uses more
+memory than allowed.
+
+Run ``python -m openapi_cli_generator.profiling --help`` for a report on a
+synthetic or real spec.
+"""
+
+import argparse
+import io
+import json
+import sys
+import tracemalloc
+from contextlib import contextmanager
+
+DEFAULT_TOP = 5
+
+_IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class StageStats:
+    """Memory used by one profiled stage.
+
+    Attributes:
+        name (str): The stage name.
+        peak (int): Highest number of bytes allocated during the stage and
+            alive at the same time.
+        retained (int): Bytes allocated during the stage still alive at its end.
+        hotspots (list): ``(location, size, count)`` of the source lines that
+            allocated most of the retained memory.
+
+    """
+
+    def __init__(self, name, peak, retained, hotspots):
+        """Initialize the stage statistics."""
+        self.name = name
+        self.peak = peak
+        self.retained = retained
+        self.hotspots = hotspots
+
+    def as_dict(self):
+        """Return the statistics as a JSON-serializable dict."""
+        return {
+            "name": self.name,
+            "peak": self.peak,
+            "retained": self.retained,
+            "hotspots": [
+                {"location": location, "size": size, "count": count}
+                for location, size, count in self.hotspots
+            ],
+        }
+
+
+class MemoryProfiler:
+    """Measure peak and retained memory per stage with ``tracemalloc``.
+
+    Tracing restarts for every stage, so a stage only accounts for its own
+    allocations; memory retained by earlier stages is not counted again.
+
+    Attributes:
+        top (int): Number of hotspots recorded per stage.
+        stages (list): ``StageStats`` of the stages measured so far.
+
+    """
+
+    def __init__(self, top=DEFAULT_TOP):
+        """Initialize the profiler."""
+        self.top = top
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        """Measure the code run inside the ``with`` block as one stage."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        tracemalloc.start()
+        try:
+            yield
+            retained, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+        finally:
+            tracemalloc.stop()
+        top = self.top
+        hotspots = [
+            (str(stat.traceback[0]), stat.size, stat.count)
+            for stat in snapshot.statistics("lineno")[:top]
+        ]
+        self.stages.append(StageStats(name, peak, retained, hotspots))
+
+    def __getitem__(self, name):
+        """Return the statistics of the last stage with this name."""
+        for stats in reversed(self.stages):
+            if stats.name == name:
+                return stats
+        raise KeyError(name)
+
+    def check(self, budgets):
+        """Compare the measured stages against memory budgets.
+
+        Args:
+            budgets (dict): Maps stage names to ``{"peak": bytes,
+                "retained": bytes}``; either limit may be omitted.
+
+        Returns:
+            list: One message per exceeded budget; empty if all are met.
+        """
+        violations = []
+        for stats in self.stages:
+            for measure, limit in budgets.get(stats.name, {}).items():
+                used = getattr(stats, measure)
+                if used > limit:
+                    violations.append(
+                        f"{stats.name}: {measure} {format_size(used)} "
+                        f"exceeds budget of {format_size(limit)}"
+                    )
+        return violations
+
+    def report(self, stream=None):
+        """Write a table of the measured stages and their hotspots."""
+        stream = stream or sys.stdout
+        stream.write(f"{'stage':<16} {'peak':>10} {'retained':>10}\n")
+        for stats in self.stages:
+            stream.write(
+                f"{stats.name:<16} {format_size(stats.peak):>10} "
+                f"{format_size(stats.retained):>10}\n"
+            )
+            for location, size, count in stats.hotspots:
+                stream.write(f"    {format_size(size):>10} {count:>8}  {location}\n")
+
+
+def format_size(size):
+    """Format a number of bytes for humans."""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def synthetic_spec(resources=100, properties=20):
+    """Build a synthetic spec shaped like a typical CRUD API.
+
+    Every resource lives under one of a few top-level groups and has a
+    collection path (list, create) and an item path (get, update, delete),
+    with query, path and header parameters, and request and response bodies
+    referencing a component schema.
+
+    Args:
+        resources (int): Number of resources; the spec has two paths and
+            five operations per resource.
+        properties (int): Number of properties per component schema.
+    """
+    paths = {}
+    schemas = {}
+    for index in range(resources):
+        group = f"group{index % 10}"
+        name = f"resource{index}"
+        schema = f"Resource{index}"
+        schemas[schema] = {
+            "type": "object",
+            "required": ["id"],
+            "properties": {
+                f"field{p}": {
+                    "type": ("string", "integer", "boolean")[p % 3],
+                    "description": f"Field {p} of {name}",
+                }
+                for p in range(properties)
+            },
+        }
+        ref = {"$ref": f"#/components/schemas/{schema}"}
+        body = {"required": True, "content": {"application/json": {"schema": ref}}}
+        ok = {"description": "OK", "content": {"application/json": {"schema": ref}}}
+        trace = {"name": "X-Trace-Id", "in": "header", "schema": {"type": "string"}}
+        item_id = {
+            "name": "item_id",
+            "in": "path",
+            "required": True,
+            "schema": {"type": "integer"},
+        }
+
+        def operation(verb, *parameters, request_body=None):
+            result = {
+                "summary": f"{verb} {name}",
+                "operationId": f"{verb}_{name}",
+                "parameters": [trace, *parameters],
+                "responses": {"200": ok},
+            }
+            if request_body:
+                result["requestBody"] = request_body
+            return result
+
+        paths[f"/{group}/{name}/"] = {
+            "get": operation(
+                "list",
+                {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+                {"name": "skip", "in": "query", "schema": {"type": "integer"}},
+            ),
+            "post": operation("create", request_body=body),
+        }
+        paths[f"/{group}/{name}/{{item_id}}"] = {
+            "get": operation("get", item_id),
+            "put": operation("update", item_id, request_body=body),
+            "delete": operation("delete", item_id),
+        }
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": "Synthetic API", "version": "1.0.0"},
+        "servers": [{"url": "http://localhost:8000"}],
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
+
+
+def profile_spec(body, command=None, validate=True, profiler=None):
+    """Profile every stage of turning a JSON spec body into a CLI.
+
+    Args:
+        body (bytes): The spec as a JSON document.
+        command (list): Command tokens for the ``partial`` stage; defaults to
+            the first operation's resource path.
+        validate (bool): Include the (slow) ``validate`` stage.
+        profiler (MemoryProfiler): Profiler to record into.
+
+    Returns:
+        MemoryProfiler: The profiler holding one ``StageStats`` per stage.
+    """
+    from .encoding import CHUNK_SIZE
+    from .generator import CLIGenerator
+    from .partial import PartialSpec
+    from .validation import validate_spec
+
+    profiler = profiler or MemoryProfiler()
+
+    with profiler.stage("decode"):
+        spec = json.loads(body)
+    if validate:
+        with profiler.stage("validate"):
+            validate_spec(spec)
+
+    generator = CLIGenerator(spec)
+    if command is None:
+        path = next(iter(spec.get("paths", {})), "/")
+        command = [p for p in path.strip("/").split("/") if not p.startswith("{")]
+    stream = io.BytesIO(body)
+    with profiler.stage("partial"):
+        partial = PartialSpec(iter(lambda: stream.read(CHUNK_SIZE), b""), command)
+    del partial
+
+    with profiler.stage("resource_groups"):
+        resource_groups = generator.build_resource_groups()
+    del resource_groups
+    with profiler.stage("generate_cli"):
+        generator.generate_cli()
+    return profiler
+
+
+def main(argv=None):
+    """Print a memory report for a synthetic or real spec."""
+    parser = argparse.ArgumentParser(
+        prog="python -m openapi_cli_generator.profiling",
+        description="Report peak and retained memory per spec handling stage.",
+    )
+    parser.add_argument("spec", nargs="?", help="JSON spec file (default: synthetic)")
+    parser.add_argument(
+        "--resources",
+        type=int,
+        default=1000,
+        help="Resources in the synthetic spec (default: 1000)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=DEFAULT_TOP, help="Hotspots per stage"
+    )
+    parser.add_argument(
+        "--skip-validation", action="store_true", help="Skip the validate stage"
+    )
+    parser.add_argument(
+        "--budgets", help="JSON file of per-stage budgets; exit 1 if exceeded"
+    )
+    parser.add_argument("--json", action="store_true", help="Write JSON instead")
+    args = parser.parse_args(argv)
+
+    if args.spec:
+        with open(args.spec, "rb") as f:
+            body = f.read()
+    else:
+        body = json.dumps(synthetic_spec(args.resources)).encode()
+
+    profiler = profile_spec(
+        body, validate=not args.skip_validation, profiler=MemoryProfiler(args.top)
+    )
+    if args.json:
+        json.dump([stats.as_dict() for stats in profiler.stages], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(f"spec size: {format_size(len(body))}\n")
+        profiler.report()
+
+    if args.budgets:
+        with open(args.budgets) as f:
+            violations = profiler.check(json.load(f))
+        for violation in violations:
+            print(f"Budget exceeded: {violation}", file=sys.stderr)
+        if violations:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
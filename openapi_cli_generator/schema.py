@@ -0,0 +1,645 @@
+"""Compiled validators for request data.
+
+This module provides a class that compiles the JSON schemas of a spec into
+nested validator functions: each schema is turned once into a closure that
+only runs the checks its keywords call for (types, enums, formats, required
+and additional properties, array items, bounds, ``allOf``/``anyOf``/
+``oneOf`` and local ``$ref`` targets). Validating a value then walks these
+closures without interpreting the schema again, so request bodies and
+parameters can be checked locally before each request of a batch is sent.
+
+Errors are reported as ``pointer: message`` strings, where the pointer
+starts with the name of the validated value, e.g. ``data/Address/City``.
+"""
+
+import ipaddress
+import json
+import re
+import threading
+from datetime import date
+from urllib.parse import urlsplit
+
+# Characters of a value shown in an error message
+MAX_SHOWN = 80
+
+_DATE_TIME = re.compile(
+    r"^(\d{4}-\d{2}-\d{2})[Tt ](\d{2}):(\d{2}):(\d{2})(\.\d+)?([Zz]|[+-]\d{2}:\d{2})$"
+)
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_UUID = re.compile(r"^[0-9a-fA-F]{8}(-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}$")
+_URI = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:\S*$")
+_HOSTNAME = re.compile(
+    r"^(?=.{1,253}$)[A-Za-z0-9]([A-Za-z0-9-]{0,61}[A-Za-z0-9])?"
+    r"(\.[A-Za-z0-9]([A-Za-z0-9-]{0,61}[A-Za-z0-9])?)*$"
+)
+_BASE64 = re.compile(r"^[A-Za-z0-9+/]*={0,2}$")
+
+
+def _show(value):
+    """Return a value as shown in error messages, shortened if long."""
+    text = repr(value)
+    if len(text) > MAX_SHOWN:
+        end = MAX_SHOWN - 3
+        text = text[:end] + "..."
+    return text
+
+
+def _escape(key):
+    """Escape a key for use in a JSON pointer."""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _is_date(value):
+    """Check for an RFC 3339 ``full-date``."""
+    if not _DATE.match(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_date_time(value):
+    """Check for an RFC 3339 ``date-time``."""
+    match = _DATE_TIME.match(value)
+    if not match or not _is_date(match.group(1)):
+        return False
+    hour, minute, second = (int(match.group(n)) for n in (2, 3, 4))
+    return hour < 24 and minute < 60 and second <= 60
+
+
+def _is_ip(kind):
+    """Return a check for IP addresses of one version."""
+
+    def check(value):
+        try:
+            kind(value)
+        except ValueError:
+            return False
+        return True
+
+    return check
+
+
+def _is_uri(value):
+    """Check for an absolute URI."""
+    if not _URI.match(value):
+        return False
+    try:
+        urlsplit(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_byte(value):
+    """Check for base64-encoded data."""
+    return len(value) % 4 == 0 and bool(_BASE64.match(value))
+
+
+# Checks of string formats; unknown formats are not checked
+STRING_FORMATS = {
+    "date": _is_date,
+    "date-time": _is_date_time,
+    "email": _EMAIL.match,
+    "uuid": _UUID.match,
+    "uri": _is_uri,
+    "hostname": _HOSTNAME.match,
+    "ipv4": _is_ip(ipaddress.IPv4Address),
+    "ipv6": _is_ip(ipaddress.IPv6Address),
+    "byte": _is_byte,
+}
+
+# Ranges of integer formats
+INTEGER_FORMATS = {
+    "int32": (-(2**31), 2**31 - 1),
+    "int64": (-(2**63), 2**63 - 1),
+}
+
+
+def _is_integer(value):
+    """Check for a JSON integer; integral floats such as ``1.0`` count."""
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or isinstance(value, float) and value.is_integer()
+
+
+def _is_number(value):
+    """Check for a JSON number."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+_TYPES = {
+    "string": lambda value: isinstance(value, str),
+    "integer": _is_integer,
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, (list, tuple)),
+    "object": lambda value: isinstance(value, dict),
+    "null": lambda value: value is None,
+}
+
+
+def boolean(value):
+    """Parse a boolean given as text: true/false, 1/0, yes/no or on/off.
+
+    Raises:
+        ValueError: If the text is none of these.
+    """
+    text = str(value).lower()
+    if text in ("true", "1", "yes", "on"):
+        return True
+    if text in ("false", "0", "no", "off"):
+        return False
+    raise ValueError(f"expected true or false, got {value}")
+
+
+# Parsers of parameter values given on the command line, by JSON type
+ARGUMENT_TYPES = {"integer": int, "number": float, "boolean": boolean}
+
+
+def _accept(value, pointer, errors):
+    """Accept any value."""
+
+
+def no_errors(value, pointer):
+    """Validate a value that is not checked."""
+    return []
+
+
+def _types(schema):
+    """Return the types a schema allows, including ``null`` if nullable."""
+    types = schema.get("type")
+    if types is None:
+        return []
+    types = [types] if isinstance(types, str) else list(types)
+    if schema.get("nullable") and "null" not in types:
+        types.append("null")
+    return types
+
+
+def _coerce(value, types, item_types=(), delimiter=","):
+    """Convert a parameter value given as text to the type its schema expects.
+
+    Parameters are sent as text, so ``"5"`` is as good as ``5`` for an
+    integer parameter, and ``"a,b"`` is an array in the default style;
+    ``delimiter`` separates the items of arrays in other styles.
+    """
+    if isinstance(value, str) and "string" not in types:
+        if "array" in types:
+            return [_coerce(item, item_types) for item in value.split(delimiter)]
+        if "integer" in types:
+            try:
+                return int(value)
+            except ValueError:
+                pass
+        if "number" in types:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+        if "boolean" in types and value in ("true", "false"):
+            return value == "true"
+    elif isinstance(value, (list, tuple)) and "array" in types:
+        return [_coerce(item, item_types) for item in value]
+    return value
+
+
+class SchemaCompiler:
+    """Compile the schemas of a spec into validator functions.
+
+    Compiled schemas are cached by identity, so a component referenced by
+    many operations is compiled once.
+
+    Attributes:
+        spec (dict): The spec local ``$ref`` targets are resolved in.
+
+    """
+
+    def __init__(self, spec=None):
+        """Initialize the compiler; schemas are compiled when first used."""
+        self.spec = spec or {}
+        self._compiled = {}
+        # Reentrant, since compiling a schema compiles its subschemas
+        self._lock = threading.RLock()
+
+    def resolve(self, schema):
+        """Follow local ``$ref`` entries to the schema they point to.
+
+        Returns:
+            The referenced schema, or None if a reference points outside the
+            spec or cannot be resolved; such schemas are not checked, since
+            the server may well accept the value.
+        """
+        seen = set()
+        while isinstance(schema, dict) and "$ref" in schema:
+            ref = schema["$ref"]
+            if not isinstance(ref, str) or not ref.startswith("#/") or ref in seen:
+                return None
+            seen.add(ref)
+            target = self.spec
+            try:
+                for key in ref[2:].split("/"):
+                    target = target[key.replace("~1", "/").replace("~0", "~")]
+            except (KeyError, IndexError, TypeError):
+                return None
+            schema = target
+        return schema
+
+    def scalar_type(self, schema):
+        """Return the one non-null type a schema allows, or None."""
+        types = [t for t in _types(self.resolve(schema) or {}) if t != "null"]
+        return types[0] if len(types) == 1 else None
+
+    def argument_type(self, schema):
+        """Return the parser of a parameter value given as text.
+
+        Values are parsed to the schema's type, so ``--flag false`` is sent
+        as false; values of other and mixed types are kept as text.
+        """
+        return ARGUMENT_TYPES.get(self.scalar_type(schema), str)
+
+    def validator(self, schema):
+        """Return a function listing the errors of a value.
+
+        The function takes the value and the pointer naming it, and returns
+        a list of ``pointer: message`` strings; an empty list if it is valid.
+        """
+        check = self.compile(schema)
+        if check is _accept:
+            return no_errors
+
+        def validate(value, pointer):
+            errors = []
+            check(value, pointer, errors)
+            return errors
+
+        return validate
+
+    def parameter_validator(self, schema, delimiter=","):
+        """Return a validator for a parameter, accepting values given as text.
+
+        Arrays given as text are split into items at ``delimiter``.
+        """
+        schema = self.resolve(schema)
+        check = self.compile(schema)
+        if check is _accept:
+            return no_errors
+        types = _types(schema)
+        item_types = ()
+        if "array" in types and isinstance(schema.get("items"), dict):
+            item_types = _types(self.resolve(schema["items"]) or {})
+
+        def validate(value, pointer):
+            errors = []
+            check(_coerce(value, types, item_types, delimiter), pointer, errors)
+            return errors
+
+        return validate
+
+    def compile(self, schema):
+        """Compile a schema into ``check(value, pointer, errors)``.
+
+        The check appends an error message for each violation to ``errors``.
+        """
+        if not isinstance(schema, dict):
+            return _accept
+        key = id(schema)
+        with self._lock:
+            entry = self._compiled.get(key)
+            if entry is not None:
+                return entry[1]
+            # Recursive schemas reach themselves while being compiled
+            compiled = []
+
+            def deferred(value, pointer, errors):
+                compiled[0](value, pointer, errors)
+
+            # Entries keep their schema alive, so its id is not reused
+            self._compiled[key] = (schema, deferred)
+            try:
+                check = self._compile(schema)
+            except Exception:
+                del self._compiled[key]
+                raise
+            compiled.append(check)
+            self._compiled[key] = (schema, check)
+        return check
+
+    def _compile(self, schema):
+        """Compile the keywords of a schema."""
+        if "$ref" in schema:
+            return self.compile(self.resolve(schema))
+        checks = []
+        types = _types(schema)
+        if types:
+            checks.append(_type_check(types))
+        if "enum" in schema:
+            values = list(schema["enum"])
+            if "null" in types and None not in values:
+                values.append(None)
+            checks.append(_enum_check(values))
+        checks.extend(_string_checks(schema))
+        checks.extend(_number_checks(schema))
+        checks.extend(self._array_checks(schema))
+        checks.extend(self._object_checks(schema))
+        checks.extend(self._combinator_checks(schema))
+
+        if not checks:
+            return _accept
+        if len(checks) == 1:
+            return checks[0]
+
+        def check(value, pointer, errors):
+            for keyword_check in checks:
+                keyword_check(value, pointer, errors)
+
+        return check
+
+    def _array_checks(self, schema):
+        """Compile ``items`` and the array bounds."""
+        checks = []
+        if "items" in schema:
+            items = self.compile(schema["items"])
+            if items is not _accept:
+
+                def check_items(value, pointer, errors):
+                    if isinstance(value, (list, tuple)):
+                        for index, item in enumerate(value):
+                            items(item, f"{pointer}/{index}", errors)
+
+                checks.append(check_items)
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+        unique = schema.get("uniqueItems", False)
+        if min_items is not None or max_items is not None or unique:
+
+            def check_bounds(value, pointer, errors):
+                if not isinstance(value, (list, tuple)):
+                    return
+                if min_items is not None and len(value) < min_items:
+                    errors.append(f"{pointer}: {_show(value)} is too short")
+                if max_items is not None and len(value) > max_items:
+                    errors.append(f"{pointer}: {_show(value)} is too long")
+                if unique:
+                    keys = {json.dumps(item, sort_keys=True) for item in value}
+                    if len(keys) < len(value):
+                        errors.append(
+                            f"{pointer}: {_show(value)} has non-unique elements"
+                        )
+
+            checks.append(check_bounds)
+        return checks
+
+    def _object_checks(self, schema):
+        """Compile ``properties``, ``required`` and ``additionalProperties``."""
+        checks = []
+        properties = schema.get("properties", {})
+        compiled = {}
+        read_only = set()
+        for name, subschema in properties.items():
+            check = self.compile(subschema)
+            if check is not _accept:
+                compiled[name] = check
+            if (self.resolve(subschema) or {}).get("readOnly"):
+                read_only.add(name)
+        # Read-only properties are set by the server, not sent in requests
+        required = [
+            name for name in schema.get("required", []) if name not in read_only
+        ]
+        additional = schema.get("additionalProperties", True)
+        extra = None
+        if isinstance(additional, dict):
+            extra = self.compile(additional)
+        min_properties = schema.get("minProperties")
+        max_properties = schema.get("maxProperties")
+
+        if compiled or extra not in (None, _accept):
+
+            def check_properties(value, pointer, errors):
+                if not isinstance(value, dict):
+                    return
+                for name, item in value.items():
+                    check = compiled.get(name)
+                    if check is not None:
+                        check(item, f"{pointer}/{_escape(name)}", errors)
+                    elif extra is not None and name not in properties:
+                        extra(item, f"{pointer}/{_escape(name)}", errors)
+
+            checks.append(check_properties)
+        if required:
+
+            def check_required(value, pointer, errors):
+                if isinstance(value, dict):
+                    for name in required:
+                        if name not in value:
+                            errors.append(f"{pointer}: {name!r} is a required property")
+
+            checks.append(check_required)
+        if additional is False:
+
+            def check_additional(value, pointer, errors):
+                if isinstance(value, dict):
+                    unexpected = [name for name in value if name not in properties]
+                    if unexpected:
+                        names = ", ".join(repr(name) for name in unexpected)
+                        verb = "was" if len(unexpected) == 1 else "were"
+                        errors.append(
+                            f"{pointer}: Additional properties are not allowed "
+                            f"({names} {verb} unexpected)"
+                        )
+
+            checks.append(check_additional)
+        if min_properties is not None or max_properties is not None:
+
+            def check_size(value, pointer, errors):
+                if not isinstance(value, dict):
+                    return
+                if min_properties is not None and len(value) < min_properties:
+                    errors.append(
+                        f"{pointer}: {_show(value)} does not have enough properties"
+                    )
+                if max_properties is not None and len(value) > max_properties:
+                    errors.append(f"{pointer}: {_show(value)} has too many properties")
+
+            checks.append(check_size)
+        return checks
+
+    def _combinator_checks(self, schema):
+        """Compile ``allOf``, ``anyOf``, ``oneOf`` and ``not``."""
+        checks = []
+        for subschema in schema.get("allOf", []):
+            check = self.compile(subschema)
+            if check is not _accept:
+                checks.append(check)
+        for keyword in ("anyOf", "oneOf"):
+            if keyword in schema:
+                alternatives = [self.compile(s) for s in schema[keyword]]
+                checks.append(_alternatives_check(alternatives, keyword == "oneOf"))
+        if "not" in schema:
+            negated = self.compile(schema["not"])
+
+            def check_not(value, pointer, errors):
+                failures = []
+                negated(value, pointer, failures)
+                if not failures:
+                    errors.append(f"{pointer}: {_show(value)} should not be valid")
+
+            checks.append(check_not)
+        return checks
+
+
+def _type_check(types):
+    """Compile ``type``."""
+    tests = [_TYPES[name] for name in types if name in _TYPES]
+    if not tests:
+        return _accept
+    expected = ", ".join(repr(name) for name in types)
+
+    def check_type(value, pointer, errors):
+        for test in tests:
+            if test(value):
+                return
+        errors.append(f"{pointer}: {_show(value)} is not of type {expected}")
+
+    return check_type
+
+
+def _enum_check(values):
+    """Compile ``enum``."""
+    try:
+        # Keyed by type as well, since true == 1 in Python but not in JSON
+        allowed = frozenset((type(v), v) for v in values)
+    except TypeError:
+        # Objects or arrays among the values
+        allowed = frozenset()
+
+    def check_enum(value, pointer, errors):
+        try:
+            if (type(value), value) in allowed:
+                return
+        except TypeError:
+            pass
+        for candidate in values:
+            if candidate == value and isinstance(candidate, bool) == isinstance(
+                value, bool
+            ):
+                return
+        errors.append(f"{pointer}: {_show(value)} is not one of {_show(values)}")
+
+    return check_enum
+
+
+def _string_checks(schema):
+    """Compile ``format`` and the string bounds."""
+    checks = []
+    fmt = schema.get("format")
+    if fmt in STRING_FORMATS:
+        test = STRING_FORMATS[fmt]
+
+        def check_format(value, pointer, errors):
+            if isinstance(value, str) and not test(value):
+                errors.append(f"{pointer}: {_show(value)} is not a {fmt!r}")
+
+        checks.append(check_format)
+    elif fmt in INTEGER_FORMATS:
+        low, high = INTEGER_FORMATS[fmt]
+
+        def check_range(value, pointer, errors):
+            if _is_integer(value) and not low <= value <= high:
+                errors.append(f"{pointer}: {value} is out of range for {fmt!r}")
+
+        checks.append(check_range)
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = schema.get("pattern")
+    regex = None
+    if pattern is not None:
+        try:
+            regex = re.compile(pattern)
+        except (re.error, TypeError):
+            # ECMA 262 patterns Python cannot compile are not checked
+            pattern = None
+    if min_length is not None or max_length is not None or pattern is not None:
+
+        def check_string(value, pointer, errors):
+            if not isinstance(value, str):
+                return
+            if min_length is not None and len(value) < min_length:
+                errors.append(f"{pointer}: {_show(value)} is too short")
+            if max_length is not None and len(value) > max_length:
+                errors.append(f"{pointer}: {_show(value)} is too long")
+            if regex is not None and not regex.search(value):
+                errors.append(f"{pointer}: {_show(value)} does not match {pattern!r}")
+
+        checks.append(check_string)
+    return checks
+
+
+def _number_checks(schema):
+    """Compile the numeric bounds and ``multipleOf``."""
+    low = schema.get("minimum")
+    high = schema.get("maximum")
+    exclusive_low = schema.get("exclusiveMinimum", False)
+    exclusive_high = schema.get("exclusiveMaximum", False)
+    # OpenAPI 3.1 gives the exclusive bounds as numbers, 3.0 as flags
+    if _is_number(exclusive_low):
+        low, exclusive_low = exclusive_low, True
+    if _is_number(exclusive_high):
+        high, exclusive_high = exclusive_high, True
+    multiple = schema.get("multipleOf")
+    if low is None and high is None and multiple is None:
+        return []
+
+    def check_number(value, pointer, errors):
+        if not _is_number(value):
+            return
+        if low is not None:
+            if exclusive_low and value <= low:
+                errors.append(
+                    f"{pointer}: {value} is less than or equal to the minimum of {low}"
+                )
+            elif value < low:
+                errors.append(f"{pointer}: {value} is less than the minimum of {low}")
+        if high is not None:
+            if exclusive_high and value >= high:
+                errors.append(
+                    f"{pointer}: {value} is greater than or equal to the maximum of {high}"
+                )
+            elif value > high:
+                errors.append(
+                    f"{pointer}: {value} is greater than the maximum of {high}"
+                )
+        if multiple:
+            quotient = value / multiple
+            if abs(quotient - round(quotient)) > 1e-9:
+                errors.append(f"{pointer}: {value} is not a multiple of {multiple}")
+
+    return [check_number]
+
+
+def _alternatives_check(alternatives, exactly_one):
+    """Compile ``anyOf``, or ``oneOf`` if ``exactly_one`` is set."""
+
+    def check_alternatives(value, pointer, errors):
+        matches = 0
+        for alternative in alternatives:
+            failures = []
+            alternative(value, pointer, failures)
+            if not failures:
+                matches += 1
+                if not exactly_one or matches > 1:
+                    break
+        if matches == 0:
+            errors.append(
+                f"{pointer}: {_show(value)} is not valid under any of the given schemas"
+            )
+        elif exactly_one and matches > 1:
+            errors.append(
+                f"{pointer}: {_show(value)} is valid under more than one of the "
+                "given schemas"
+            )
+
+    return check_alternatives
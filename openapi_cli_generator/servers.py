@@ -0,0 +1,188 @@
+"""Server selection for OpenAPI specs.
+
+This module provides a class that expands the spec's ``servers`` entries
+(including server variables), probes the candidates concurrently, orders them
+by latency and caches that order on disk for a limited time. Callers use the
+first server and fail over to the next one on connection errors.
+"""
+
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from .fsutil import write_atomic
+
+DEFAULT_TTL = 300
+DEFAULT_PROBE_TIMEOUT = 2.0
+MAX_CANDIDATES = 16
+
+_VARIABLE = re.compile(r"\{([^{}]+)\}")
+
+
+def expand_servers(servers, limit=MAX_CANDIDATES):
+    """Expand server URL templates into concrete candidate URLs.
+
+    Each variable is substituted with its default first and then with the
+    other values of its ``enum``, so regional endpoints described as
+    ``https://{region}.api.example.com`` become one candidate per region.
+
+    Args:
+        servers (list): The spec's ``servers`` entries.
+        limit (int): Maximum number of candidates to return.
+
+    Returns:
+        list: Unique candidate URLs without trailing slashes, in spec order.
+    """
+    candidates = []
+    for server in servers or []:
+        url = server.get("url", "")
+        variables = server.get("variables", {})
+        names = _VARIABLE.findall(url)
+        choices = []
+        for name in names:
+            variable = variables.get(name, {})
+            values = [variable["default"]] if "default" in variable else []
+            values += [v for v in variable.get("enum", []) if v not in values]
+            choices.append([str(v) for v in values] or [""])
+        for combination in itertools.product(*choices):
+            expanded = url
+            for name, value in zip(names, combination):
+                expanded = expanded.replace(f"{{{name}}}", value)
+            expanded = expanded.rstrip("/")
+            if expanded not in candidates:
+                candidates.append(expanded)
+            if len(candidates) >= limit:
+                return candidates
+    return candidates
+
+
+class ServerSelector:
+    """Order candidate servers by measured latency.
+
+    Attributes:
+        candidates (list): Expanded server URLs in spec order.
+        ttl (float): Seconds a measured order stays valid.
+
+    """
+
+    def __init__(
+        self,
+        servers,
+        session=None,
+        cache_file=None,
+        ttl=DEFAULT_TTL,
+        timeout=DEFAULT_PROBE_TIMEOUT,
+    ):
+        """Initialize the selector; no network access happens until ``select``."""
+        self.candidates = expand_servers(servers)
+        self.session = session or requests.Session()
+        self.cache_file = (
+            Path(cache_file)
+            if cache_file
+            else Path.home() / ".openapi_cli_generator" / "servers.json"
+        )
+        self.ttl = ttl
+        self.timeout = timeout
+        self._order = None
+        self._expires_at = 0
+        self._lock = threading.Lock()
+        self._key = hashlib.sha256("\n".join(self.candidates).encode()).hexdigest()[:16]
+
+    def probe(self, url):
+        """Measure the round-trip time to a server.
+
+        Any HTTP response below 500 counts as healthy, since the base URL
+        itself rarely has a route of its own.
+
+        Returns:
+            float: Latency in seconds, or None if the server is unhealthy.
+        """
+        start = time.perf_counter()
+        try:
+            response = self.session.head(
+                url or "/", timeout=self.timeout, allow_redirects=False
+            )
+            response.close()
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code >= 500:
+            return None
+        return time.perf_counter() - start
+
+    def select(self):
+        """Return the candidates ordered from fastest healthy to unhealthy.
+
+        The order is measured once, cached on disk for ``ttl`` seconds and
+        shared by all threads of this process; it is measured again once it
+        expires, so long-running processes notice servers slowing down.
+        """
+        if len(self.candidates) <= 1:
+            return list(self.candidates)
+        with self._lock:
+            if self._order is None or self._expires_at <= time.time():
+                self._order, self._expires_at = self._load_cache() or self._measure()
+            return list(self._order)
+
+    def report_failure(self, url):
+        """Move a server that failed to connect to the end of the order."""
+        with self._lock:
+            if self._order is None or url not in self._order:
+                return
+            self._order.remove(url)
+            self._order.append(url)
+            self._save_cache(self._order)
+
+    def _measure(self):
+        """Probe all candidates concurrently and cache the resulting order.
+
+        Returns:
+            tuple: The order and the time it expires at.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.candidates)) as executor:
+            latencies = list(executor.map(self.probe, self.candidates))
+        healthy = sorted(
+            (latency, index)
+            for index, latency in enumerate(latencies)
+            if latency is not None
+        )
+        order = [self.candidates[index] for _, index in healthy]
+        order += [url for url in self.candidates if url not in order]
+        self._save_cache(order)
+        return order, time.time() + self.ttl
+
+    def _read_cache_file(self):
+        """Read the whole cache file, ignoring missing or corrupt files."""
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load_cache(self):
+        """Return the cached order and its expiry time if it is still fresh."""
+        entry = self._read_cache_file().get(self._key)
+        if not entry or entry.get("expires_at", 0) < time.time():
+            return None
+        order = entry.get("order", [])
+        if sorted(order) != sorted(self.candidates):
+            return None
+        return order, entry["expires_at"]
+
+    def _save_cache(self, order):
+        """Store the order for other processes; failures are not fatal."""
+        cache = self._read_cache_file()
+        now = time.time()
+        cache = {k: v for k, v in cache.items() if v.get("expires_at", 0) > now}
+        cache[self._key] = {"order": order, "expires_at": now + self.ttl}
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.cache_file, json.dumps(cache))
+        except OSError:
+            pass
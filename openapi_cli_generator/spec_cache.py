@@ -0,0 +1,88 @@
+"""On-disk cache of parsed OpenAPI specs.
+
+This module provides a class that stores fully parsed and validated specs
+per URL, so repeated CLI invocations do not download, decode and validate
+the same document again until the cached copy expires. A spec that failed
+validation is cached as its error message, so it is reported again without
+repeating the work.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from .fsutil import write_atomic
+
+DEFAULT_SPEC_TTL = 3600
+
+
+class SpecCache:
+    """Cache of parsed specs keyed by URL.
+
+    Attributes:
+        cache_dir (Path): Directory holding one JSON file per spec URL.
+        ttl (float): Seconds a cached spec stays valid.
+
+    """
+
+    def __init__(self, cache_dir=None, ttl=DEFAULT_SPEC_TTL):
+        """Initialize the cache; the directory is created on first write."""
+        self.cache_dir = (
+            Path(cache_dir)
+            if cache_dir
+            else Path.home() / ".openapi_cli_generator" / "specs"
+        )
+        self.ttl = ttl
+
+    def _file(self, url):
+        """Return the cache file for a spec URL."""
+        key = hashlib.sha256(url.encode()).hexdigest()[:16]
+        return self.cache_dir / f"{key}.json"
+
+    def pending_file(self, url):
+        """Return a file for a downloaded spec body awaiting a cache fill."""
+        return self._file(url).with_suffix(f".{os.getpid()}.body")
+
+    def get(self, url):
+        """Return the cached spec for a URL, or None if missing or expired.
+
+        Raises:
+            ValueError: If the cached spec failed validation.
+        """
+        try:
+            with open(self._file(url)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url or entry.get("expires_at", 0) < time.time():
+            return None
+        if "error" in entry:
+            raise ValueError(entry["error"])
+        return entry.get("spec")
+
+    def put(self, url, spec):
+        """Store a parsed spec; failures to write are not fatal."""
+        self._write(url, {"spec": spec})
+
+    def put_error(self, url, error):
+        """Store the reason a spec could not be loaded."""
+        self._write(url, {"error": str(error)})
+
+    def invalidate(self, url):
+        """Drop the cached spec for a URL, so it is downloaded again."""
+        try:
+            self._file(url).unlink()
+        except OSError:
+            pass
+
+    def _write(self, url, entry):
+        """Write a cache entry atomically."""
+        cache_file = self._file(url)
+        entry = dict(entry, url=url, expires_at=time.time() + self.ttl)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            write_atomic(cache_file, json.dumps(entry))
+        except OSError:
+            pass
@@ -0,0 +1,293 @@
+"""HTTP transports for generated CLIs and clients.
+
+This module provides the transports that ``CLIGenerator`` sends requests
+through. The default transport uses a pooled ``requests`` session and
+HTTP/1.1, which needs one connection per concurrent request. The HTTP/2
+transports use the optional ``httpx`` package to multiplex all concurrent
+requests to a host over a single connection.
+
+Every transport accepts the keyword arguments of ``requests.Session.request``
+and returns an object with the parts of the ``requests.Response`` interface
+used by the generator; errors are raised as ``requests`` exceptions so
+callers handle all transports the same way.
+"""
+
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from .encoding import CHUNK_SIZE, iter_file
+
+TRANSPORTS = ("http1", "http2", "h2c")
+DEFAULT_TRANSPORT = "http1"
+
+
+class ConnectError(requests.exceptions.ConnectionError):
+    """A connection to the server could not be established."""
+
+
+def connect_failed(error):
+    """Check whether a request failed while connecting, before it was sent.
+
+    Other connection errors, such as a connection dropped while waiting for
+    the response, may happen after the server received the request.
+    """
+    if isinstance(error, (requests.exceptions.ConnectTimeout, ConnectError)):
+        return True
+    reason = error.args[0] if error.args else None
+    # requests wraps urllib3's MaxRetryError, which holds the cause
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, NewConnectionError)
+
+
+class Transport:
+    """Base class for HTTP transports.
+
+    Attributes:
+        name (str): The transport name.
+        network (bool): Whether requests reach the network; servers are only
+            probed for transports that do.
+
+    """
+
+    name = None
+    network = True
+
+    def request(self, **kwargs):
+        """Send a request; accepts the arguments of ``requests.Session.request``.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+        """
+        raise NotImplementedError
+
+    def resize(self, pool_size):
+        """Allow at least ``pool_size`` concurrent requests per host."""
+
+    def close(self):
+        """Close all connections."""
+
+
+class RequestsTransport(Transport):
+    """HTTP/1.1 transport backed by a pooled ``requests`` session.
+
+    Attributes:
+        session (requests.Session): The session requests are sent through.
+        pool_size (int): Connections kept open per host.
+
+    """
+
+    name = "http1"
+
+    def __init__(self, session, pool_size):
+        """Initialize the transport and size the session's connection pool."""
+        self.session = session
+        self.resize(pool_size)
+
+    def request(self, **kwargs):
+        """Send a request through the session."""
+        return self.session.request(**kwargs)
+
+    def resize(self, pool_size):
+        """Mount a connection pool sized for ``pool_size`` concurrent requests."""
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pool_size = pool_size
+
+    def close(self):
+        """Close the session's connections."""
+        self.session.close()
+
+
+class HTTP2Transport(Transport):
+    """HTTP/2 transport backed by ``httpx``.
+
+    Concurrent requests to the same host share one connection. With
+    ``prior_knowledge`` HTTP/2 is spoken over cleartext connections as well
+    (``h2c``, for gateways and sidecars that support it); otherwise HTTP/2 is
+    negotiated over TLS and other servers are talked to with HTTP/1.1.
+
+    Attributes:
+        headers (dict): Headers sent with every request.
+        pool_size (int): Maximum number of connections kept open.
+
+    """
+
+    name = "http2"
+
+    def __init__(self, pool_size, headers=None, prior_knowledge=False):
+        """Initialize the transport.
+
+        Raises:
+            ImportError: If ``httpx`` or ``h2`` is not installed.
+        """
+        try:
+            import h2  # noqa: F401
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "The HTTP/2 transport requires the 'http2' extra: "
+                "pip install openapi-cli-generator[http2]"
+            ) from e
+
+        self._httpx = httpx
+        self.name = "h2c" if prior_knowledge else "http2"
+        self.headers = dict(headers or {})
+        self.pool_size = pool_size
+        self._client = httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            headers=self.headers,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+            timeout=None,
+        )
+
+    def request(
+        self,
+        method,
+        url,
+        params=None,
+        json=None,
+        data=None,
+        headers=None,
+        cookies=None,
+        stream=False,
+        timeout=None,
+    ):
+        """Send a request over a shared HTTP/2 connection."""
+        if hasattr(data, "read"):
+            data = iter_file(data)
+        request = self._client.build_request(
+            method,
+            url,
+            params=params,
+            json=json,
+            content=data,
+            headers=headers,
+            cookies=cookies,
+            timeout=timeout,
+        )
+        with _translate_errors(self._httpx):
+            response = HTTPXResponse(self._client.send(request, stream=True), self)
+        if not stream:
+            response._read()
+        return response
+
+    def resize(self, pool_size):
+        """Keep the pool as is; HTTP/2 streams do not need extra connections."""
+
+    def close(self):
+        """Close the client's connections."""
+        self._client.close()
+
+
+class HTTPXResponse:
+    """Adapt an ``httpx.Response`` to the ``requests.Response`` interface.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        headers (Mapping): The response headers.
+        url (str): The final request URL.
+        http_version (str): The protocol version, e.g. ``HTTP/2``.
+
+    """
+
+    request = None
+
+    def __init__(self, response, transport):
+        """Wrap a streamed ``httpx`` response."""
+        self._response = response
+        self._httpx = transport._httpx
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.reason = response.reason_phrase
+        self.http_version = response.http_version
+
+    def iter_content(self, chunk_size=CHUNK_SIZE):
+        """Yield the decoded body in chunks."""
+        with _translate_errors(self._httpx):
+            yield from self._response.iter_bytes(chunk_size)
+
+    def _read(self):
+        """Read the rest of the body."""
+        with _translate_errors(self._httpx):
+            return self._response.read()
+
+    @property
+    def content(self):
+        """Return the whole decoded body."""
+        return self._read()
+
+    @property
+    def text(self):
+        """Return the body decoded as text."""
+        self._read()
+        return self._response.text
+
+    def json(self):
+        """Return the body decoded as JSON."""
+        self._read()
+        return self._response.json()
+
+    def raise_for_status(self):
+        """Raise ``requests.exceptions.HTTPError`` for 4xx and 5xx responses."""
+        if 400 <= self.status_code < 600:
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}",
+                response=self,
+            )
+
+    def close(self):
+        """Release the stream back to the connection."""
+        self._response.close()
+
+
+@contextmanager
+def _translate_errors(httpx):
+    """Re-raise ``httpx`` errors as the matching ``requests`` exceptions."""
+    try:
+        yield
+    except httpx.ConnectTimeout as e:
+        raise requests.exceptions.ConnectTimeout(str(e)) from e
+    except httpx.ConnectError as e:
+        raise ConnectError(str(e)) from e
+    except httpx.NetworkError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+    except httpx.TimeoutException as e:
+        raise requests.exceptions.Timeout(str(e)) from e
+    except httpx.DecodingError as e:
+        raise requests.exceptions.ContentDecodingError(str(e)) from e
+    except httpx.HTTPError as e:
+        raise requests.exceptions.RequestException(str(e)) from e
+
+
+def create_transport(name, session, pool_size):
+    """Create a transport by name.
+
+    Args:
+        name (str): One of ``TRANSPORTS``.
+        session (requests.Session): Session used by the HTTP/1.1 transport;
+            its default headers are also sent by the HTTP/2 transports.
+        pool_size (int): Connections kept open per host.
+
+    Raises:
+        ValueError: If the transport name is unknown.
+    """
+    if name == "http1":
+        return RequestsTransport(session, pool_size)
+    if name in ("http2", "h2c"):
+        return HTTP2Transport(
+            pool_size,
+            headers={"Accept-Encoding": session.headers["Accept-Encoding"]},
+            prior_knowledge=name == "h2c",
+        )
+    raise ValueError(
+        f"Unknown transport '{name}'; choose one of: {', '.join(TRANSPORTS)}"
+    )
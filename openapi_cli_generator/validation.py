@@ -0,0 +1,283 @@
+"""Chunked, parallel validation of OpenAPI specs.
+
+``openapi_spec_validator.validate`` checks a whole document in one pass and
+stops at the first error. This module splits a spec into chunks of path
+items and component entries, each validated as a small document holding only
+the components its chunk references, so chunks can be validated on a process
+pool and every error is reported with its JSON pointer.
+
+Errors are located by the validator's JSON path where it reports one from the
+document root; other (semantic) errors are located by validating the entries of the failing chunk
+one at a time. An error in a shared component may also be reported at the
+paths that reference it. Operation IDs are checked for uniqueness across the
+whole spec in one pass, instead of against a growing list per operation.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from openapi_spec_validator.shortcuts import get_validator_cls
+from openapi_spec_validator.validation.exceptions import (
+    DuplicateOperationIDError,
+    ValidatorDetectError,
+)
+
+DEFAULT_CHUNK_SIZE = 64
+# Errors listed in the message of a failed validation
+MAX_REPORTED_ERRORS = 20
+
+_COMPONENT_REF = "#/components/"
+
+# The spec being validated, set in each worker process
+_spec = None
+
+
+class SpecError:
+    """A validation error and where it occurred.
+
+    Attributes:
+        pointer (str): JSON pointer to the invalid part of the spec.
+        message (str): What is wrong with it.
+
+    """
+
+    def __init__(self, pointer, message):
+        """Initialize the error."""
+        self.pointer = pointer
+        self.message = message
+
+    def __eq__(self, other):
+        """Compare errors by location and message."""
+        return (self.pointer, self.message) == (other.pointer, other.message)
+
+    def __hash__(self):
+        """Hash errors by location and message."""
+        return hash((self.pointer, self.message))
+
+    def __repr__(self):
+        """Return a debugging representation."""
+        return f"SpecError({self.pointer!r}, {self.message!r})"
+
+    def __str__(self):
+        """Return the error as ``pointer: message``."""
+        return f"{self.pointer or '/'}: {self.message}"
+
+
+def json_pointer(parts):
+    """Return the JSON pointer (RFC 6901) of a sequence of keys."""
+    return "".join(
+        "/" + str(part).replace("~", "~0").replace("/", "~1") for part in parts
+    )
+
+
+def format_errors(errors, limit=MAX_REPORTED_ERRORS):
+    """Format errors as one message, listing at most ``limit`` of them."""
+    if len(errors) == 1:
+        return str(errors[0])
+    lines = [f"{len(errors)} errors"]
+    lines.extend(f"  {error}" for error in errors[:limit])
+    if len(errors) > limit:
+        lines.append(f"  ... and {len(errors) - limit} more")
+    return "\n".join(lines)
+
+
+def validate_spec(spec, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Validate a spec and return all errors.
+
+    Args:
+        spec (dict): The decoded spec.
+        workers (int): Processes to validate chunks on; 1 validates them in
+            this process, None uses one per CPU.
+        chunk_size (int): Path items or component entries per chunk.
+
+    Returns:
+        list: ``SpecError`` objects; empty if the spec is valid.
+    """
+    errors = _check_structure(spec)
+    if errors:
+        return errors
+    if "webhooks" in spec or not _references_are_local(spec):
+        # Chunks cannot resolve references into paths or other documents
+        return _errors(spec, "") + _duplicate_operation_ids(spec)
+    errors = _duplicate_operation_ids(spec)
+
+    chunks = _chunks(spec, chunk_size)
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        _init_worker(spec)
+        try:
+            results = [_validate_chunk(chunk) for chunk in chunks]
+        finally:
+            _init_worker(None)
+    else:
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(spec,)
+        ) as executor:
+            results = list(executor.map(_validate_chunk, chunks))
+
+    seen = set()
+    for result in results:
+        for pointer, message in result:
+            error = SpecError(pointer, message)
+            if error not in seen:
+                seen.add(error)
+                errors.append(error)
+    return errors
+
+
+def _check_structure(spec):
+    """Validate everything but the contents of paths and components."""
+    if not isinstance(spec, dict):
+        return [SpecError("", "the spec must be an object")]
+    try:
+        get_validator_cls(spec)
+    except ValidatorDetectError as e:
+        return [SpecError("", str(e))]
+    for key in ("paths", "components"):
+        if not isinstance(spec.get(key, {}), dict):
+            return [SpecError(json_pointer([key]), f"{key} must be an object")]
+    for section, entries in spec.get("components", {}).items():
+        if not isinstance(entries, dict):
+            return [
+                SpecError(json_pointer(["components", section]), "must be an object")
+            ]
+    skeleton = dict(spec, paths={}) if "paths" in spec else dict(spec)
+    skeleton.pop("components", None)
+    return _errors(skeleton, "")
+
+
+def _duplicate_operation_ids(spec):
+    """Report operations whose ``operationId`` was used before."""
+    errors = []
+    seen = set()
+    for path, path_item in spec.get("paths", {}).items():
+        if not isinstance(path_item, dict):
+            continue
+        for method, operation in path_item.items():
+            if not isinstance(operation, dict) or "operationId" not in operation:
+                continue
+            operation_id = operation["operationId"]
+            if operation_id in seen:
+                errors.append(
+                    SpecError(
+                        json_pointer(["paths", path, method, "operationId"]),
+                        f"Operation ID '{operation_id}' for '{method}' in "
+                        f"'{path}' is not unique",
+                    )
+                )
+            seen.add(operation_id)
+    return errors
+
+
+def _references_are_local(node):
+    """Check that every ``$ref`` points into the spec's components."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and not ref.startswith(_COMPONENT_REF):
+                return False
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return True
+
+
+def _chunks(spec, chunk_size):
+    """Split the paths and components of a spec into lists of keys."""
+    entries = [("paths", path) for path in spec.get("paths", {})]
+    for section, items in spec.get("components", {}).items():
+        entries.extend(("components", section, name) for name in items)
+    chunks = []
+    for start in range(0, len(entries), chunk_size):
+        end = start + chunk_size
+        chunks.append(entries[start:end])
+    return chunks
+
+
+def _init_worker(spec):
+    """Make the spec available to ``_validate_chunk``."""
+    global _spec
+    _spec = spec
+
+
+def _validate_chunk(keys):
+    """Validate a chunk of path items and component entries.
+
+    Returns:
+        list: ``(pointer, message)`` tuples.
+    """
+    document = _document(_spec, keys)
+    location = json_pointer(keys[0]) if len(keys) == 1 else None
+    errors = _errors(document, location)
+    if any(error.pointer is None for error in errors):
+        # Locate errors without a path by validating entries one by one
+        located = [e for e in errors if e.pointer is not None]
+        for key in keys:
+            located.extend(_errors(_document(_spec, [key]), json_pointer(key)))
+        errors = located
+    return [(error.pointer, error.message) for error in errors]
+
+
+def _document(spec, keys):
+    """Build a spec holding the given entries and the components they use."""
+    document = {
+        key: value for key, value in spec.items() if key not in ("paths", "components")
+    }
+    document["paths"] = {}
+    components = {}
+    pending = []
+    for key in keys:
+        if key[0] == "paths":
+            document["paths"][key[1]] = spec["paths"][key[1]]
+        else:
+            pending.append(key)
+    stack = [document["paths"]]
+    while pending or stack:
+        while pending:
+            _, section, name = pending.pop()
+            entries = components.setdefault(section, {})
+            if name not in entries:
+                value = spec["components"].get(section, {}).get(name)
+                if value is None:
+                    continue
+                entries[name] = value
+                stack.append(value)
+        if stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                ref = node.get("$ref")
+                if isinstance(ref, str) and ref.startswith(_COMPONENT_REF):
+                    parts = ref.split("/")
+                    if len(parts) == 4:
+                        name = parts[3].replace("~1", "/").replace("~0", "~")
+                        pending.append(("components", parts[2], name))
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+    if components or "components" in spec:
+        document["components"] = components
+    return document
+
+
+def _errors(document, location):
+    """Validate a document; errors without a JSON path get ``location``."""
+    validator = get_validator_cls(document)(document)
+    errors = []
+    try:
+        for error in validator.iter_errors():
+            if isinstance(error, DuplicateOperationIDError):
+                # Checked across the whole spec by _duplicate_operation_ids
+                continue
+            path = list(error.absolute_path)
+            # Semantic checks report paths relative to the node they check
+            pointer = json_pointer(path) if path and path[0] in document else location
+            errors.append(SpecError(pointer, error.message))
+    except Exception as e:
+        # The semantic checks assume a structurally valid document. Within a
+        # chunk, this hides errors of other entries, so report it unlocated
+        # to have the entries validated one by one.
+        if location is None or not errors:
+            errors.append(SpecError(location, f"cannot be validated: {e!r}"))
+    return errors
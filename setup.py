@@ -26,6 +26,13 @@ setup(
         "coverage>=7.2.0",
     ],
     extras_require={
+        "compression": [
+            "brotli>=1.1.0",
+            "zstandard>=0.22.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
         "test": [
             "pytest>=8.3.4",
             "pytest-mock>=3.14.0",
@@ -1,7 +1,10 @@
 """Test fixtures for the OpenAPI CLI generator."""
 
+import io
 import json
 import os
+import threading
+from http.server import ThreadingHTTPServer
 
 import pytest
 
@@ -43,8 +46,56 @@ def mock_response():
         def json(self):
             return self.json_data
 
+        def iter_content(self, chunk_size=1):
+            content = self.text.encode()
+            for start in range(0, len(content), chunk_size):
+                end = start + chunk_size
+                yield content[start:end]
+
+        def close(self):
+            pass
+
         def raise_for_status(self):
             if self.status_code >= 400:
                 raise Exception(f"HTTP Error: {self.status_code}")
 
     return MockResponse
+
+
+@pytest.fixture
+def chunked():
+    """Return a function splitting bytes into chunks of a given size."""
+
+    def chunked(data, size):
+        stream = io.BytesIO(data)
+        return list(iter(lambda: stream.read(size), b""))
+
+    return chunked
+
+
+@pytest.fixture
+def http_server():
+    """Return a function running a local HTTP/1.1 server for a handler class.
+
+    The servers have a ``url`` attribute and are shut down after the test.
+    Request logging is turned off.
+    """
+    servers = []
+
+    def http_server(handler):
+        quiet = type(
+            handler.__name__,
+            (handler,),
+            {"protocol_version": "HTTP/1.1", "log_message": lambda *args: None},
+        )
+        server = ThreadingHTTPServer(("127.0.0.1", 0), quiet)
+        host, port = server.server_address
+        server.url = f"http://{host}:{port}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield http_server
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,138 @@
+"""Fixtures for end-to-end tests against a recorded fleet API."""
+
+import base64
+import json
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from openapi_cli_generator.cassette import Cassette
+from openapi_cli_generator.generator import CLIGenerator
+
+DRIVERS = [
+    {"id": 1, "Name": "Ada", "CurrentDispatcher": "north"},
+    {"id": 2, "Name": "Grace", "CurrentDispatcher": "south"},
+]
+# A request body the sample spec's DriverCreate schema accepts
+NEW_DRIVER = {
+    "Address": {"City": "Helsinki"},
+    "Name": "Linus",
+    "PhoneNumber": "555-0100",
+    "CurrentDispatcher": "north",
+    "FlatRatePerDay": 120.0,
+    "StandardRatePerKm": 0.5,
+}
+# The only access token the stand-in API accepts
+ACCESS_TOKEN = "fleet-token"
+
+# Commands recorded into the cassette, as run by the generated CLI
+RECORDED_COMMANDS = [
+    ["hr", "drivers", "get"],
+    ["hr", "drivers", "get", "--limit", "1"],
+    ["hr", "drivers", "list", "1"],
+    ["hr", "drivers", "list", "2"],
+    ["hr", "drivers", "list", "404"],
+    ["hr", "drivers", "create", "--data", json.dumps(NEW_DRIVER)],
+]
+
+
+class FleetHandler(BaseHTTPRequestHandler):
+    """A minimal stand-in for the fleet API of ``tests/openapi.json``."""
+
+    # Client IDs of the access tokens issued, in order
+    issued_tokens = []
+
+    def _respond(self, status, document):
+        body = json.dumps(document).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        """Reject requests with an access token that was not issued."""
+        authorization = self.headers.get("Authorization")
+        if authorization is None or authorization == f"Bearer {ACCESS_TOKEN}":
+            return True
+        self._respond(401, {"detail": "Invalid token"})
+        return False
+
+    def do_GET(self):  # noqa: N802
+        """List drivers or read one."""
+        if not self._authorized():
+            return
+        path, _, query = self.path.partition("?")
+        if path == "/hr/drivers/":
+            limit = dict(p.split("=") for p in query.split("&") if p).get("limit")
+            self._respond(200, DRIVERS[: int(limit)] if limit else DRIVERS)
+            return
+        driver_id = path.rsplit("/", 1)[-1]
+        for driver in DRIVERS:
+            if str(driver["id"]) == driver_id:
+                self._respond(200, driver)
+                return
+        self._respond(404, {"detail": "Driver not found"})
+
+    def do_POST(self):  # noqa: N802
+        """Create a driver, or issue an access token."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == "/oauth/token":
+            client_id, _ = base64.b64decode(self.headers["Authorization"][6:]).split(
+                b":"
+            )
+            self.issued_tokens.append(client_id.decode())
+            self._respond(200, {"access_token": ACCESS_TOKEN, "expires_in": 3600})
+            return
+        if not self._authorized():
+            return
+        document = json.loads(body)
+        self._respond(200, dict(document, id=len(DRIVERS) + 1))
+
+
+@pytest.fixture
+def drivers():
+    """Return the drivers the stand-in API serves."""
+    return DRIVERS
+
+
+@pytest.fixture
+def new_driver():
+    """Return the body of the recorded driver creation."""
+    return dict(NEW_DRIVER)
+
+
+@pytest.fixture
+def issued_tokens():
+    """Return the client IDs the stand-in API issues access tokens to."""
+    FleetHandler.issued_tokens.clear()
+    return FleetHandler.issued_tokens
+
+
+@pytest.fixture
+def fleet_url(http_server):
+    """Run the stand-in fleet API and return its base URL."""
+    return http_server(FleetHandler).url
+
+
+@pytest.fixture
+def fleet_spec(sample_openapi_spec):
+    """Return the sample spec pointing at a server that never exists."""
+    return dict(sample_openapi_spec, servers=[{"url": "http://fleet.invalid"}])
+
+
+@pytest.fixture
+def cassette_path(tmp_path, fleet_url, sample_openapi_spec, capsys):
+    """Record ``RECORDED_COMMANDS`` against the stand-in API into a cassette."""
+    path = tmp_path / "fleet.cassette.json"
+    spec = dict(sample_openapi_spec, servers=[{"url": fleet_url}])
+    generator = CLIGenerator(spec, cassette=Cassette(path, mode="record"))
+    generator.generate_cli()
+    for command in RECORDED_COMMANDS:
+        try:
+            generator.execute(command)
+        except SystemExit:
+            pass
+    generator.close()
+    capsys.readouterr()
+    return path
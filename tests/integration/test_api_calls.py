@@ -0,0 +1,166 @@
+"""End-to-end tests of API calls replayed from a cassette."""
+
+import json
+from pathlib import Path
+
+import pytest
+import requests
+
+from openapi_cli_generator.cassette import Cassette, request_key
+from openapi_cli_generator.generator import CLIGenerator
+
+
+@pytest.fixture
+def replay(fleet_spec, cassette_path):
+    """Return a generator replaying the recorded cassette."""
+    generator = CLIGenerator(fleet_spec, cassette=Cassette(cassette_path))
+    generator.generate_cli()
+    yield generator
+    generator.close()
+
+
+def test_recorded_cassette(cassette_path):
+    """Test that the cassette is compact and stores repeated bodies once."""
+    cassette = Cassette(cassette_path)
+    assert len(cassette) == 6
+    document = json.loads(cassette_path.read_text())
+    assert "\n" not in cassette_path.read_text()
+    assert len(document["bodies"]) == 6
+    assert request_key("GET", "http://fleet.invalid/hr/drivers/1") in document["index"]
+
+
+def test_api_request_execution(replay, drivers, new_driver, capsys):
+    """Test running commands without a live API."""
+    replay.execute(["hr", "drivers", "list", "2"])
+    assert json.loads(capsys.readouterr().out) == drivers[1]
+
+    replay.execute(["hr", "drivers", "create", "--data", json.dumps(new_driver)])
+    assert json.loads(capsys.readouterr().out) == dict(new_driver, id=3)
+
+    other_driver = dict(new_driver, Name="Ken")
+    with pytest.raises(SystemExit):
+        replay.execute(["hr", "drivers", "create", "--data", json.dumps(other_driver)])
+    assert "No recorded response for POST /hr/drivers/" in capsys.readouterr().out
+
+
+def test_authentication(
+    fleet_url, fleet_spec, issued_tokens, tmp_path, monkeypatch, capsys
+):
+    """Test OAuth2 client credentials shared between runs and replayed offline."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    spec = dict(fleet_spec, security=[{"oauth": []}])
+    spec["components"] = dict(
+        spec["components"],
+        securitySchemes={
+            "oauth": {
+                "type": "oauth2",
+                "flows": {"clientCredentials": {"tokenUrl": "/oauth/token"}},
+            }
+        },
+    )
+    credentials = {"client_id": "fleet-cli", "client_secret": "s3cret"}
+    path = tmp_path / "auth.cassette.json"
+
+    for _ in range(2):
+        recorder = CLIGenerator(
+            dict(spec, servers=[{"url": fleet_url}]),
+            cassette=Cassette(path, mode="record"),
+            credentials=credentials,
+        )
+        recorder.generate_cli()
+        recorder.execute(["hr", "drivers", "list", "1"])
+        recorder.close()
+    assert issued_tokens == ["fleet-cli"]
+    # The cassette can be committed: the issued token is not recorded
+    assert "fleet-token" not in path.read_text()
+    assert "REDACTED" in path.read_text()
+
+    # A token the API rejects is dropped, so the next run fetches a new one
+    token_file = next((tmp_path / "home").glob(".openapi_cli_generator/tokens/*.json"))
+    token_file.write_text(json.dumps({"access_token": "stale", "refresh_at": 2e9}))
+    recorder = CLIGenerator(
+        dict(spec, servers=[{"url": fleet_url}]), credentials=credentials
+    )
+    with pytest.raises(requests.exceptions.HTTPError):
+        recorder.client().hr.drivers.list(driver_id=1)
+    assert not token_file.exists()
+    assert recorder.client().hr.drivers.list(driver_id=1)["Name"] == "Ada"
+    recorder.close()
+    assert issued_tokens == ["fleet-cli", "fleet-cli"]
+    capsys.readouterr()
+
+    # The token request is replayed along with the API calls
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "offline")
+    replay = CLIGenerator(spec, cassette=Cassette(path), credentials=credentials)
+    replay.generate_cli()
+    replay.execute(["hr", "drivers", "list", "1"])
+    assert json.loads(capsys.readouterr().out)["Name"] == "Ada"
+    replay.close()
+
+
+def test_query_api_keys_are_redacted(fleet_url, fleet_spec, tmp_path, capsys):
+    """Test that API keys sent in the query string are not recorded."""
+    spec = dict(fleet_spec, security=[{"key": []}])
+    spec["components"] = dict(
+        spec["components"],
+        securitySchemes={"key": {"type": "apiKey", "in": "query", "name": "api_key"}},
+    )
+    path = tmp_path / "key.cassette.json"
+    recorder = CLIGenerator(
+        dict(spec, servers=[{"url": fleet_url}]),
+        cassette=Cassette(path, mode="record"),
+        credentials={"api_key": "s3cret"},
+    )
+    recorder.generate_cli()
+    recorder.execute(["hr", "drivers", "get", "--limit", "1"])
+    recorder.close()
+    assert "s3cret" not in path.read_text()
+    index = json.loads(path.read_text())["index"]
+    assert list(index) == ["GET /hr/drivers/?api_key=REDACTED&limit=1"]
+    capsys.readouterr()
+
+    # Requests match the recording whatever key they carry
+    replay = CLIGenerator(
+        spec, cassette=Cassette(path), credentials={"api_key": "other"}
+    )
+    replay.generate_cli()
+    replay.execute(["hr", "drivers", "get", "--limit", "1"])
+    assert json.loads(capsys.readouterr().out)[0]["Name"] == "Ada"
+
+
+def test_response_processing(replay, drivers, capsys):
+    """Test output formats, queries and error statuses on replayed responses."""
+    replay.execute(["hr", "drivers", "get", "-o", "csv", "--query", "id,Name"])
+    assert capsys.readouterr().out.splitlines() == ["id,Name", "1,Ada", "2,Grace"]
+
+    replay.execute(["hr", "drivers", "get", "--limit", "1", "-o", "ndjson"])
+    assert json.loads(capsys.readouterr().out) == drivers[0]
+
+    client = replay.client()
+    assert client.hr.drivers.list(driver_id=1) == drivers[0]
+    with pytest.raises(requests.exceptions.HTTPError) as error:
+        client.hr.drivers.list(driver_id=404)
+    assert error.value.response.json() == {"detail": "Driver not found"}
+
+
+def test_fan_out_and_bench_replay(replay, drivers, capsys):
+    """Test concurrent replays and benchmarking without server variance."""
+    replay.execute(["hr", "drivers", "list", "1", "2", "--ordered", "-o", "ndjson"])
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == drivers
+
+    result = replay.bench(
+        ["hr", "drivers", "list", "1", "2"], duration=0.5, concurrency=4
+    )
+    assert result.errors == {}
+    assert result.throughput > 500
+
+
+def test_injected_latency(fleet_spec, cassette_path):
+    """Test that replayed responses wait for the injected latency."""
+    generator = CLIGenerator(fleet_spec, cassette=Cassette(cassette_path, latency=0.05))
+    generator.generate_cli()
+    result = generator.bench(
+        ["hr", "drivers", "list", "1"], duration=0.3, concurrency=2
+    )
+    assert result.latency.min >= 50000
@@ -0,0 +1,95 @@
+"""End-to-end tests of the CLI entry point replaying a cassette."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from openapi_cli_generator import cli
+from openapi_cli_generator.config import Config
+from openapi_cli_generator.spec_cache import SpecCache
+
+SPEC_URL = "http://fleet.invalid/api"
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch, fleet_spec, cassette_path, capsys):
+    """Return a function running the CLI with a replaying ``fleet`` alias."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    config = Config()
+    config.add_alias("fleet", SPEC_URL)
+    config.set_alias_option("fleet", "cassette", str(cassette_path))
+    SpecCache().put(SPEC_URL, fleet_spec)
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", ["openapi-cli-generator", *args])
+        code = 0
+        try:
+            cli.main()
+        except SystemExit as e:
+            code = e.code or 0
+        captured = capsys.readouterr()
+        return code, captured.out, captured.err
+
+    return run
+
+
+def test_cli_commands(run, drivers):
+    """Test running API commands through an alias."""
+    code, out, _ = run("fleet", "hr", "drivers", "list", "1")
+    assert code == 0
+    assert json.loads(out) == drivers[0]
+
+    code, out, _ = run("fleet", "hr", "drivers", "get", "-o", "table")
+    assert code == 0
+    assert "Grace" in out
+
+    code, out, _ = run(
+        "bench", "-d", "0.2", "-c", "2", "--json", "fleet", "hr", "drivers", "list", "2"
+    )
+    assert code == 0
+    stats = json.loads(out)
+    assert stats["requests"] > 0
+    assert stats["errors"] == {}
+
+
+def test_help_system(run):
+    """Test help for resources and actions."""
+    code, out, _ = run("fleet", "hr", "drivers", "--help")
+    assert code == 0
+    assert "{create,get,list,update,delete}" in out
+
+    code, out, _ = run("fleet", "hr", "drivers", "get", "--help")
+    assert "--limit" in out
+
+
+def test_error_messages(run):
+    """Test failures surfacing as messages and exit codes."""
+    code, out, _ = run("fleet", "hr", "drivers", "list", "404")
+    assert code == 1
+    assert "404 Client Error" in out
+
+    code, out, _ = run("fleet", "hr", "drivers", "list", "3")
+    assert code == 1
+    assert "No recorded response for GET /hr/drivers/3" in out
+
+    code, _, err = run("fleet", "hr", "drivers", "list", "--bogus")
+    assert code == 2
+    assert "unrecognized arguments: --bogus" in err
+
+
+def test_refresh_spec(run, fleet_spec, monkeypatch):
+    """Test that --refresh-spec drops the cached spec before loading it."""
+    SpecCache().put(SPEC_URL, {**fleet_spec, "paths": {}})
+    loaded = []
+
+    def parse_for_command(self, args):
+        loaded.append((self.cache.get(SPEC_URL), args))
+        return fleet_spec
+
+    monkeypatch.setattr(cli.OpenAPIParser, "parse_for_command", parse_for_command)
+    code, out, _ = run("fleet", "hr", "drivers", "list", "1", "--refresh-spec")
+    assert code == 0
+    assert json.loads(out)["id"] == 1
+    assert loaded == [(None, ["hr", "drivers", "list", "1"])]
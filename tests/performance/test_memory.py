@@ -0,0 +1,92 @@
+"""Memory budgets for spec handling.
+
+The budgets in ``memory_budgets.json`` apply to a synthetic spec of the given
+number of resources (or to a real spec given as ``"spec"``). Point the
+``OPENAPI_CLI_MEMORY_BUDGETS`` environment variable at another file to check
+larger specs or tighter limits.
+"""
+
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from openapi_cli_generator.encoding import CHUNK_SIZE
+from openapi_cli_generator.partial import PartialSpec
+from openapi_cli_generator.profiling import (
+    MemoryProfiler,
+    format_size,
+    profile_spec,
+    synthetic_spec,
+)
+
+BUDGETS_FILE = os.environ.get(
+    "OPENAPI_CLI_MEMORY_BUDGETS", Path(__file__).with_name("memory_budgets.json")
+)
+
+
+@pytest.fixture(scope="module")
+def config():
+    """Load the budget configuration."""
+    with open(BUDGETS_FILE) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def profiler(config):
+    """Profile all stages once for the configured spec."""
+    if "spec" in config:
+        with open(config["spec"], "rb") as f:
+            body = f.read()
+    else:
+        body = json.dumps(synthetic_spec(config["resources"])).encode()
+    return profile_spec(body, validate=config.get("validate", False))
+
+
+def test_memory_budgets(config, profiler):
+    """Test that no stage exceeds its memory budget."""
+    report = io.StringIO()
+    profiler.report(report)
+    assert profiler.check(config["budgets"]) == [], report.getvalue()
+
+
+def test_partial_loading_stays_below_full_decode():
+    """Test that partial loading needs a fraction of the memory of decoding.
+
+    Component text is kept undecoded until references are resolved, so the
+    peak grows with the spec, but far slower than a full ``json.loads``.
+    """
+    body = json.dumps(synthetic_spec(400)).encode()
+    stream = io.BytesIO(body)
+    profiler = MemoryProfiler(top=0)
+    with profiler.stage("partial"):
+        PartialSpec(iter(lambda: stream.read(CHUNK_SIZE), b""), ["group3", "resource3"])
+    with profiler.stage("decode"):
+        json.loads(body)
+
+    partial, decode = profiler["partial"].peak, profiler["decode"].peak
+    assert partial < len(body)
+    assert partial < decode / 8, f"{format_size(partial)} vs {format_size(decode)}"
+
+
+def test_profiler_check_and_report():
+    """Test budget checks, hotspots and the report."""
+    profiler = MemoryProfiler(top=2)
+    with profiler.stage("allocate"):
+        data = [bytearray(1024) for _ in range(100)]
+
+    stats = profiler["allocate"]
+    assert stats.retained >= 100 * 1024
+    assert stats.peak >= stats.retained
+    assert Path(__file__).name in stats.hotspots[0][0]
+    assert profiler.check({"allocate": {"retained": 1 << 30}}) == []
+    assert profiler.check({"allocate": {"peak": 1024}}) == [
+        f"allocate: peak {format_size(stats.peak)} exceeds budget of 1.0 KiB"
+    ]
+
+    report = io.StringIO()
+    profiler.report(report)
+    assert report.getvalue().splitlines()[1].startswith("allocate")
+    del data
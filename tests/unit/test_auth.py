@@ -0,0 +1,194 @@
+"""Test cases for authentication and the shared token cache."""
+
+import copy
+import multiprocessing
+import time
+
+import pytest
+import requests
+
+from openapi_cli_generator import auth
+from openapi_cli_generator.auth import TokenCache, credentials_from_options
+from openapi_cli_generator.generator import CLIGenerator
+
+SCHEMES = {
+    "key": {"type": "apiKey", "in": "header", "name": "X-API-Key"},
+    "query_key": {"type": "apiKey", "in": "query", "name": "api_key"},
+    "bearer": {"type": "http", "scheme": "bearer"},
+    "oauth": {
+        "type": "oauth2",
+        "flows": {
+            "clientCredentials": {"tokenUrl": "/oauth/token", "scopes": {"hr": ""}}
+        },
+    },
+}
+EMPLOYEE = "/hr/employees/{employee_id}"
+
+
+@pytest.fixture
+def secured_spec(sample_openapi_spec):
+    """Return the sample spec requiring OAuth2 or an API key, except for drivers."""
+    spec = dict(
+        sample_openapi_spec,
+        servers=[{"url": "http://localhost:8000"}],
+        security=[{"oauth": ["hr"]}, {"key": []}],
+    )
+    schemes = copy.deepcopy(SCHEMES)
+    spec["components"] = dict(spec["components"], securitySchemes=schemes)
+    drivers = dict(spec["paths"]["/hr/drivers/"])
+    drivers["get"] = dict(drivers["get"], security=[{}, {"query_key": []}])
+    spec["paths"] = dict(spec["paths"], **{"/hr/drivers/": drivers})
+    return spec
+
+
+@pytest.fixture
+def api(secured_spec, mock_response, monkeypatch, tmp_path):
+    """Return a function creating generators that record their requests."""
+    monkeypatch.setattr(auth.Path, "home", lambda: tmp_path)
+    calls = []
+    tokens = iter(f"token-{n}" for n in range(1, 100))
+
+    def mock_request(**kwargs):
+        calls.append(kwargs)
+        if kwargs["url"].endswith("/oauth/token"):
+            return mock_response({"access_token": next(tokens), "expires_in": 3600})
+        if kwargs["headers"].get("Authorization") == "Bearer revoked":
+            return mock_response({"detail": "expired"}, status_code=401)
+        return mock_response({})
+
+    def create(**credentials):
+        generator = CLIGenerator(secured_spec, credentials=credentials)
+        monkeypatch.setattr(generator.session, "request", mock_request)
+        return generator
+
+    create.calls = calls
+    return create
+
+
+def test_api_keys_and_bearer_tokens(api):
+    """Test placing credentials as the security requirements describe."""
+    generator = api(api_key="secret")
+    generator._send_request("get", EMPLOYEE, {"employee_id": 1})
+    assert api.calls[-1]["headers"]["X-API-Key"] == "secret"
+    generator._send_request("get", "/hr/drivers/")
+    assert api.calls[-1]["params"]["api_key"] == "secret"
+    assert "X-API-Key" not in api.calls[-1]["headers"]
+
+    generator = api(bearer_token="abc", auth_scheme="bearer")
+    generator._send_request("get", EMPLOYEE, {"employee_id": 1})
+    assert "Authorization" not in api.calls[-1]["headers"]
+
+    generator = api(bearer_token="abc")
+    generator.spec["components"]["securitySchemes"]["oauth"]["flows"] = {}
+    generator._send_request("get", EMPLOYEE, {"employee_id": 1})
+    assert api.calls[-1]["headers"]["Authorization"] == "Bearer abc"
+
+
+def test_auth_scheme_for_undeclared_security(sample_openapi_spec, api, monkeypatch):
+    """Test applying a chosen scheme to a spec without requirements."""
+    monkeypatch.setenv("FLEET_TOKEN", "from-env")
+    spec = dict(sample_openapi_spec)
+    spec["components"] = dict(spec["components"], securitySchemes=SCHEMES)
+    generator = CLIGenerator(
+        spec, credentials={"bearer_token": "env:FLEET_TOKEN", "auth_scheme": "bearer"}
+    )
+    template = generator.prepare("get", EMPLOYEE)
+    headers = {}
+    generator.auth.apply(template, {}, headers, {})
+    assert headers == {"Authorization": "Bearer from-env"}
+
+    monkeypatch.delenv("FLEET_TOKEN")
+    with pytest.raises(ValueError, match="FLEET_TOKEN"):
+        CLIGenerator(spec, credentials={"bearer_token": "env:FLEET_TOKEN"})
+
+    options = {"api_key": "k", "transport": "http1", "oauth_scopes": ["hr"]}
+    assert credentials_from_options(options) == {"api_key": "k", "oauth_scopes": ["hr"]}
+    assert credentials_from_options({"pool_size": 4}) is None
+
+
+def test_client_credentials_token_reuse(api):
+    """Test that OAuth2 tokens are fetched once and shared between generators."""
+    credentials = {
+        "client_id": "cli",
+        "client_secret": "s3cret",
+        "oauth_scopes": ["hr"],
+    }
+    first = api(**credentials)
+    first._send_request("get", EMPLOYEE, {"employee_id": 1})
+    token_request, request = api.calls
+    assert token_request["method"] == "POST"
+    assert token_request["url"] == "http://localhost:8000/oauth/token"
+    assert token_request["data"] == b"grant_type=client_credentials&scope=hr"
+    assert token_request["headers"]["Authorization"] == "Basic Y2xpOnMzY3JldA=="
+    assert request["headers"]["Authorization"] == "Bearer token-1"
+
+    # A new process reads the token from disk instead of fetching another
+    second = api(**credentials)
+    second._send_request("get", EMPLOYEE, {"employee_id": 1})
+    assert len(api.calls) == 3
+    assert api.calls[-1]["headers"]["Authorization"] == "Bearer token-1"
+
+
+def test_rejected_token_is_refreshed(api, tmp_path):
+    """Test that a token the API rejects is fetched again on the next call."""
+    cache = TokenCache()
+    key = cache.key("http://localhost:8000/oauth/token", "cli", [])
+    cache.get(key, lambda: ("revoked", 3600))
+
+    generator = api(client_id="cli", client_secret="s3cret")
+    with pytest.raises(Exception, match="401"):
+        generator._send_request("get", EMPLOYEE, {"employee_id": 1})
+    assert not (tmp_path / ".openapi_cli_generator" / "tokens" / f"{key}.json").exists()
+    generator._send_request("get", EMPLOYEE, {"employee_id": 1})
+    assert api.calls[-1]["headers"]["Authorization"] == "Bearer token-1"
+
+
+def test_proactive_refresh(tmp_path, monkeypatch):
+    """Test refreshing tokens shortly before they expire."""
+    cache = TokenCache(tmp_path)
+    fetched = []
+
+    def fetch():
+        fetched.append(time.time())
+        return f"token-{len(fetched)}", 100
+
+    assert cache.get("k", fetch) == "token-1"
+    assert cache.get("k", fetch) == "token-1"
+    assert (tmp_path / "k.json").stat().st_mode & 0o777 == 0o600
+
+    # Within a minute of expiry, the token is replaced
+    now = time.time()
+    monkeypatch.setattr(auth.time, "time", lambda: now + 55)
+    assert TokenCache(tmp_path).get("k", fetch) == "token-2"
+
+    # A failed refresh keeps using the token while it is still valid
+    def fail():
+        raise requests.exceptions.ConnectionError("token endpoint down")
+
+    monkeypatch.setattr(auth.time, "time", lambda: now + 130)
+    assert TokenCache(tmp_path).get("k", fail) == "token-2"
+    monkeypatch.setattr(auth.time, "time", lambda: now + 200)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        TokenCache(tmp_path).get("k", fail)
+
+
+def _fetch_slowly(log_file):
+    """Request a token, logging the fetch; run in several processes at once."""
+    with open(log_file, "a") as f:
+        f.write("fetch\n")
+    time.sleep(0.2)
+    return "shared", 3600
+
+
+def _get_token(cache_dir, log_file):
+    """Get a token from the cache in a new process."""
+    return TokenCache(cache_dir).get("k", lambda: _fetch_slowly(log_file))
+
+
+def test_concurrent_processes_share_one_token(tmp_path):
+    """Test that concurrent processes wait for one fetch under the file lock."""
+    log_file = tmp_path / "fetches.log"
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        tokens = pool.starmap(_get_token, [(tmp_path / "tokens", log_file)] * 4)
+    assert tokens == ["shared"] * 4
+    assert log_file.read_text() == "fetch\n"
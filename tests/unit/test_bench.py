@@ -0,0 +1,147 @@
+"""Test cases for load generation."""
+
+import json
+import random
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from openapi_cli_generator.bench import LatencyHistogram, error_kind, run_load
+from openapi_cli_generator.generator import CLIGenerator
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answer every GET with a small JSON body; ``/pets/0`` fails with 500."""
+
+    def do_GET(self):  # noqa: N802
+        """Echo the request path."""
+        self.server.paths.append(self.path)
+        status = 500 if self.path.startswith("/pets/0") else 200
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def stand_in_server(http_server):
+    """Run a local HTTP server standing in for the API."""
+    server = http_server(StandInHandler)
+    server.paths = []
+    return server
+
+
+@pytest.fixture
+def generator(stand_in_server):
+    """Return a generator for a spec served by the stand-in server."""
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Pet API", "version": "1.0.0"},
+        "servers": [{"url": stand_in_server.url}],
+        "paths": {
+            "/pets/{pet_id}": {
+                "get": {
+                    "summary": "Get pet",
+                    "parameters": [
+                        {
+                            "name": "pet_id",
+                            "in": "path",
+                            "required": True,
+                            "schema": {"type": "integer"},
+                        },
+                        {"name": "fields", "in": "query", "schema": {"type": "string"}},
+                    ],
+                }
+            }
+        },
+    }
+    generator = CLIGenerator(spec)
+    generator.generate_cli()
+    return generator
+
+
+def test_histogram_percentiles():
+    """Test percentiles within the histogram's relative error."""
+    values = list(range(1, 100001))
+    random.Random(0).shuffle(values)
+    histogram = LatencyHistogram()
+    for value in values[:50000]:
+        histogram.record(value)
+    other = LatencyHistogram()
+    for value in values[50000:]:
+        other.record(value)
+    histogram.merge(other)
+
+    assert histogram.count == 100000
+    assert (histogram.min, histogram.max) == (1, 100000)
+    assert histogram.mean == pytest.approx(50000.5)
+    for percentile, expected in ((50, 50000), (90, 90000), (99.9, 99900)):
+        assert histogram.percentile(percentile) == pytest.approx(expected, rel=1e-3)
+    assert histogram.percentile(100) == 100000
+
+    small = LatencyHistogram()
+    for value in (3, 3, 7, 1500):
+        small.record(value)
+    assert [small.percentile(p) for p in (25, 50, 75, 100)] == [3, 3, 7, 1500]
+    assert LatencyHistogram().percentile(50) is None
+
+
+def test_run_load_closed_loop():
+    """Test back-to-back load from several workers with error counting."""
+    calls = []
+
+    def call():
+        calls.append(None)
+        if len(calls) % 4 == 0:
+            raise ValueError("boom")
+
+    result = run_load(call, duration=0.2, concurrency=3)
+    assert result.requests == len(calls) > 0
+    assert result.errors == {"ValueError": len(calls) // 4}
+    assert result.latency.count == result.requests
+    assert result.throughput > 0
+
+    with pytest.raises(ValueError):
+        run_load(call, duration=0.1, concurrency=0)
+
+
+def test_run_load_rate():
+    """Test that rate mode paces requests and never exceeds the target."""
+    result = run_load(lambda: None, duration=0.5, concurrency=2, rate=40)
+    assert 15 <= result.requests <= 20
+
+
+def test_error_kind():
+    """Test classifying failures by HTTP status or exception type."""
+    response = requests.Response()
+    response.status_code = 503
+    assert error_kind(requests.exceptions.HTTPError(response=response)) == "HTTP 503"
+    assert error_kind(requests.exceptions.ConnectionError()) == "ConnectionError"
+
+
+def test_bench_against_stand_in_server(generator, stand_in_server):
+    """Test benchmarking a spec operation end to end."""
+    result = generator.bench(
+        ["pets", "list", "1", "2", "--fields", "name"], duration=0.3, concurrency=4
+    )
+    assert result.requests > 0
+    assert result.errors == {}
+    assert set(stand_in_server.paths) == {"/pets/1?fields=name", "/pets/2?fields=name"}
+
+    stats = result.as_dict()
+    assert stats["requests"] == result.requests
+    assert set(stats["latency_ms"]["percentiles"]) == {
+        "p50",
+        "p75",
+        "p90",
+        "p99",
+        "p99.9",
+        "p100",
+    }
+    assert "Percentile" in result.report()
+
+    result = generator.bench(["pets", "list", "0"], duration=0.2, rate=50)
+    assert result.errors == {"HTTP 500": result.requests}
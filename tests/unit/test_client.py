@@ -0,0 +1,214 @@
+"""Test cases for the programmatic API client."""
+
+import asyncio
+import copy
+import inspect
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from openapi_cli_generator.client import bounded_map, python_name
+from openapi_cli_generator.generator import CLIGenerator
+
+
+@pytest.fixture
+def client(sample_openapi_spec, mock_response, monkeypatch):
+    """Return a client whose session records requests instead of sending them."""
+    generator = CLIGenerator(sample_openapi_spec)
+    calls = []
+
+    def mock_request(**kwargs):
+        calls.append(kwargs)
+        if kwargs["params"].get("skip") == "-1":
+            return mock_response({"detail": "bad skip"}, status_code=422)
+        return mock_response({"method": kwargs["method"], "params": kwargs["params"]})
+
+    monkeypatch.setattr(generator.session, "request", mock_request)
+    api = generator.client()
+    api.calls = calls
+    yield api
+    api.close()
+
+
+def test_client_tree(client):
+    """Test that resources and actions mirror the CLI command tree."""
+    assert client.hr.employees.create.method == "post"
+    assert client.hr.drivers.get.path == "/hr/drivers/"
+    assert (
+        client.financials.expense_tracking_and_reporting
+        is client.financials["expense-tracking-and-reporting"]
+    )
+    assert "employees" in dir(client.hr)
+
+    with pytest.raises(AttributeError):
+        client.hr.unknown
+
+
+def test_operation_signature(client):
+    """Test typed signatures derived from operation parameters."""
+    signature = inspect.signature(client.hr.drivers.get)
+    assert signature.parameters["skip"].annotation is int
+    assert signature.parameters["limit"].default is None
+    assert "data" in inspect.signature(client.hr.employees.create).parameters
+
+    with pytest.raises(TypeError):
+        client.hr.drivers.get(unknown=1)
+
+
+def test_sync_call(client):
+    """Test calling an operation with parameters and a request body."""
+    assert client.hr.drivers.get(skip=5) == {"method": "GET", "params": {"skip": "5"}}
+
+    employee = {"Address": {}, "Name": "Ann", "PhoneNumber": "555-0100"}
+    client.hr.employees.create(data=employee)
+    sent = client.calls[-1]
+    assert json.loads(sent["data"]) == employee
+    assert sent["headers"]["Content-Type"] == "application/json"
+
+    # Invalid arguments fail before anything is sent
+    with pytest.raises(ValueError, match="data: 'PhoneNumber' is a required"):
+        client.hr.employees.create(data={"Address": {}, "Name": "Ann"})
+    with pytest.raises(ValueError, match="skip: 'many' is not of type 'integer'"):
+        client.hr.drivers.get(skip="many")
+    assert client.calls[-1] is sent
+
+    with pytest.raises(Exception, match="422"):
+        client.hr.drivers.get(skip=-1)
+
+
+def test_parameter_named_data(sample_openapi_spec, mock_response, monkeypatch):
+    """Test that a parameter named data does not take the request body's name."""
+    spec = copy.deepcopy(sample_openapi_spec)
+    spec["paths"]["/hr/employees/"]["post"]["parameters"] = [
+        {"name": "data", "in": "query", "schema": {"type": "string"}}
+    ]
+    generator = CLIGenerator(spec)
+    calls = []
+    monkeypatch.setattr(
+        generator.session,
+        "request",
+        lambda **kwargs: calls.append(kwargs) or mock_response({}),
+    )
+    with generator.client() as api:
+        assert {"data", "data_"} <= set(
+            inspect.signature(api.hr.employees.create).parameters
+        )
+        employee = {"Address": {}, "Name": "Ann", "PhoneNumber": "555-0100"}
+        api.hr.employees.create(data=employee, data_="full")
+    assert calls[0]["params"] == {"data": "full"}
+    assert json.loads(calls[0]["data"]) == employee
+
+
+def test_path_parameters(client):
+    """Test that path parameters are placed into the URL."""
+    client.hr.drivers.list(driver_id=7)
+    sent = client.calls[-1]
+    assert sent["url"].endswith("/hr/drivers/7")
+    assert sent["params"] == {}
+
+    with pytest.raises(TypeError):
+        client.hr.drivers.list()
+
+
+def test_async_call(client):
+    """Test awaiting operations and the async bulk helper."""
+
+    async def run():
+        single = await client.hr.drivers.get.acall(limit=2)
+        many = await client.amap(
+            client.hr.drivers.get, [{"skip": i} for i in (1, -1, 3)], concurrency=2
+        )
+        return single, many
+
+    single, many = asyncio.run(run())
+    assert single["params"] == {"limit": "2"}
+    assert many[0]["params"] == {"skip": "1"}
+    assert isinstance(many[1], Exception)
+    assert many[2]["params"] == {"skip": "3"}
+
+    # Items are pulled as calls complete, not all up front
+    ahead = []
+
+    def items():
+        for i in range(20):
+            ahead.append(i - (len(client.calls) - 4))
+            yield {"skip": i}
+
+    many = asyncio.run(client.amap(client.hr.drivers.get, items(), concurrency=2))
+    assert [result["params"]["skip"] for result in many] == [str(i) for i in range(20)]
+    assert max(ahead) <= 2
+
+
+def test_bulk_calls_scale_to_concurrency(client, monkeypatch):
+    """Test that bulk helpers run as many calls as asked and size the pool."""
+    generator = client._generator
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+    request = generator.session.request
+
+    def slow_request(**kwargs):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return request(**kwargs)
+
+    monkeypatch.setattr(generator.session, "request", slow_request)
+    items = [{"skip": i} for i in range(32)]
+    asyncio.run(client.amap(client.hr.drivers.get, items, concurrency=32))
+    assert active["peak"] > 8
+    assert client.transport.pool_size == 32
+
+    list(client.hr.drivers.get.map(items, concurrency=40))
+    assert client.transport.pool_size == 40
+
+
+def test_map(client):
+    """Test the bulk helper returns per-item results and errors."""
+    items = [{"skip": i} for i in (1, -1, 3)]
+    results = list(client.hr.drivers.get.map(items, concurrency=2))
+
+    assert [item for item, _ in results] == items
+    assert results[0][1]["params"] == {"skip": "1"}
+    assert isinstance(results[1][1], Exception)
+
+
+def test_bounded_map_limits_concurrency():
+    """Test that bounded_map never exceeds the concurrency limit."""
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def work(item):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.01)
+        with lock:
+            active["now"] -= 1
+        if item == 3:
+            raise requests.exceptions.ConnectionError("down")
+        return item * 2
+
+    results = list(bounded_map(work, range(20), concurrency=4))
+    assert active["peak"] <= 4
+    assert [r for _, r in results if not isinstance(r, Exception)] == [
+        i * 2 for i in range(20) if i != 3
+    ]
+
+    unordered = dict(bounded_map(work, range(20), concurrency=4, ordered=False))
+    assert sorted(unordered) == list(range(20))
+
+    with pytest.raises(ValueError):
+        list(bounded_map(work, [], concurrency=0))
+
+
+def test_python_name():
+    """Test conversion of spec names into identifiers."""
+    assert python_name("expense-tracking") == "expense_tracking"
+    assert python_name("class") == "class_"
+    assert python_name("2fa") == "_2fa"
@@ -98,6 +98,64 @@ def test_update_alias(temp_config_dir, monkeypatch):
         config.update_alias("nonexistent", "http://example.com/api.json")
 
 
+def test_alias_options(temp_config_dir, monkeypatch):
+    """Test setting, validating and removing per-alias options."""
+    monkeypatch.setattr(Path, "home", lambda: temp_config_dir.parent)
+
+    config = Config()
+    config.add_alias("test", "http://example.com/api.json")
+    assert config.get_alias_options("test") == {}
+
+    config.set_alias_option("test", "transport", "http2")
+    config.set_alias_option("test", "pool_size", "4")
+    assert Config().get_alias_options("test") == {"transport": "http2", "pool_size": 4}
+
+    with pytest.raises(ValueError):
+        config.set_alias_option("test", "transport", "http3")
+    with pytest.raises(ValueError):
+        config.set_alias_option("test", "pool_size", "0")
+    with pytest.raises(ValueError):
+        config.set_alias_option("test", "color", "blue")
+    with pytest.raises(KeyError):
+        config.set_alias_option("nonexistent", "transport", "http2")
+
+    config.set_alias_option("test", "metrics_statsd", "localhost:8125")
+    assert config.get_alias_options("test")["metrics_statsd"] == ["localhost", 8125]
+    with pytest.raises(ValueError):
+        config.set_alias_option("test", "metrics_statsd", "localhost")
+    config.set_alias_option("test", "metrics_statsd", None)
+
+    config.set_alias_option("test", "validation_workers", "0")
+    assert config.get_alias_options("test")["validation_workers"] == 0
+    with pytest.raises(ValueError):
+        config.set_alias_option("test", "validation_workers", "-1")
+    config.set_alias_option("test", "validation_workers", None)
+
+    config.set_alias_option("test", "spec_ttl", "0")
+    assert config.get_alias_options("test")["spec_ttl"] == 0
+    with pytest.raises(ValueError):
+        config.set_alias_option("test", "spec_ttl", "-60")
+    config.set_alias_option("test", "spec_ttl", None)
+
+    config.set_alias_option("test", "oauth_scopes", "hr:read, fleet:read")
+    assert config.get_alias_options("test")["oauth_scopes"] == ["hr:read", "fleet:read"]
+    with pytest.raises(ValueError):
+        config.set_alias_option("test", "client_secret", "")
+    config.set_alias_option("test", "oauth_scopes", None)
+
+    config.set_alias_option("test", "validate_requests", "off")
+    assert config.get_alias_options("test")["validate_requests"] is False
+    with pytest.raises(ValueError):
+        config.set_alias_option("test", "validate_requests", "maybe")
+    config.set_alias_option("test", "validate_requests", None)
+
+    config.set_alias_option("test", "pool_size", None)
+    assert config.get_alias_options("test") == {"transport": "http2"}
+
+    config.remove_alias("test")
+    assert "test" not in config.config["alias_options"]
+
+
 def test_config_file_permissions(temp_config_dir, monkeypatch):
     """Test configuration file permissions and error handling."""
     monkeypatch.setattr(Path, "home", lambda: temp_config_dir.parent)
@@ -111,6 +169,24 @@ def test_config_file_permissions(temp_config_dir, monkeypatch):
         config.add_alias("test2", "http://example.com/api2.json")
 
 
+def test_credentials_are_private(temp_config_dir, monkeypatch):
+    """Test that the config and its backup are owner-only while holding secrets."""
+    monkeypatch.setattr(Path, "home", lambda: temp_config_dir.parent)
+
+    config = Config()
+    config.add_alias("test", "http://example.com/api.json")
+    config.config_file.chmod(0o644)
+    config.set_alias_option("test", "pool_size", 4)
+    backup_file = config.config_file.with_suffix(".json.bak")
+    assert config.config_file.stat().st_mode & 0o777 == 0o644
+
+    config.set_alias_option("test", "client_secret", "s3cret")
+    config.set_alias_option("test", "client_id", "cli")
+    assert config.config_file.stat().st_mode & 0o777 == 0o600
+    assert backup_file.stat().st_mode & 0o777 == 0o600
+    assert "s3cret" in backup_file.read_text()
+
+
 def test_invalid_config_file(temp_config_dir, monkeypatch):
     """Test handling of invalid configuration file."""
     monkeypatch.setattr(Path, "home", lambda: temp_config_dir.parent)
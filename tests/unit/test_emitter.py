@@ -0,0 +1,175 @@
+"""Test cases for the static Python package emitter."""
+
+import copy
+import json
+import subprocess
+import sys
+
+import pytest
+
+from openapi_cli_generator.emitter import PythonEmitter
+
+
+def record_requests(monkeypatch, runtime, body):
+    """Answer the emitted runtime's requests with ``body`` and record them."""
+    requests_sent = []
+
+    class Response:
+        headers = {}
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def read(self):
+            return body
+
+    def mock_urlopen(request):
+        requests_sent.append(request)
+        return Response()
+
+    monkeypatch.setattr(runtime, "urlopen", mock_urlopen)
+    return requests_sent
+
+
+@pytest.fixture
+def emit(tmp_path, monkeypatch):
+    """Return a function emitting a spec as an importable ``hr_cli`` package."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def emit(spec):
+        spec = dict(spec, servers=[{"url": "http://api.example.com"}])
+        return PythonEmitter(spec, package="hr_cli").emit(tmp_path)
+
+    yield emit
+    for name in list(sys.modules):
+        if name == "hr_cli" or name.startswith("hr_cli."):
+            del sys.modules[name]
+
+
+@pytest.fixture
+def emitted_package(sample_openapi_spec, emit):
+    """Emit the sample spec and make the package importable."""
+    return emit(sample_openapi_spec)
+
+
+def test_emit_layout(emitted_package):
+    """Test the files written for an emitted package."""
+    names = {p.name for p in emitted_package.iterdir()}
+    assert {
+        "__init__.py",
+        "__main__.py",
+        "_runtime.py",
+        "cli.py",
+        "operations.py",
+    } <= names
+    assert (emitted_package.parent / "pyproject.toml").exists()
+
+
+def test_default_package_name(sample_openapi_spec):
+    """Test deriving the package name from the spec title."""
+    assert PythonEmitter(sample_openapi_spec).package == "fastapi_cli"
+
+    with pytest.raises(ValueError):
+        PythonEmitter(sample_openapi_spec, package="not-valid")
+
+
+def test_emitted_cli_has_no_heavy_imports(emitted_package):
+    """Test that importing the emitted CLI avoids yaml, requests and validators."""
+    code = (
+        "import sys, hr_cli.cli; "
+        "print(sorted(m for m in ('yaml', 'requests', 'openapi_spec_validator', "
+        "'hr_cli.operations') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=emitted_package.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_emitted_command_tree(emitted_package, capsys):
+    """Test help output and errors of the emitted command tree."""
+    from hr_cli.cli import main
+
+    assert main(["--help"]) == 0
+    assert "hr" in capsys.readouterr().out
+
+    assert main(["hr", "employees", "--help"]) == 0
+    out = capsys.readouterr().out
+    assert "create" in out and "list" in out
+
+    assert main(["invalid"]) == 2
+    with pytest.raises(SystemExit):
+        main(["hr", "employees", "list"])
+
+
+def test_emitted_operation_call(emitted_package, monkeypatch, capsys):
+    """Test that emitted operations fill path parameters and send bodies."""
+    from hr_cli import _runtime
+    from hr_cli.cli import main
+
+    requests_sent = record_requests(monkeypatch, _runtime, b'{"id": 7}')
+
+    assert main(["hr", "employees", "list", "7"]) == 0
+    assert json.loads(capsys.readouterr().out) == {"id": 7}
+    assert requests_sent[0].full_url == "http://api.example.com/hr/employees/7"
+    assert requests_sent[0].get_method() == "GET"
+
+    assert main(["hr", "employees", "create", "--data", '{"name": "Ann"}']) == 0
+    assert json.loads(requests_sent[1].data) == {"name": "Ann"}
+    assert requests_sent[1].get_header("Content-type") == "application/json"
+
+    import hr_cli
+
+    assert hr_cli.hr_employees_list(8) == {"id": 7}
+    assert requests_sent[2].full_url.endswith("/hr/employees/8")
+
+
+def test_emitted_parameter_named_data(sample_openapi_spec, emit, capsys):
+    """Test that a parameter named like the body option gets its own flag."""
+    spec = copy.deepcopy(sample_openapi_spec)
+    operation = spec["paths"]["/hr/employees/"]["post"]
+    operation["parameters"] = [{"name": "data", "in": "query", "schema": {}}]
+    emit(spec)
+    from hr_cli import operations
+    from hr_cli.cli import main
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["hr", "employees", "create", "--help"])
+    assert exc_info.value.code == 0
+    out = capsys.readouterr().out
+    assert "--data-param" in out and "--data DATA" in out
+
+    calls = []
+    operations.hr_employees_create = lambda **kwargs: calls.append(kwargs)
+    main(["hr", "employees", "create", "--data", "{}", "--data-param", "x"])
+    assert calls == [{"data": {}, "data_": "x"}]
+
+
+def test_emitted_body_content_types(sample_openapi_spec, emit, monkeypatch):
+    """Test that inline bodies are only sent as JSON media types."""
+    spec = copy.deepcopy(sample_openapi_spec)
+    content = spec["paths"]["/hr/employees/"]["post"]["requestBody"]["content"]
+    content["multipart/form-data"] = content.pop("application/json")
+    content["application/vnd.hr+json"] = content["multipart/form-data"]
+    content = spec["paths"]["/hr/drivers/"]["post"]["requestBody"]["content"]
+    content["application/x-www-form-urlencoded"] = content.pop("application/json")
+    emit(spec)
+    from hr_cli import _runtime, operations
+
+    requests_sent = record_requests(monkeypatch, _runtime, b"{}")
+    operations.hr_employees_create(data={"name": "Ann"})
+    assert requests_sent[0].get_header("Content-type") == "application/vnd.hr+json"
+
+    with pytest.raises(_runtime.APIError, match="Unsupported request body type"):
+        operations.hr_drivers_create(data={"name": "Ann"})
+    operations.hr_drivers_create(data=b"name=Ann")
+    assert requests_sent[1].data == b"name=Ann"
+    content_type = requests_sent[1].get_header("Content-type")
+    assert content_type == "application/x-www-form-urlencoded"
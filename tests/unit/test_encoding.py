@@ -0,0 +1,201 @@
+"""Test cases for request body encoding."""
+
+import argparse
+import gzip
+import io
+import json
+
+import pytest
+
+from openapi_cli_generator.encoding import (
+    RequestBody,
+    encode_body,
+    iter_gzip,
+    parse_data_argument,
+    select_content_type,
+)
+from openapi_cli_generator.generator import CLIGenerator
+
+UPLOAD_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Upload API", "version": "1.0.0"},
+    "servers": [{"url": "http://api.example.com"}],
+    "paths": {
+        "/imports/": {
+            "post": {
+                "summary": "Bulk import",
+                "requestBody": {
+                    "content": {
+                        "application/json": {"schema": {"type": "object"}},
+                        "multipart/form-data": {"schema": {"type": "object"}},
+                        "application/octet-stream": {},
+                    }
+                },
+            }
+        }
+    },
+}
+
+
+class TrackedBody(RequestBody):
+    """A request body that keeps the files it opened."""
+
+    def __init__(self, source):
+        """Initialize the body with no files opened."""
+        super().__init__(source)
+        self.opened = []
+
+    def open(self):
+        """Open the body source and remember the file."""
+        fileobj = super().open()
+        self.opened.append(fileobj)
+        return fileobj
+
+
+def test_parse_data_argument(tmp_path):
+    """Test inline JSON, @file and stdin data arguments."""
+    assert parse_data_argument('{"a": 1}') == {"a": 1}
+    assert parse_data_argument("-").is_stdin
+
+    body_file = tmp_path / "body.json"
+    body_file.write_text('{"a": 1}')
+    body = parse_data_argument(f"@{body_file}")
+    assert isinstance(body, RequestBody)
+    assert body.source == str(body_file)
+
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_data_argument(f"@{tmp_path / 'missing.json'}")
+
+    with pytest.raises(json.JSONDecodeError):
+        parse_data_argument("{invalid json}")
+
+
+def test_select_content_type():
+    """Test content type selection from the operation's request body."""
+    types = ["application/octet-stream", "application/json", "multipart/form-data"]
+
+    assert select_content_type(types, {"a": 1}) == "application/json"
+    assert select_content_type(types, RequestBody("-")) == "application/octet-stream"
+    assert select_content_type(types, None, [("f", "x")]) == "multipart/form-data"
+    assert select_content_type([], {"a": 1}) == "application/json"
+
+    with pytest.raises(ValueError):
+        select_content_type(["application/json"], None, [("f", "x")])
+
+
+def test_encode_body_streams_files(tmp_path):
+    """Test that file bodies are streamed and can be gzip-compressed."""
+    payload = b'{"items": [1, 2, 3]}' * 1000
+    body_file = tmp_path / "body.json"
+    body_file.write_bytes(payload)
+
+    body, headers = encode_body(RequestBody(str(body_file)), "application/json")
+    assert hasattr(body, "read")
+    assert headers == {"Content-Type": "application/json"}
+    assert body.read() == payload
+    body.close()
+
+    request_body = TrackedBody(str(body_file))
+    opened = request_body.opened
+    body, headers = encode_body(request_body, "application/json", compress=True)
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(b"".join(body)) == payload
+    assert opened[0].closed
+
+    # Also when the request fails before the body was read
+    body, headers = encode_body(request_body, "application/json", compress=True)
+    next(body)
+    body.close()
+    assert opened[1].closed
+
+
+def test_encode_multipart(tmp_path):
+    """Test streaming multipart/form-data encoding."""
+    upload = tmp_path / "records.csv"
+    upload.write_bytes(b"id,name\n1,Rex\n")
+
+    body, headers = encode_body(
+        {"mode": "replace"}, "multipart/form-data", [("records", str(upload))]
+    )
+    content_type = headers["Content-Type"]
+    boundary = content_type.split("boundary=")[1]
+    encoded = b"".join(body)
+
+    assert content_type.startswith("multipart/form-data")
+    assert b'name="mode"\r\n\r\nreplace\r\n' in encoded
+    assert b'filename="records.csv"' in encoded
+    assert b"id,name\n1,Rex\n" in encoded
+    assert encoded.endswith(f"--{boundary}--\r\n".encode())
+
+    # Quotes and line breaks cannot break out of the header
+    upload = upload.rename(tmp_path / 'a"b.csv')
+    body, _ = encode_body({'x"\r\nX-Injected: 1': "v"}, "multipart/form-data")
+    assert b'name="x%22%0D%0AX-Injected: 1"\r\n' in b"".join(body)
+    body, _ = encode_body(None, "multipart/form-data", [("f", str(upload))])
+    assert b'filename="a%22b.csv"\r\n' in b"".join(body)
+
+
+def test_gzip_roundtrip():
+    """Test incremental gzip compression."""
+    chunks = [b"a" * 10, b"b" * 10, b""]
+    assert gzip.decompress(b"".join(iter_gzip(chunks))) == b"a" * 10 + b"b" * 10
+
+
+def test_execute_sends_encoded_body(tmp_path, monkeypatch, capsys, mock_response):
+    """Test that execute streams @file bodies with the selected content type."""
+    calls = []
+
+    def mock_request(**kwargs):
+        body = kwargs["data"]
+        kwargs["data"] = body.read() if hasattr(body, "read") else b"".join(body)
+        calls.append(kwargs)
+        return mock_response({"imported": 3})
+
+    body_file = tmp_path / "dump.bin"
+    body_file.write_bytes(b"\x00\x01\x02")
+
+    generator = CLIGenerator(UPLOAD_SPEC)
+    generator.generate_cli()
+    monkeypatch.setattr(generator.session, "request", mock_request)
+    generator.execute(
+        [
+            "imports",
+            "create",
+            "--data",
+            f"@{body_file}",
+            "--content-type",
+            "application/octet-stream",
+            "--compress",
+        ]
+    )
+
+    assert json.loads(capsys.readouterr().out) == {"imported": 3}
+    sent = calls[0]
+    assert sent["headers"]["Content-Type"] == "application/octet-stream"
+    assert sent["headers"]["Content-Encoding"] == "gzip"
+    assert gzip.GzipFile(fileobj=io.BytesIO(sent["data"])).read() == b"\x00\x01\x02"
+    assert sent["stream"] is True
+
+
+def test_execute_reports_encoding_errors(tmp_path, capsys):
+    """Test that bodies that cannot be encoded are usage errors."""
+    body_file = tmp_path / "fields.json"
+    body_file.write_text("{}")
+    upload = tmp_path / "records.csv"
+    upload.write_text("id\n")
+    generator = CLIGenerator(UPLOAD_SPEC)
+    generator.generate_cli()
+
+    with pytest.raises(SystemExit) as exc_info:
+        generator.execute(
+            [
+                "imports",
+                "create",
+                "--data",
+                f"@{body_file}",
+                "--file",
+                f"records={upload}",
+            ]
+        )
+    assert exc_info.value.code == 2
+    assert "Multipart bodies take form fields as inline JSON" in capsys.readouterr().err
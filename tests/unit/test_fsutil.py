@@ -0,0 +1,31 @@
+"""Test cases for the file system helpers."""
+
+import os
+import stat
+
+import pytest
+
+from openapi_cli_generator.fsutil import write_atomic
+
+
+def test_write_atomic(tmp_path):
+    """Test replacing files, private modes and cleanup after failures."""
+    path = tmp_path / "cache.json"
+    write_atomic(path, "one")
+    write_atomic(str(path), "two")
+    assert path.read_text() == "two"
+
+    secret = tmp_path / "token.json"
+    write_atomic(secret, "{}", mode=0o600)
+    assert stat.S_IMODE(os.stat(secret).st_mode) == 0o600
+
+    # Replacing a directory fails after the temporary file was written
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "dir" / "entry").write_text("")
+    with pytest.raises(OSError):
+        write_atomic(tmp_path / "dir", "three")
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "cache.json",
+        "dir",
+        "token.json",
+    ]
@@ -1,5 +1,6 @@
 """Test cases for the OpenAPI CLI generator."""
 
+import copy
 import json
 
 import pytest
@@ -72,8 +73,12 @@ def test_type_conversion(sample_openapi_spec):
     # Test number conversion
     assert generator._get_type("number") == float
 
-    # Test boolean conversion
-    assert generator._get_type("boolean") == bool
+    # Test boolean conversion, which is strict
+    parse_bool = generator._get_type("boolean")
+    assert parse_bool("false") is False
+    assert parse_bool("1") is True
+    with pytest.raises(ValueError):
+        parse_bool("maybe")
 
     # Test string conversion
     assert generator._get_type("string") == str
@@ -82,6 +87,25 @@ def test_type_conversion(sample_openapi_spec):
     assert generator._get_type("unknown") == str
 
 
+def test_boolean_parameters(sample_openapi_spec, mock_response, capsys):
+    """Test that boolean options are parsed strictly from text."""
+    spec = copy.deepcopy(sample_openapi_spec)
+    parameters = spec["paths"]["/hr/drivers/"]["get"]["parameters"]
+    parameters.append({"name": "active", "in": "query", "schema": {"type": "boolean"}})
+    generator = CLIGenerator(spec)
+    generator.generate_cli()
+    generator.session.request = lambda **kwargs: mock_response(kwargs["params"])
+
+    for text, sent in (("false", "false"), ("0", "false"), ("True", "true")):
+        generator.execute(["hr", "drivers", "get", "--active", text])
+        assert json.loads(capsys.readouterr().out)["active"] == sent
+
+    with pytest.raises(SystemExit) as exc_info:
+        generator.execute(["hr", "drivers", "get", "--active", "maybe"])
+    assert exc_info.value.code == 2
+    assert "invalid boolean value: 'maybe'" in capsys.readouterr().err
+
+
 def test_nested_resources(sample_openapi_spec, capsys):
     """Test handling of nested resources."""
     generator = CLIGenerator(sample_openapi_spec)
@@ -116,3 +140,225 @@ def test_error_handling(sample_openapi_spec, capsys):
     with pytest.raises(SystemExit) as exc_info:
         generator.execute(["hr", "employees", "create", "--data", "{invalid json}"])
     assert exc_info.value.code != 0
+
+
+def test_parameters_named_like_options(sample_openapi_spec, mock_response, capsys):
+    """Test that parameters keep names the generator's own options also use."""
+    spec = copy.deepcopy(sample_openapi_spec)
+    operation = spec["paths"]["/hr/employees/"]["post"]
+    operation["parameters"] = [
+        {"name": name, "in": "query", "schema": {"type": "integer"}}
+        for name in ("concurrency", "compress", "for-each")
+    ]
+    generator = CLIGenerator(spec)
+    generator.generate_cli()
+    sent = []
+
+    def mock_request(**kwargs):
+        sent.append(kwargs)
+        return mock_response({"id": 1})
+
+    generator.session.request = mock_request
+    employee = {"Address": {"City": "Turku"}, "Name": "Ann", "PhoneNumber": "555"}
+    generator.execute(
+        [
+            "hr",
+            "employees",
+            "create",
+            "--data",
+            json.dumps(employee),
+            "--concurrency",
+            "3",
+            "--compress",
+            "1",
+            "--body-compress",
+        ]
+    )
+    assert sent[0]["params"] == {"concurrency": "3", "compress": "1"}
+    assert sent[0]["headers"]["Content-Encoding"] == "gzip"
+
+    with pytest.raises(SystemExit):
+        generator.execute(["hr", "employees", "create", "--help"])
+    assert "--fan-out-input FILE" in capsys.readouterr().out
+
+
+def test_fan_out_over_repeated_values(sample_openapi_spec, mock_response, capsys):
+    """Test fanning out over repeated values of a required parameter."""
+    generator = CLIGenerator(sample_openapi_spec)
+    generator.generate_cli()
+    urls = []
+
+    def mock_request(**kwargs):
+        urls.append(kwargs["url"])
+        driver_id = int(kwargs["url"].rsplit("/", 1)[1])
+        if driver_id == 2:
+            return mock_response({"detail": "Not found"}, status_code=404)
+        return mock_response({"id": driver_id})
+
+    generator.session.request = mock_request
+
+    with pytest.raises(SystemExit) as exc_info:
+        generator.execute(
+            ["hr", "drivers", "list", "1", "2", "3", "-o", "ndjson", "--ordered"]
+        )
+    assert exc_info.value.code == 1
+
+    captured = capsys.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines()]
+    assert records[0] == {"id": 1}
+    assert records[1]["item"] == {"driver_id": 2}
+    assert "404" in records[1]["error"]
+    assert records[2] == {"id": 3}
+    assert "1 request(s) failed" in captured.err
+    assert sorted(urls) == [f"/hr/drivers/{i}" for i in (1, 2, 3)]
+
+    # Required parameters are still enforced without fan-out
+    with pytest.raises(SystemExit) as exc_info:
+        generator.execute(["hr", "drivers", "list"])
+    assert exc_info.value.code == 2
+
+
+def test_fan_out_for_each_file(sample_openapi_spec, mock_response, tmp_path, capsys):
+    """Test --for-each with bare values and JSON object lines."""
+    generator = CLIGenerator(sample_openapi_spec)
+    generator.generate_cli()
+    generator.session.request = lambda **kwargs: mock_response(
+        {"url": kwargs["url"], **kwargs["params"]}
+    )
+
+    items = tmp_path / "ids.txt"
+    items.write_text('1\n\n{"driver_id": 2, "verbose": true}\n3\n')
+
+    generator.execute(
+        [
+            "hr",
+            "drivers",
+            "list",
+            "--for-each",
+            str(items),
+            "--concurrency",
+            "2",
+            "--ordered",
+            "--query",
+            "url,verbose",
+        ]
+    )
+
+    assert json.loads(capsys.readouterr().out) == [
+        {"url": "/hr/drivers/1", "verbose": None},
+        {"url": "/hr/drivers/2", "verbose": "true"},
+        {"url": "/hr/drivers/3", "verbose": None},
+    ]
+
+
+def test_fan_out_unreadable_items(sample_openapi_spec, mock_response, tmp_path, capsys):
+    """Test that bad --for-each lines fail alone and a missing file fails early."""
+    generator = CLIGenerator(sample_openapi_spec)
+    generator.generate_cli()
+    urls = []
+
+    def mock_request(**kwargs):
+        urls.append(kwargs["url"])
+        return mock_response({"url": kwargs["url"]})
+
+    generator.session.request = mock_request
+
+    items = tmp_path / "ids.txt"
+    items.write_text('1\n{"driver_id": 2\nabc\n3\n')
+    with pytest.raises(SystemExit) as exc_info:
+        generator.execute(
+            ["hr", "drivers", "list", "--for-each", str(items), "--ordered"]
+        )
+    assert exc_info.value.code == 1
+    captured = capsys.readouterr()
+    records = json.loads(captured.out)
+    assert records[0] == {"url": "/hr/drivers/1"}
+    assert records[1]["item"] == '{"driver_id": 2'
+    assert records[1]["error"].startswith("Invalid JSON: ")
+    assert records[2] == {"item": "abc", "error": "Invalid value for driver_id: 'abc'"}
+    assert records[3] == {"url": "/hr/drivers/3"}
+    assert "2 request(s) failed" in captured.err
+    assert sorted(urls) == ["/hr/drivers/1", "/hr/drivers/3"]
+
+    with pytest.raises(SystemExit) as exc_info:
+        generator.execute(
+            ["hr", "drivers", "list", "--for-each", str(tmp_path / "missing.txt")]
+        )
+    assert exc_info.value.code == 2
+    assert "argument --for-each: cannot open" in capsys.readouterr().err
+    assert len(urls) == 2
+
+
+def test_fan_out_rejects_stdin_body(sample_openapi_spec, capsys):
+    """Test that a body read from stdin is not sent to only one of many items."""
+    generator = CLIGenerator(sample_openapi_spec)
+    generator.generate_cli()
+    sent = []
+    generator.session.request = lambda **kwargs: sent.append(kwargs)
+
+    for args, message in (
+        (["1", "2", "3"], "argument --data: a request body read from stdin"),
+        (["--for-each", "-"], "argument --for-each: cannot read items from stdin"),
+    ):
+        with pytest.raises(SystemExit) as exc_info:
+            generator.execute(["hr", "drivers", "update", *args, "--data", "-"])
+        assert exc_info.value.code == 2
+        assert message in capsys.readouterr().err
+    assert sent == []
+
+
+def test_invalid_requests_fail_before_dispatch(
+    sample_openapi_spec, mock_response, tmp_path, capsys
+):
+    """Test that arguments violating the schemas are rejected locally."""
+    generator = CLIGenerator(sample_openapi_spec)
+    generator.generate_cli()
+    sent = []
+
+    def mock_request(**kwargs):
+        sent.append(json.loads(kwargs["data"]))
+        return mock_response({"id": len(sent)})
+
+    generator.session.request = mock_request
+    employee = {"Address": {"City": "Turku"}, "Name": "Ann", "PhoneNumber": "555"}
+    invalid = {"Address": {"City": 7}, "Name": "Bob"}
+    items = tmp_path / "employees.ndjson"
+    items.write_text(
+        "\n".join(json.dumps({"data": data}) for data in (employee, invalid, employee))
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        generator.execute(
+            ["hr", "employees", "create", "--for-each", str(items), "--ordered"]
+        )
+    assert exc_info.value.code == 1
+    records = json.loads(capsys.readouterr().out)
+    assert records[1]["error"] == (
+        "Invalid request: 2 errors\n"
+        "  data/Address/City: 7 is not of type 'string'\n"
+        "  data: 'PhoneNumber' is a required property"
+    )
+    assert sent == [employee, employee]
+
+    with pytest.raises(SystemExit) as exc_info:
+        generator.execute(["hr", "employees", "create"])
+    assert exc_info.value.code == 2
+    assert "data: a request body is required" in capsys.readouterr().err
+    assert len(sent) == 2
+
+    # Schemas in other documents are not checked, so their requests are sent
+    spec = copy.deepcopy(sample_openapi_spec)
+    media_type = spec["paths"]["/hr/employees/"]["post"]["requestBody"]["content"]
+    media_type["application/json"]["schema"] = {"$ref": "common.yaml#/Employee"}
+    generator = CLIGenerator(spec)
+    generator.generate_cli()
+    generator.session.request = mock_request
+    generator.execute(["hr", "employees", "create", "--data", json.dumps(invalid)])
+    assert sent[-1] == invalid
+
+    # Validation can be turned off for specs whose schemas are wrong
+    generator = CLIGenerator(sample_openapi_spec, validate_requests=False)
+    generator.generate_cli()
+    generator.session.request = mock_request
+    generator.execute(["hr", "employees", "create", "--data", json.dumps(invalid)])
+    assert sent[-1] == invalid
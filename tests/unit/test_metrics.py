@@ -0,0 +1,155 @@
+"""Test cases for client-side metrics."""
+
+import json
+import socket
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from openapi_cli_generator.generator import CLIGenerator
+from openapi_cli_generator.metrics import (
+    JSONSink,
+    Metrics,
+    OpenMetricsSink,
+    StatsDSink,
+    create_metrics,
+    format_openmetrics,
+)
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Echo request bodies; ``/pets/0`` fails with 404."""
+
+    def _respond(self, body):
+        status = 404 if self.path.startswith("/pets/0") else 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802
+        """Return a fixed pet."""
+        self._respond(b'{"id": 1, "name": "Rex"}')
+
+    def do_POST(self):  # noqa: N802
+        """Echo the request body."""
+        self._respond(self.rfile.read(int(self.headers["Content-Length"])))
+
+
+@pytest.fixture
+def api_url(http_server):
+    """Run a local HTTP server and return its base URL."""
+    return http_server(EchoHandler).url
+
+
+@pytest.fixture
+def statsd_server():
+    """Return a UDP socket standing in for a StatsD server."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2)
+    yield sock
+    sock.close()
+
+
+def pet_spec(url):
+    """Return a spec for the pet API served at ``url``."""
+    pet_id = {"name": "pet_id", "in": "path", "required": True}
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Pet API", "version": "1.0.0"},
+        "servers": [{"url": url}],
+        "paths": {
+            "/pets": {"post": {"operationId": "createPet"}},
+            "/pets/{pet_id}": {"get": {"parameters": [pet_id]}},
+        },
+    }
+
+
+def test_metrics_recorded_per_operation(api_url, tmp_path, statsd_server):
+    """Test counting calls, statuses, bytes and latency, and exporting them."""
+    metrics = Metrics(
+        [
+            OpenMetricsSink(str(tmp_path / "metrics.prom")),
+            JSONSink(str(tmp_path / "metrics.json")),
+            StatsDSink(statsd_server.getsockname()),
+        ]
+    )
+    generator = CLIGenerator(pet_spec(api_url), metrics=metrics)
+
+    assert generator._send_request("POST", "/pets", data={"name": "Rex"}) == {
+        "name": "Rex"
+    }
+    generator._send_request("POST", "/pets", body=b'{"name": "Fido"}')
+    for pet_id in (1, 2):
+        response = generator._open_request("GET", "/pets/{pet_id}", {"pet_id": pet_id})
+        assert b"".join(response.iter_content(4)) == b'{"id": 1, "name": "Rex"}'
+    with pytest.raises(requests.exceptions.HTTPError):
+        generator._send_request("GET", "/pets/{pet_id}", {"pet_id": 0})
+
+    create = metrics.operations["createPet"]
+    assert create.requests == 2
+    assert create.statuses == {200: 2}
+    assert create.bytes_out == len(b'{"name": "Rex"}') + len(b'{"name": "Fido"}')
+    assert create.bytes_in == create.bytes_out
+    assert create.latency.count == 2
+
+    get = metrics.operations["GET /pets/{pet_id}"]
+    assert get.statuses == {200: 2, 404: 1}
+    assert get.bytes_in == 2 * 24
+
+    generator.close()
+    generator.close()
+
+    text = (tmp_path / "metrics.prom").read_text()
+    assert 'openapi_cli_requests_total{operation="createPet",status="200"} 2' in text
+    assert (
+        'openapi_cli_requests_total{operation="GET /pets/{pet_id}",status="404"} 1'
+        in text
+    )
+    assert (
+        'openapi_cli_request_duration_seconds_bucket{operation="createPet",le="+Inf"} 2'
+        in text
+    )
+    assert text.endswith("# EOF\n")
+
+    summary = json.loads((tmp_path / "metrics.json").read_text())["operations"]
+    assert summary["GET /pets/{pet_id}"]["statuses"] == {"200": 2, "404": 1}
+
+    lines = statsd_server.recv(65536).decode().splitlines()
+    assert lines.count("openapi_cli.createPet.requests:1|c") == 2
+    assert "openapi_cli.GET_pets_pet_id_.status.404:1|c" in lines
+    assert "openapi_cli.createPet.bytes_in:31|c" in lines
+
+
+def test_connection_errors_are_recorded():
+    """Test that calls failing without a response count as errors."""
+    metrics = Metrics()
+    generator = CLIGenerator(pet_spec("http://127.0.0.1:9"), metrics=metrics)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        generator._send_request("GET", "/pets/{pet_id}", {"pet_id": 1})
+    assert metrics.operations["GET /pets/{pet_id}"].statuses == {"ConnectionError": 1}
+
+
+def test_openmetrics_histogram_buckets():
+    """Test cumulative latency buckets and label escaping."""
+    metrics = Metrics()
+    for seconds in (0.003, 0.02, 0.02, 3.0):
+        metrics.record('say "hi"', 200, seconds)
+    text = format_openmetrics(metrics, buckets=(0.01, 0.1, 1.0))
+    prefix = 'openapi_cli_request_duration_seconds_bucket{operation="say \\"hi\\"",'
+    for bound, count in (("0.01", 1), ("0.1", 3), ("1", 3), ("+Inf", 4)):
+        assert f'{prefix}le="{bound}"}} {count}' in text
+    assert (
+        'openapi_cli_request_duration_seconds_sum{operation="say \\"hi\\""} 3.043'
+        in text
+    )
+
+
+def test_create_metrics():
+    """Test building sinks from alias options."""
+    assert create_metrics({"transport": "http2"}) is None
+    metrics = create_metrics({"metrics_file": "/tmp/m.prom", "metrics_json": "-"})
+    assert [type(sink) for sink in metrics.sinks] == [OpenMetricsSink, JSONSink]
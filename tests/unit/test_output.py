@@ -0,0 +1,128 @@
+"""Test cases for response output formatting."""
+
+import io
+import json
+
+import pytest
+
+from openapi_cli_generator.generator import CLIGenerator
+from openapi_cli_generator.output import JSONStream, Query, write_output
+
+RECORDS = [
+    {"id": 1, "name": "Rex", "status": "available", "owner": {"name": "Ann"}},
+    {"id": 2, "name": "Tom", "status": "sold", "owner": None},
+    {"id": 3, "name": "Kit", "status": "available", "owner": {"name": "Bo"}},
+]
+
+
+def render(records, output_format, **kwargs):
+    """Render records into a string."""
+    stream = io.StringIO()
+    write_output(records, output_format, stream=stream, **kwargs)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 4096])
+def test_json_stream_array(chunked, size):
+    """Test decoding array elements across arbitrary chunk boundaries."""
+    body = json.dumps(RECORDS + [12345, "ünï", True, None]).encode()
+    stream = JSONStream(chunked(body, size))
+
+    assert stream.is_array
+    assert list(stream.records()) == RECORDS + [12345, "ünï", True, None]
+
+
+def test_json_stream_documents(chunked):
+    """Test decoding non-array, empty and invalid documents."""
+    stream = JSONStream(chunked(b' {"a": [1, 2]} ', 2))
+    assert not stream.is_array
+    assert list(stream.records()) == [{"a": [1, 2]}]
+
+    assert list(JSONStream([b""]).records()) == []
+    assert list(JSONStream([b"[ ]"]).records()) == []
+
+    with pytest.raises(json.JSONDecodeError):
+        list(JSONStream([b"[1 2]"]).records())
+
+
+def test_query():
+    """Test field projection and filters."""
+    query = Query("id,owner.name,status==available")
+    assert query.fields == ["id", "owner.name"]
+    assert list(query.apply(RECORDS)) == [
+        {"id": 1, "owner.name": "Ann"},
+        {"id": 3, "owner.name": "Bo"},
+    ]
+
+    assert [r["id"] for r in Query("id!=2").apply(RECORDS)] == [1, 3]
+    assert list(Query("status==sold").apply(RECORDS)) == [RECORDS[1]]
+
+
+def test_json_output_matches_dumps():
+    """Test that streamed JSON output matches json.dumps with indent=2."""
+    assert render(iter(RECORDS), "json") == json.dumps(RECORDS, indent=2) + "\n"
+    assert render(iter([]), "json") == "[]\n"
+    assert render([RECORDS[0]], "json", is_array=False) == (
+        json.dumps(RECORDS[0], indent=2) + "\n"
+    )
+
+
+def test_tabular_and_line_formats():
+    """Test ndjson, csv, table and yaml output."""
+    ndjson = render(RECORDS, "ndjson").splitlines()
+    assert [json.loads(line) for line in ndjson] == RECORDS
+
+    csv_output = render(RECORDS, "csv", fields=["id", "name"]).splitlines()
+    assert csv_output == ["id,name", "1,Rex", "2,Tom", "3,Kit"]
+
+    table = render(RECORDS, "table").splitlines()
+    assert table[0].split() == ["id", "name", "status", "owner"]
+    assert table[3].split()[:3] == ["2", "Tom", "sold"]
+
+    assert render(RECORDS[:1], "yaml").startswith("- id: 1\n  name: Rex\n")
+    assert render(iter([]), "yaml") == "[]\n"
+
+    with pytest.raises(ValueError):
+        render(RECORDS, "xml")
+
+
+def test_execute_output_options(
+    sample_openapi_spec, mock_response, monkeypatch, capsys
+):
+    """Test --output and --query on a generated command."""
+    generator = CLIGenerator(sample_openapi_spec)
+    generator.generate_cli()
+    monkeypatch.setattr(
+        generator.session, "request", lambda **kwargs: mock_response(RECORDS)
+    )
+
+    generator.execute(
+        ["hr", "drivers", "get", "--output", "csv", "--query", "id,name,status!=sold"]
+    )
+    assert capsys.readouterr().out.splitlines() == ["id,name", "1,Rex", "3,Kit"]
+
+    generator.execute(["hr", "drivers", "get"])
+    assert json.loads(capsys.readouterr().out) == RECORDS
+
+    with pytest.raises(SystemExit):
+        generator.execute(["hr", "drivers", "get", "--output", "xml"])
+
+
+def test_execute_non_json_responses(sample_openapi_spec, mock_response, capsys):
+    """Test that text bodies pass through and broken JSON is reported."""
+    generator = CLIGenerator(sample_openapi_spec)
+    generator.generate_cli()
+    page = mock_response(None, headers={"content-type": "text/html; charset=utf-8"})
+    page.text = "<html>Bad gateway</html>"
+    generator.session.request = lambda **kwargs: page
+
+    generator.execute(["hr", "drivers", "get"])
+    assert capsys.readouterr().out == "<html>Bad gateway</html>"
+
+    broken = mock_response(None)
+    broken.text = '{"id": 1'
+    generator.session.request = lambda **kwargs: broken
+    with pytest.raises(SystemExit) as exc_info:
+        generator.execute(["hr", "drivers", "get"])
+    assert exc_info.value.code == 1
+    assert "Error making request: invalid JSON response" in capsys.readouterr().out
@@ -0,0 +1,212 @@
+"""Test cases for partial spec loading and the spec cache."""
+
+import json
+
+import pytest
+import requests
+
+from openapi_cli_generator.parser import OpenAPIParser
+from openapi_cli_generator.partial import PartialSpec, command_tokens, path_matches
+from openapi_cli_generator.spec_cache import SpecCache
+
+SPEC_URL = "http://example.com/api"
+
+
+@pytest.fixture
+def sample_body(sample_openapi_spec):
+    """Return the sample spec as a JSON body with escapes and non-ASCII text."""
+    spec = dict(sample_openapi_spec)
+    spec["info"] = dict(spec["info"], description='Fleet "API" {v1} [ünï] \\')
+    return spec, json.dumps(spec, indent=1, ensure_ascii=False).encode()
+
+
+def test_command_tokens_and_path_matching():
+    """Test selecting paths from the command line."""
+    assert command_tokens(["hr", "drivers", "get", "--limit", "5"]) == [
+        "hr",
+        "drivers",
+        "get",
+    ]
+    assert path_matches("/hr/drivers/{driver_id}", ["hr", "drivers", "list", "7"])
+    assert path_matches("/hr/drivers/", ["hr"])
+    assert not path_matches("/hr/employees/", ["hr", "drivers", "get"])
+
+
+@pytest.mark.parametrize("size", [1, 5, 64, 1 << 20])
+def test_partial_spec(sample_body, chunked, size):
+    """Test extracting matching paths and referenced components."""
+    spec, body = sample_body
+    partial = PartialSpec(chunked(body, size), ["hr", "drivers", "create"])
+
+    assert partial.path_count == len(spec["paths"])
+    assert partial.spec["info"] == spec["info"]
+    assert partial.spec["paths"] == {
+        path: spec["paths"][path]
+        for path in ("/hr/drivers/", "/hr/drivers/{driver_id}")
+    }
+    assert sorted(partial.spec["components"]["schemas"]) == [
+        "DriverCreate",
+        "HTTPValidationError",
+        "ValidationError",
+        "schemas__human_resource_management__Driver",
+    ]
+    schemas = spec["components"]["schemas"]
+    for name, schema in partial.spec["components"]["schemas"].items():
+        assert schema == schemas[name]
+
+    full = PartialSpec(chunked(body, size), [])
+    assert full.spec == spec
+
+
+def test_partial_spec_transitive_references(chunked):
+    """Test that components referenced from components are included."""
+    body = json.dumps(
+        {
+            "paths": {"/pets": {"get": {"$ref": "#/components/schemas/Pets"}}},
+            "components": {
+                "schemas": {
+                    "Pet": {"type": "object"},
+                    "Pets": {"items": {"$ref": "#/components/schemas/Pet"}},
+                    "Unused": {},
+                },
+                "securitySchemes": {"key": {"type": "apiKey"}},
+            },
+            "webhooks": {"ping": {}},
+        }
+    ).encode()
+    partial = PartialSpec(chunked(body, 3), ["pets"])
+    assert sorted(partial.spec["components"]["schemas"]) == ["Pet", "Pets"]
+    assert partial.spec["components"]["securitySchemes"] == {"key": {"type": "apiKey"}}
+    assert "webhooks" not in partial.spec
+
+
+@pytest.mark.parametrize(
+    "body", [b'{"a": 1', b'{"a" 1}', b'{"a": [1, "x]}', b'{"a": 1} x', b""]
+)
+def test_partial_spec_invalid_json(chunked, body):
+    """Test that malformed documents are rejected."""
+    with pytest.raises(json.JSONDecodeError):
+        PartialSpec(chunked(body, 2), ["a"])
+
+
+def test_spec_cache(tmp_path):
+    """Test storing, expiring and reporting cached specs."""
+    cache = SpecCache(tmp_path)
+    assert cache.get(SPEC_URL) is None
+
+    cache.put(SPEC_URL, {"openapi": "3.0.0"})
+    assert cache.get(SPEC_URL) == {"openapi": "3.0.0"}
+    assert SpecCache(tmp_path, ttl=-1).get(SPEC_URL) == {"openapi": "3.0.0"}
+    SpecCache(tmp_path, ttl=-1).put(SPEC_URL, {})
+    assert cache.get(SPEC_URL) is None
+
+    cache.put_error(SPEC_URL, "Invalid OpenAPI specification: boom")
+    with pytest.raises(ValueError, match="boom"):
+        cache.get(SPEC_URL)
+
+    cache.invalidate(SPEC_URL)
+    assert cache.get(SPEC_URL) is None
+    cache.invalidate(SPEC_URL)
+
+
+@pytest.fixture
+def serve(monkeypatch, chunked):
+    """Return a function serving a JSON body in small chunks.
+
+    The function returns the list of URLs fetched.
+    """
+
+    def serve(body):
+        fetched = []
+
+        class StreamedResponse:
+            headers = {"content-type": "application/json"}
+
+            def raise_for_status(self):
+                pass
+
+            def iter_content(self, chunk_size=1):
+                return iter(chunked(body, 1024))
+
+            def json(self):
+                return json.loads(body)
+
+            def close(self):
+                pass
+
+        def mock_get(url, stream=False):
+            fetched.append(url)
+            return StreamedResponse()
+
+        monkeypatch.setattr(requests, "get", mock_get)
+        return fetched
+
+    return serve
+
+
+@pytest.fixture
+def spec_server(sample_body, serve):
+    """Serve the sample spec and record the requests made."""
+    spec, body = sample_body
+    return spec, serve(body)
+
+
+def test_parse_for_command(tmp_path, spec_server, monkeypatch):
+    """Test partial loading on a cold cache and full specs once it is filled."""
+    spec, fetched = spec_server
+    parser = OpenAPIParser(SPEC_URL, cache=SpecCache(tmp_path))
+    fills = []
+    monkeypatch.setattr(parser, "_start_cache_fill", fills.append)
+
+    partial = parser.parse_for_command(["hr", "drivers", "get", "--limit", "5"])
+    assert sorted(partial["paths"]) == ["/hr/drivers/", "/hr/drivers/{driver_id}"]
+    assert parser.cache.get(SPEC_URL) is None
+
+    # The body was streamed to disk for the background process, which
+    # validates and caches the full spec
+    assert json.loads(fills[0].read_bytes()) == spec
+    parser.fill_cache(fills[0])
+    assert not fills[0].exists()
+    assert parser.cache.get(SPEC_URL) == spec
+
+    assert parser.parse_for_command(["hr", "drivers", "get"]) == spec
+    assert len(fetched) == 1
+
+
+def test_parse_for_command_fallbacks(tmp_path, spec_server):
+    """Test full loading without a command or for unknown commands."""
+    spec, fetched = spec_server
+    assert OpenAPIParser(SPEC_URL).parse_for_command(["hr", "drivers"]) == spec
+
+    parser = OpenAPIParser(SPEC_URL, cache=SpecCache(tmp_path))
+    assert parser.parse_for_command(["nonexistent"]) == spec
+    assert parser.cache_fill is None
+    assert parser.parse_for_command(["--help"]) == spec
+    assert len(fetched) == 2
+
+
+def test_fill_cache_records_invalid_spec(tmp_path):
+    """Test that a spec failing validation is reported on the next run."""
+    parser = OpenAPIParser(SPEC_URL, cache=SpecCache(tmp_path))
+    body_file = tmp_path / "spec.body"
+    body_file.write_text(json.dumps({"openapi": "3.0.0", "paths": {}}))
+    parser.fill_cache(body_file)
+
+    with pytest.raises(ValueError, match="Invalid OpenAPI specification"):
+        parser.parse_for_command(["hr"])
+
+
+def test_parse_for_command_validates_partial_spec(
+    tmp_path, sample_body, serve, monkeypatch
+):
+    """Test that errors in the decoded operations stop a cold-cache run."""
+    spec = json.loads(sample_body[1])
+    spec["paths"]["/hr/drivers/"]["get"]["parameters"][0]["in"] = "nowhere"
+    serve(json.dumps(spec).encode())
+    parser = OpenAPIParser(SPEC_URL, cache=SpecCache(tmp_path))
+    fills = []
+    monkeypatch.setattr(parser, "_start_cache_fill", fills.append)
+
+    with pytest.raises(ValueError, match="parameters/0/in: 'nowhere'"):
+        parser.parse_for_command(["hr", "drivers", "get"])
+    assert parser.cache.get(SPEC_URL) is None
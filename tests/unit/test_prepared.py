@@ -0,0 +1,166 @@
+"""Test cases for prepared request templates."""
+
+import copy
+
+import pytest
+import requests
+
+from openapi_cli_generator.generator import CLIGenerator
+from openapi_cli_generator.prepared import PreparedOperation
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Pet API", "version": "1.0.0"},
+    "servers": [{"url": "http://api.example.com/v1"}],
+    "components": {
+        "parameters": {
+            "Trace": {
+                "name": "X-Trace-Id",
+                "in": "header",
+                "schema": {"type": "string"},
+            }
+        }
+    },
+    "paths": {
+        "/owners/{owner_id}/pets/{pet_id}": {
+            "parameters": [
+                {
+                    "name": "owner_id",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                }
+            ],
+            "get": {
+                "summary": "Get pet",
+                "parameters": [
+                    {
+                        "name": "pet_id",
+                        "in": "path",
+                        "required": True,
+                        "schema": {"type": "integer"},
+                    },
+                    {"name": "fields", "in": "query", "schema": {"type": "array"}},
+                    {"name": "verbose", "in": "query", "schema": {"type": "boolean"}},
+                    {"name": "session", "in": "cookie", "schema": {"type": "string"}},
+                    {"$ref": "#/components/parameters/Trace"},
+                ],
+            },
+        }
+    },
+}
+
+
+@pytest.fixture
+def template():
+    """Return the prepared template for the sample operation."""
+    return CLIGenerator(SPEC).prepare("get", "/owners/{owner_id}/pets/{pet_id}")
+
+
+def test_parameters_merged_and_resolved(template):
+    """Test merging path-item parameters and resolving $ref parameters."""
+    names = [(p["name"], p["in"]) for p in template.parameters]
+    assert names == [
+        ("owner_id", "path"),
+        ("pet_id", "path"),
+        ("fields", "query"),
+        ("verbose", "query"),
+        ("session", "cookie"),
+        ("X-Trace-Id", "header"),
+    ]
+    assert [p["name"] for p in template.required_parameters] == ["owner_id", "pet_id"]
+
+
+def test_build_places_parameters(template):
+    """Test placement and encoding by parameter location."""
+    path, query, headers, cookies = template.build(
+        {
+            "owner_id": "a b/c",
+            "pet_id": 7,
+            "fields": ["id", "name"],
+            "verbose": True,
+            "session": "s1",
+            "X-Trace-Id": "t1",
+            "limit": 5,
+            "skip": None,
+        }
+    )
+    assert path == "/owners/a%20b%2Fc/pets/7"
+    assert query == {"fields": ["id", "name"], "verbose": "true", "limit": "5"}
+    assert headers == {"X-Trace-Id": "t1"}
+    assert cookies == {"session": "s1"}
+
+
+def test_missing_path_parameter(template):
+    """Test that missing path parameters are reported."""
+    with pytest.raises(ValueError, match="pet_id"):
+        template.build({"owner_id": "1"})
+
+
+def test_static_path_and_caching():
+    """Test templates without path parameters and per-operation caching."""
+    operation = {"parameters": [{"name": "q", "in": "query"}]}
+    template = PreparedOperation("get", "/search", operation)
+    assert template.build({"q": "rex"}) == ("/search", {"q": "rex"}, {}, {})
+
+    generator = CLIGenerator(SPEC)
+    path = "/owners/{owner_id}/pets/{pet_id}"
+    assert generator.prepare("GET", path) is generator.prepare("get", path)
+
+
+def test_execute_uses_template(mock_response, capsys):
+    """Test that generated commands send path, query and header parameters."""
+    generator = CLIGenerator(SPEC)
+    generator.generate_cli()
+    sent = []
+
+    def mock_request(**kwargs):
+        sent.append(kwargs)
+        return mock_response({"id": 7})
+
+    generator.session.request = mock_request
+    generator.execute(["owners", "pets", "list", "1", "7", "--X-Trace-Id", "t1"])
+
+    assert sent[0]["url"] == "http://api.example.com/v1/owners/1/pets/7"
+    assert sent[0]["params"] == {}
+    assert sent[0]["headers"] == {"X-Trace-Id": "t1"}
+
+
+def test_array_query_styles(mock_response, capsys):
+    """Test that array values given as text are sent in their query style."""
+    spec = copy.deepcopy(SPEC)
+    items = {"type": "array", "items": {"type": "integer"}}
+    spec["paths"]["/pets"] = {
+        "get": {
+            "parameters": [
+                {"name": "tags", "in": "query", "schema": items},
+                {"name": "ids", "in": "query", "explode": False, "schema": items},
+                {
+                    "name": "codes",
+                    "in": "query",
+                    "style": "pipeDelimited",
+                    "schema": items,
+                },
+            ]
+        }
+    }
+    generator = CLIGenerator(spec)
+    generator.generate_cli()
+    sent = []
+
+    def mock_request(**kwargs):
+        sent.append(requests.Request("GET", kwargs["url"], params=kwargs["params"]))
+        return mock_response([])
+
+    generator.session.request = mock_request
+    generator.execute(
+        ["pets", "get", "--tags", "1,2", "--ids", "3,4", "--codes", "5|6"]
+    )
+    assert sent[0].prepare().url == (
+        "http://api.example.com/v1/pets?tags=1&tags=2&ids=3%2C4&codes=5%7C6"
+    )
+
+    with pytest.raises(SystemExit):
+        generator.execute(["pets", "get", "--codes", "5|x"])
+    assert "codes/1: 'x' is not of type 'integer'" in capsys.readouterr().err
+    assert len(sent) == 1
@@ -0,0 +1,168 @@
+"""Test cases for compiled request validators."""
+
+import pytest
+
+from openapi_cli_generator.schema import SchemaCompiler
+
+SPEC = {
+    "components": {
+        "schemas": {
+            "Pet": {
+                "type": "object",
+                "required": ["id", "name", "kind"],
+                "properties": {
+                    "id": {"type": "integer", "format": "int64", "readOnly": True},
+                    "name": {"type": "string", "minLength": 1, "maxLength": 10},
+                    "kind": {"type": "string", "enum": ["cat", "dog"]},
+                    "born": {"type": "string", "format": "date"},
+                    "owner": {"type": "string", "format": "email", "nullable": True},
+                    "tags": {
+                        "type": "array",
+                        "items": {"type": "string", "pattern": "^[a-z]+$"},
+                        "maxItems": 2,
+                        "uniqueItems": True,
+                    },
+                    "weight": {
+                        "type": "number",
+                        "minimum": 0,
+                        "exclusiveMinimum": True,
+                    },
+                    "parent": {"$ref": "#/components/schemas/Pet"},
+                },
+                "additionalProperties": False,
+            },
+            "Payment": {
+                "oneOf": [
+                    {"type": "object", "required": ["card"]},
+                    {"type": "object", "required": ["iban"]},
+                ]
+            },
+        }
+    }
+}
+
+
+@pytest.fixture
+def compiler():
+    """Return a compiler for the test spec."""
+    return SchemaCompiler(SPEC)
+
+
+def test_valid_values(compiler):
+    """Test that valid values have no errors."""
+    validate = compiler.validator({"$ref": "#/components/schemas/Pet"})
+    pet = {
+        "name": "Rex",
+        "kind": "dog",
+        "born": "2020-02-29",
+        "owner": None,
+        "tags": ["good", "boy"],
+        "weight": 12.5,
+        "parent": {"id": 1, "name": "Max", "kind": "dog"},
+    }
+    assert validate(pet, "data") == []
+
+
+def test_errors_are_located(compiler):
+    """Test reporting every violation with its pointer."""
+    validate = compiler.validator({"$ref": "#/components/schemas/Pet"})
+    pet = {
+        "name": "",
+        "kind": "cow",
+        "born": "2021-02-29",
+        "owner": "nobody",
+        "tags": ["a", "a", "B"],
+        "weight": 0,
+        "parent": {"name": 5, "kind": "cat", "id": True},
+        "a/b": 1,
+    }
+    assert sorted(validate(pet, "data")) == sorted(
+        [
+            "data/name: '' is too short",
+            "data/kind: 'cow' is not one of ['cat', 'dog']",
+            "data/born: '2021-02-29' is not a 'date'",
+            "data/owner: 'nobody' is not a 'email'",
+            "data/tags: ['a', 'a', 'B'] is too long",
+            "data/tags: ['a', 'a', 'B'] has non-unique elements",
+            "data/tags/2: 'B' does not match '^[a-z]+$'",
+            "data/weight: 0 is less than or equal to the minimum of 0",
+            "data/parent/id: True is not of type 'integer'",
+            "data/parent/name: 5 is not of type 'string'",
+            "data: Additional properties are not allowed ('a/b' was unexpected)",
+        ]
+    )
+    assert validate([], "data") == ["data: [] is not of type 'object'"]
+
+
+def test_combinators_and_enums(compiler):
+    """Test oneOf/anyOf/allOf and JSON equality in enums."""
+    validate = compiler.validator({"$ref": "#/components/schemas/Payment"})
+    assert validate({"card": "4111"}, "data") == []
+    assert validate({}, "data") == [
+        "data: {} is not valid under any of the given schemas"
+    ]
+    assert validate({"card": "4111", "iban": "FI00"}, "data") == [
+        "data: {'card': '4111', 'iban': 'FI00'} is valid under more than one of "
+        "the given schemas"
+    ]
+
+    validate = compiler.validator(
+        {"allOf": [{"minimum": 1}, {"maximum": 3}], "anyOf": [{"enum": [1, 2]}]}
+    )
+    assert validate(2, "n") == []
+    assert validate(True, "n") == [
+        "n: True is not valid under any of the given schemas"
+    ]
+    assert validate(4, "n") == [
+        "n: 4 is greater than the maximum of 3",
+        "n: 4 is not valid under any of the given schemas",
+    ]
+
+    validate = compiler.validator({"exclusiveMaximum": 10, "multipleOf": 0.5})
+    assert validate(9.5, "n") == []
+    assert validate(10, "n") == ["n: 10 is greater than or equal to the maximum of 10"]
+    assert validate(1.2, "n") == ["n: 1.2 is not a multiple of 0.5"]
+
+
+def test_parameter_values_given_as_text(compiler):
+    """Test coercing parameter text to the expected type before checking it."""
+    validate = compiler.parameter_validator({"type": "integer", "maximum": 100})
+    assert validate("42", "limit") == []
+    assert validate(42, "limit") == []
+    assert validate("many", "limit") == ["limit: 'many' is not of type 'integer'"]
+    assert validate("500", "limit") == ["limit: 500 is greater than the maximum of 100"]
+
+    validate = compiler.parameter_validator(
+        {"type": "array", "items": {"type": "string", "format": "uuid"}}
+    )
+    uuid = "0b5b3d4c-6f1e-4f4a-9d2e-2b1f9f8b7a6c"
+    assert validate(f"{uuid},{uuid}", "ids") == []
+    assert validate([uuid, "x"], "ids") == ["ids/1: 'x' is not a 'uuid'"]
+
+    validate = compiler.parameter_validator({"type": "boolean"})
+    assert validate("true", "verbose") == []
+    assert validate("yes", "verbose") == ["verbose: 'yes' is not of type 'boolean'"]
+
+
+def test_compiled_once(compiler):
+    """Test that referenced schemas are compiled once and shared."""
+    pet = SPEC["components"]["schemas"]["Pet"]
+    first = compiler.compile({"$ref": "#/components/schemas/Pet"})
+    assert compiler.compile(pet) is first
+    assert compiler.compile({"items": {"$ref": "#/components/schemas/Pet"}})
+
+
+def test_unresolvable_schemas_are_not_checked(compiler):
+    """Test that schemas the compiler cannot follow accept any value."""
+    broken = {"properties": {"pet": {"$ref": "#/components/schemas/Missing"}}}
+    for _ in range(2):
+        assert compiler.validator(broken)({"pet": 5}, "data") == []
+    external = {"$ref": "common.yaml#/Pet"}
+    assert compiler.validator(external)(5, "data") == []
+    assert compiler.validator({"items": external})([1, "a"], "data") == []
+    assert compiler.parameter_validator(external)("abc", "pet") == []
+
+    # Patterns in ECMA 262 syntax Python does not support are skipped
+    validate = compiler.validator({"type": "string", "pattern": r"^\p{L}+$"})
+    assert validate("Åsa", "name") == []
+    assert validate(5, "name") == ["name: 5 is not of type 'string'"]
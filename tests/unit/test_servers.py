@@ -0,0 +1,181 @@
+"""Test cases for server selection and failover."""
+
+import json
+import time
+
+import pytest
+import requests
+
+from openapi_cli_generator.generator import CLIGenerator
+from openapi_cli_generator.servers import ServerSelector, expand_servers
+
+SERVERS = [
+    {
+        "url": "https://{region}.api.example.com/{version}/",
+        "variables": {
+            "region": {"default": "us", "enum": ["eu", "us", "ap"]},
+            "version": {"default": "v1"},
+        },
+    },
+    {"url": "https://backup.example.com/v1"},
+]
+
+CANDIDATES = [
+    "https://us.api.example.com/v1",
+    "https://eu.api.example.com/v1",
+    "https://ap.api.example.com/v1",
+    "https://backup.example.com/v1",
+]
+
+LATENCIES = {
+    "https://us.api.example.com/v1": 0.3,
+    "https://eu.api.example.com/v1": 0.1,
+    "https://ap.api.example.com/v1": None,
+    "https://backup.example.com/v1": 0.2,
+}
+
+
+@pytest.fixture
+def selector(tmp_path, monkeypatch):
+    """Return a selector with canned probe latencies."""
+    selector = ServerSelector(SERVERS, cache_file=tmp_path / "servers.json")
+    probed = []
+
+    def probe(url):
+        probed.append(url)
+        return LATENCIES[url]
+
+    monkeypatch.setattr(selector, "probe", probe)
+    selector.probed = probed
+    return selector
+
+
+def test_expand_servers():
+    """Test expanding server variables, defaults first."""
+    assert expand_servers(SERVERS) == CANDIDATES
+    assert expand_servers(SERVERS, limit=2) == CANDIDATES[:2]
+    assert expand_servers([]) == []
+
+
+def test_select_orders_by_latency(selector):
+    """Test that healthy servers are ordered by latency, unhealthy last."""
+    expected = [
+        "https://eu.api.example.com/v1",
+        "https://backup.example.com/v1",
+        "https://us.api.example.com/v1",
+        "https://ap.api.example.com/v1",
+    ]
+    assert selector.select() == expected
+    assert selector.select() == expected
+    assert len(selector.probed) == 4
+
+
+def test_selection_cache(selector, tmp_path, monkeypatch):
+    """Test that the order is shared through the cache until it expires."""
+    first = selector.select()
+
+    other = ServerSelector(SERVERS, cache_file=tmp_path / "servers.json")
+    monkeypatch.setattr(other, "probe", lambda url: pytest.fail("probed"))
+    assert other.select() == first
+
+    cache = json.loads((tmp_path / "servers.json").read_text())
+    for entry in cache.values():
+        entry["expires_at"] = 0
+    (tmp_path / "servers.json").write_text(json.dumps(cache))
+
+    expired = ServerSelector(SERVERS, cache_file=tmp_path / "servers.json")
+    monkeypatch.setattr(expired, "probe", lambda url: LATENCIES[url])
+    assert expired.select() == first
+
+
+def test_selection_expires_in_process(selector, monkeypatch):
+    """Test that a long-lived selector measures again once its order expires."""
+    assert selector.select()[0] == "https://eu.api.example.com/v1"
+    monkeypatch.setitem(LATENCIES, "https://eu.api.example.com/v1", None)
+    assert selector.select()[0] == "https://eu.api.example.com/v1"
+    assert len(selector.probed) == 4
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + selector.ttl + 1)
+    assert selector.select()[0] == "https://backup.example.com/v1"
+    assert len(selector.probed) == 8
+
+
+def test_report_failure(selector):
+    """Test demoting a server after a connection error."""
+    selector.select()
+    selector.report_failure("https://eu.api.example.com/v1")
+    assert selector.select()[0] == "https://backup.example.com/v1"
+    assert selector.select()[-1] == "https://eu.api.example.com/v1"
+
+
+def test_generator_failover(selector, mock_response):
+    """Test that requests fail over to the next server on connection errors."""
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Regional API", "version": "1.0.0"},
+        "servers": SERVERS,
+        "paths": {"/pets": {"get": {"summary": "List pets"}}},
+    }
+    generator = CLIGenerator(spec)
+    generator.server_selector = selector
+    assert generator.base_url == "https://us.api.example.com/v1"
+
+    urls = []
+
+    def mock_request(**kwargs):
+        urls.append(kwargs["url"])
+        if kwargs["url"].startswith("https://eu."):
+            raise requests.exceptions.ConnectionError("unreachable")
+        return mock_response([])
+
+    generator.session.request = mock_request
+    assert generator._send_request("get", "/pets") == []
+    assert urls == [
+        "https://eu.api.example.com/v1/pets",
+        "https://backup.example.com/v1/pets",
+    ]
+    assert selector.select()[0] == "https://backup.example.com/v1"
+
+    # Streamed bodies cannot be resent, so they do not fail over
+    urls.clear()
+    selector.report_failure("https://backup.example.com/v1")
+    selector.report_failure("https://us.api.example.com/v1")
+    selector.report_failure("https://ap.api.example.com/v1")
+    with pytest.raises(requests.exceptions.ConnectionError):
+        generator._send_request("get", "/pets", body=iter([b"x"]))
+    assert len(urls) == 1
+
+
+def test_no_failover_after_post_was_sent(selector, mock_response):
+    """Test that a POST is only resent if it never reached the first server."""
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Regional API", "version": "1.0.0"},
+        "servers": SERVERS,
+        "paths": {"/pets": {"post": {"summary": "Create a pet"}}},
+    }
+    generator = CLIGenerator(spec)
+    generator.server_selector = selector
+    errors = []
+    urls = []
+
+    def mock_request(**kwargs):
+        urls.append(kwargs["url"])
+        if len(urls) == 1:
+            raise errors.pop()
+        return mock_response({"id": 1})
+
+    generator.session.request = mock_request
+
+    # The connection dropped after the request was sent: it may be applied
+    errors.append(requests.exceptions.ConnectionError("Connection aborted."))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        generator._send_request("post", "/pets", data={"name": "Rex"})
+    assert len(urls) == 1
+
+    # The server could not be reached at all
+    urls.clear()
+    errors.append(requests.exceptions.ConnectTimeout("timed out"))
+    assert generator._send_request("post", "/pets", data={"name": "Rex"}) == {"id": 1}
+    assert len(urls) == 2
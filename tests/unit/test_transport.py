@@ -0,0 +1,176 @@
+"""Test cases for the HTTP transports."""
+
+import json
+import socket
+import threading
+
+import pytest
+import requests
+
+from openapi_cli_generator.generator import CLIGenerator
+from openapi_cli_generator.transport import (
+    RequestsTransport,
+    connect_failed,
+    create_transport,
+)
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Pet API", "version": "1.0.0"},
+    "servers": [{"url": "http://127.0.0.1:1"}],
+    "paths": {
+        "/pets/{pet_id}": {
+            "get": {
+                "summary": "Get pet",
+                "parameters": [
+                    {
+                        "name": "pet_id",
+                        "in": "path",
+                        "required": True,
+                        "schema": {"type": "integer"},
+                    }
+                ],
+            }
+        }
+    },
+}
+
+
+class H2Server:
+    """Minimal cleartext HTTP/2 server standing in for an HTTP/2 gateway.
+
+    Every response echoes the request path and the number of the connection
+    it arrived on; ``/pets/0`` answers 404.
+    """
+
+    def __init__(self):
+        """Listen on a free local port and accept connections in a thread."""
+        self.connections = 0
+        self._socket = socket.socket()
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen()
+        self.url = "http://127.0.0.1:%d" % self._socket.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._socket.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(
+                target=self._serve, args=(sock, self.connections), daemon=True
+            ).start()
+
+    def _serve(self, sock, number):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+        conn.initiate_connection()
+        sock.sendall(conn.data_to_send())
+        paths = {}
+        with sock:
+            while True:
+                data = sock.recv(65535)
+                if not data:
+                    return
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        paths[event.stream_id] = dict(event.headers)[b":path"]
+                    elif isinstance(event, h2.events.DataReceived):
+                        conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                    elif isinstance(event, h2.events.StreamEnded):
+                        path = paths.pop(event.stream_id).decode()
+                        status = "404" if path == "/pets/0" else "200"
+                        body = json.dumps({"path": path, "connection": number})
+                        conn.send_headers(
+                            event.stream_id,
+                            [
+                                (":status", status),
+                                ("content-type", "application/json"),
+                                ("content-length", str(len(body))),
+                            ],
+                        )
+                        conn.send_data(event.stream_id, body.encode(), end_stream=True)
+                sock.sendall(conn.data_to_send())
+
+    def close(self):
+        """Stop accepting connections."""
+        self._socket.close()
+
+
+@pytest.fixture
+def h2_server():
+    """Run a local cleartext HTTP/2 server."""
+    pytest.importorskip("h2")
+    pytest.importorskip("httpx")
+    server = H2Server()
+    yield server
+    server.close()
+
+
+def test_default_transport():
+    """Test the default pooled HTTP/1.1 transport."""
+    generator = CLIGenerator(SPEC, pool_size=4)
+    assert isinstance(generator.transport, RequestsTransport)
+    assert generator.transport.session is generator.session
+    assert generator.pool_size == 4
+
+    generator.transport.resize(16)
+    assert generator.pool_size == 16
+    assert generator.session.get_adapter("http://x")._pool_maxsize == 16
+
+    with pytest.raises(ValueError, match="http3"):
+        create_transport("http3", generator.session, 4)
+
+
+def test_http2_multiplexes_concurrent_requests(h2_server):
+    """Test that concurrent operations share one HTTP/2 connection."""
+    spec = dict(SPEC, servers=[{"url": h2_server.url}])
+    generator = CLIGenerator(spec, transport="h2c")
+
+    with generator.client() as api:
+        results = list(
+            api.pets.list.map(({"pet_id": i} for i in range(1, 51)), concurrency=25)
+        )
+
+    assert [result["path"] for _, result in results] == [
+        f"/pets/{i}" for i in range(1, 51)
+    ]
+    assert {result["connection"] for _, result in results} == {1}
+    assert h2_server.connections == 1
+
+
+def test_http2_errors(h2_server):
+    """Test that HTTP/2 failures surface as requests exceptions."""
+    spec = dict(SPEC, servers=[{"url": h2_server.url}])
+    generator = CLIGenerator(spec, transport="h2c")
+
+    response = generator._open_request("get", "/pets/{pet_id}", params={"pet_id": 1})
+    assert response.http_version == "HTTP/2"
+    assert json.loads(b"".join(response.iter_content(4))) == {
+        "path": "/pets/1",
+        "connection": 1,
+    }
+    response.close()
+
+    with pytest.raises(requests.exceptions.HTTPError) as excinfo:
+        generator._send_request("get", "/pets/{pet_id}", params={"pet_id": 0})
+    assert excinfo.value.response.status_code == 404
+
+    # Refused connections are told apart from requests that may have been sent
+    for transport in ("h2c", "http1"):
+        generator = CLIGenerator(SPEC, transport=transport)
+        with pytest.raises(requests.exceptions.ConnectionError) as excinfo:
+            generator._send_request("get", "/pets/{pet_id}", params={"pet_id": 1})
+        assert connect_failed(excinfo.value)
+    assert not connect_failed(
+        requests.exceptions.ConnectionError("Connection aborted.")
+    )
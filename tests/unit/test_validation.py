@@ -0,0 +1,116 @@
+"""Test cases for chunked spec validation."""
+
+import copy
+
+import pytest
+
+from openapi_cli_generator.parser import OpenAPIParser
+from openapi_cli_generator.profiling import synthetic_spec
+from openapi_cli_generator.validation import (
+    SpecError,
+    format_errors,
+    json_pointer,
+    validate_spec,
+)
+
+
+@pytest.fixture(scope="module")
+def invalid_spec():
+    """Return a synthetic spec with errors in several chunks."""
+    spec = copy.deepcopy(synthetic_spec(40))
+    paths = spec["paths"]
+    paths["/group1/resource1/"]["get"]["responses"] = "bad"
+    paths["/group2/resource2/"]["get"]["operationId"] = "list_resource1"
+    paths["/group3/resource3/"]["get"]["parameters"][1]["schema"]["default"] = "abc"
+    paths["/group9/resource39/{item_id}"]["get"]["parameters"] = []
+    spec["components"]["schemas"]["Resource7"]["properties"] = []
+    return spec
+
+
+EXPECTED_ERRORS = [
+    SpecError(
+        "/paths/~1group2~1resource2~1/get/operationId",
+        "Operation ID 'list_resource1' for 'get' in '/group2/resource2/' is not unique",
+    ),
+    SpecError(
+        "/paths/~1group1~1resource1~1/get/responses", "'bad' is not of type 'object'"
+    ),
+    SpecError("/paths/~1group3~1resource3~1", "'abc' is not of type 'integer'"),
+    SpecError(
+        "/paths/~1group9~1resource39~1{item_id}",
+        "Path parameter 'item_id' for 'get' operation in "
+        "'/group9/resource39/{item_id}' was not resolved",
+    ),
+    SpecError(
+        "/components/schemas/Resource7",
+        "{'type': 'object', 'required': ['id'], 'properties': []} "
+        "is not valid under any of the given schemas",
+    ),
+    SpecError("/components/schemas/Resource7", "[] is not of type 'object'"),
+    # Also reported at the paths using the invalid schema
+    SpecError("/paths/~1group7~1resource7~1", "[] is not of type 'object'"),
+    SpecError("/paths/~1group7~1resource7~1{item_id}", "[] is not of type 'object'"),
+]
+
+
+def test_json_pointer():
+    """Test escaping keys into JSON pointers."""
+    assert json_pointer(["paths", "/a/{id}", "get"]) == "/paths/~1a~1{id}/get"
+    assert json_pointer(["x~y", 0]) == "/x~0y/0"
+
+
+def test_valid_specs(sample_openapi_spec):
+    """Test that valid specs have no errors."""
+    assert validate_spec(sample_openapi_spec) == []
+    assert validate_spec(synthetic_spec(20), chunk_size=7) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_all_errors_are_located(invalid_spec, chunk_size):
+    """Test that every error is reported once with its JSON pointer."""
+    errors = validate_spec(invalid_spec, chunk_size=chunk_size)
+    assert sorted(errors, key=str) == sorted(EXPECTED_ERRORS, key=str)
+
+
+def test_parallel_validation(invalid_spec):
+    """Test validating chunks on a process pool."""
+    errors = validate_spec(invalid_spec, workers=2, chunk_size=16)
+    assert sorted(errors, key=str) == sorted(EXPECTED_ERRORS, key=str)
+
+
+def test_structural_errors():
+    """Test that a broken document skeleton is reported before chunking."""
+    assert validate_spec([]) == [SpecError("", "the spec must be an object")]
+    assert validate_spec({"openapi": "3.0.0", "info": {}, "paths": []}) == [
+        SpecError("/paths", "paths must be an object")
+    ]
+    errors = validate_spec({"openapi": "3.0.0", "paths": {}})
+    assert [str(error) for error in errors] == ["/: 'info' is a required property"]
+
+
+def test_external_references_are_validated_whole():
+    """Test the fallback for references chunks cannot resolve."""
+    spec = copy.deepcopy(synthetic_spec(2))
+    parameters = spec["paths"]["/group0/resource0/"]["get"]["parameters"]
+    parameters.append({"name": "q", "in": "query", "schema": {"type": "string"}})
+    parameter = {"$ref": "#/paths/~1group0~1resource0~1/get/parameters/3"}
+    spec["paths"]["/group1/resource1/"]["get"]["parameters"].append(parameter)
+    assert validate_spec(spec, chunk_size=1) == []
+
+    parameters[3]["schema"] = {"type": "string", "default": 1}
+    assert validate_spec(spec, chunk_size=1) == [
+        SpecError("", "1 is not of type 'string'")
+    ]
+
+
+def test_parser_reports_all_errors(invalid_spec):
+    """Test the message of an invalid spec."""
+    parser = OpenAPIParser("http://example.com/api")
+    with pytest.raises(ValueError) as error:
+        parser._validate(invalid_spec)
+    message = str(error.value)
+    assert message.startswith("Invalid OpenAPI specification: 8 errors\n")
+    assert "/components/schemas/Resource7: [] is not" in message
+
+    errors = [SpecError(f"/paths/{n}", "bad") for n in range(25)]
+    assert format_errors(errors).endswith("/paths/19: bad\n  ... and 5 more")